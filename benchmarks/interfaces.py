@@ -0,0 +1,85 @@
+"""Requests per second and latency of ``nestipy start`` over ASGI and RSGI.
+
+Scaffolds the ``project`` template (the app ``nestipy new`` creates) into a
+temporary directory, or uses ``--app-dir``, then serves it over each
+interface and drives it with the ``nestipy bench`` load generator. Requires
+nestipy and granian.
+
+    python benchmarks/interfaces.py --duration 10 --connections 64 --workers 1
+    python benchmarks/interfaces.py --app-dir ../my-app --path /users
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.append(str(SRC))
+
+from nestipy_cli.bench import (  # noqa: E402
+    LoadProfile,
+    bench_server_config,
+    free_port,
+    run_load,
+    serving,
+)
+from nestipy_cli.server import GranianTuning  # noqa: E402
+from nestipy_cli.templates.generator import TemplateGenerator  # noqa: E402
+
+
+def run_interface(args, app_dir: Path, interface: str) -> dict:
+    cfg = bench_server_config(
+        args.app,
+        args.host,
+        free_port(args.host),
+        args.workers,
+        "auto",
+        "auto",
+        interface,
+        GranianTuning(),
+    )
+    profile = LoadProfile(
+        paths=(args.path,),
+        connections=args.connections,
+        duration=args.duration,
+        processes=args.processes,
+    )
+    os.chdir(app_dir)
+    with serving(cfg, app_dir / ".nestipy" / "bench" / f"{interface}.log"):
+        return vars(run_load(args.host, cfg.port, profile))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--app-dir", type=Path, help="Project to serve (default: the template)."
+    )
+    parser.add_argument("--app", default="main:app")
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app_dir = args.app_dir.resolve() if args.app_dir else None
+        if app_dir is None:
+            app_dir = Path(tmp) / "project"
+            TemplateGenerator.copy_project(str(app_dir))
+        results = {name: run_interface(args, app_dir, name) for name in ("asgi", "rsgi")}
+
+    for name, result in results.items():
+        print(
+            f"{name}: {result['rps']:>10,.0f} req/s  p50 {result['p50_ms']:6.2f} ms  "
+            f"p99 {result['p99_ms']:6.2f} ms  ({result['requests']} requests, "
+            f"{result['errors']} non-2xx)"
+        )
+    print(f"rsgi / asgi: {results['rsgi']['rps'] / results['asgi']['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
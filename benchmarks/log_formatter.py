@@ -0,0 +1,102 @@
+"""Throughput benchmark for the production console formatter.
+
+Emits the same mix of granian access records and plain log records through
+the Rich handler/formatter pair used in dev and through a ``StreamHandler``
+with :class:`nestipy_cli.config._NestipyFastFormatter`, both writing to
+/dev/null, and reports records per second.
+
+    python benchmarks/log_formatter.py --records 5000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from rich.console import Console  # noqa: E402
+
+from nestipy_cli.config import (  # noqa: E402
+    ACCESS_LOG_FORMAT,
+    DEFAULT_LOG_FORMAT,
+    _NestipyFastFormatter,
+    _NestipyRichFormatter,
+    _NestipyRichHandler,
+)
+
+ACCESS_ATOMS = [
+    {"status": 200, "method": "GET", "path": "/users/42", "dt_ms": 13.409},
+    {"status": 401, "method": "POST", "path": "/auth/login", "dt_ms": 2.118},
+    {"status": 304, "method": "GET", "path": "/static/app.js", "dt_ms": 0.412},
+    {"status": 500, "method": "GET", "path": "/health", "dt_ms": 101.3},
+]
+
+
+def build_records(count: int) -> list[logging.LogRecord]:
+    records = []
+    for index in range(count):
+        if index % 5 == 4:
+            record = logging.LogRecord(
+                "granian", logging.INFO, "", 0, "Spawning worker-%d", (index,), None
+            )
+        else:
+            record = logging.LogRecord(
+                "granian.access", logging.INFO, "", 0, ACCESS_LOG_FORMAT, None, None
+            )
+            record.args = {
+                "time": "2026-02-11 18:20:19 +0300",
+                "addr": "127.0.0.1",
+                "protocol": "HTTP/1.1",
+                **ACCESS_ATOMS[index % len(ACCESS_ATOMS)],
+            }
+        records.append(record)
+    return records
+
+
+def rich_handler(stream) -> logging.Handler:
+    handler = _NestipyRichHandler(
+        console=Console(file=stream, force_terminal=True, width=200),
+        rich_tracebacks=True,
+        markup=True,
+        show_time=False,
+        show_level=False,
+        show_path=False,
+    )
+    handler.setFormatter(_NestipyRichFormatter(fmt=DEFAULT_LOG_FORMAT))
+    return handler
+
+
+def fast_handler(stream) -> logging.Handler:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(_NestipyFastFormatter(fmt=DEFAULT_LOG_FORMAT))
+    return handler
+
+
+def measure(name: str, factory, records: list[logging.LogRecord]) -> float:
+    with open(os.devnull, "w") as stream:
+        handler = factory(stream)
+        started = time.perf_counter()
+        for record in records:
+            handler.handle(record)
+        elapsed = time.perf_counter() - started
+    rate = len(records) / elapsed
+    print(f"{name:<6} {len(records):>9} records  {elapsed:8.3f} s  {rate:>12,.0f} records/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=5_000)
+    args = parser.parse_args()
+
+    records = build_records(args.records)
+    rich = measure("rich", rich_handler, records)
+    fast = measure("fast", fast_handler, records)
+    print(f"speedup  {fast / rich:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Throughput benchmark for the granian log rewrite engine.
+
+Compares the previous line-at-a-time ``str`` pipeline (kept below verbatim as
+the baseline) with :class:`nestipy_cli.server.GranianLogRewriter`, feeding both
+the same mixed granian output in pipe-sized chunks and writing to /dev/null.
+
+    python benchmarks/log_rewrite.py --lines 200000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.server import GranianLogRewriter, REWRITE_READ_SIZE  # noqa: E402
+
+SAMPLE_LINES = [
+    '[2026-02-11 18:20:19 +0300] 127.0.0.1 - "GET /users/42 HTTP/1.1" 200 13.409',
+    '[2026-02-11 18:20:19 +0300] 10.0.0.7 - "POST /auth/login HTTP/1.1" 401 2.118',
+    '[2026-02-11 18:20:20 +0300] 10.0.0.9 - "GET /static/app.js HTTP/2" 304 0.412',
+    "[INFO] Spawning worker-3 with PID: 18234",
+    "[NESTIPY] INFO [APP] Starting up ...",
+    '[2026-02-11 18:20:21 +0300] 127.0.0.1 - "GET /health HTTP/1.1" 500 101.3',
+]
+
+
+def _legacy_style_status(status: int) -> str:
+    if 200 <= status < 300:
+        return "32"
+    if 300 <= status < 400:
+        return "36"
+    if 400 <= status < 500:
+        return "33"
+    if 500 <= status < 600:
+        return "31"
+    return "37"
+
+
+def _legacy_extract_status(message: str) -> int | None:
+    primary = re.search(r"\"[^\"]*\"\s+(\d{3})\b", message)
+    if primary:
+        value = int(primary.group(1))
+        if 100 <= value <= 599:
+            return value
+    candidates = [
+        int(match.group(1))
+        for match in re.finditer(r"(?<!\d)(\d{3})(?!\d)", message)
+        if 100 <= int(match.group(1)) <= 599
+    ]
+    if candidates:
+        return candidates[-1]
+    return None
+
+
+def _legacy_colorize(message: str) -> str:
+    status = _legacy_extract_status(message)
+    if status is None:
+        return message
+    color = _legacy_style_status(status)
+    pattern = re.compile(rf"(?<!\d){status}(?!\d)")
+    return pattern.sub(f"\x1b[{color}m{status}\x1b[32m", message, count=1)
+
+
+def _legacy_access(line: str) -> str | None:
+    match = re.match(r"^\[(?P<ts>[^\]]+)\]\s+(?P<rest>.+)$", line)
+    if not match:
+        return None
+    access = re.match(
+        r'^(?P<client>.+?)\s+-\s+"(?P<req>[^"]+)"\s+(?P<status>\d{3})\s+(?P<duration>[0-9.]+)(?:\s*ms)?\s*$',
+        match.group("rest"),
+    )
+    if not access:
+        return None
+    return (
+        f'[NESTIPY] INFO [{match.group("ts")}] {access.group("client")} - '
+        f'"{access.group("req")}" {access.group("status")} - {access.group("duration")} ms'
+    )
+
+
+def _legacy_rewrite_line(line: str, use_color: bool) -> str:
+    if line.startswith("[NESTIPY]"):
+        if not use_color or "\x1b[" in line:
+            return line
+        return f"\x1b[32m{_legacy_colorize(line)}\x1b[0m"
+    access_line = _legacy_access(line)
+    if access_line:
+        if not use_color:
+            return access_line
+        return f"\x1b[32m{_legacy_colorize(access_line)}\x1b[0m"
+    match = re.match(r"^\[(?P<level>[A-Z]+)\]\s*(?P<rest>.*)$", line)
+    if not match:
+        return line
+    formatted = f"[NESTIPY] {match.group('level')} {match.group('rest')}".rstrip()
+    if not use_color:
+        return formatted
+    return f"\x1b[32m{_legacy_colorize(formatted)}\x1b[0m"
+
+
+def run_legacy(chunks: list[bytes], fd: int, use_color: bool) -> None:
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk.decode("utf-8", errors="replace")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            os.write(fd, (_legacy_rewrite_line(line, use_color) + "\n").encode("utf-8"))
+
+
+def run_engine(chunks: list[bytes], fd: int, use_color: bool) -> None:
+    rewriter = GranianLogRewriter(use_color=use_color)
+    for chunk in chunks:
+        output = rewriter.feed(chunk)
+        if output:
+            os.write(fd, output)
+
+
+def build_chunks(lines: int, chunk_size: int) -> list[bytes]:
+    payload = "".join(
+        SAMPLE_LINES[i % len(SAMPLE_LINES)] + "\n" for i in range(lines)
+    ).encode("utf-8")
+    return [payload[i : i + chunk_size] for i in range(0, len(payload), chunk_size)]
+
+
+def measure(name: str, runner, chunks: list[bytes], lines: int, use_color: bool) -> float:
+    fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        started = time.perf_counter()
+        runner(chunks, fd, use_color)
+        elapsed = time.perf_counter() - started
+    finally:
+        os.close(fd)
+    rate = lines / elapsed
+    print(f"{name:<8} {lines:>9} lines  {elapsed:8.3f} s  {rate:>12,.0f} lines/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=REWRITE_READ_SIZE)
+    parser.add_argument("--no-color", action="store_true")
+    args = parser.parse_args()
+
+    use_color = not args.no_color
+    chunks = build_chunks(args.lines, args.chunk_size)
+    legacy = measure("legacy", run_legacy, chunks, args.lines, use_color)
+    engine = measure("engine", run_engine, chunks, args.lines, use_color)
+    print(f"speedup  {engine / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
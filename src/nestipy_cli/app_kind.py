@@ -0,0 +1,181 @@
+"""Find out whether ``nestipy start``'s target is an HTTP app or a microservice.
+
+The master process only needs this one bit, so it should not import the
+application (and build its whole module graph and DI container) just to run
+an ``isinstance`` check. :func:`detect_app_kind` first reads the entry
+module's AST for ``app = NestipyFactory.create(...)`` or
+``NestipyFactory.create_microservice(...)``; when that is inconclusive it asks
+a short-lived probe subprocess and caches the answer in
+``.nestipy/app-kind.json``, keyed by the entry file's content hash.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Literal, Optional
+
+AppKind = Literal["application", "microservice"]
+
+APP_KIND_CACHE = Path(".nestipy") / "app-kind.json"
+_PROBE_MARKER = "NESTIPY_APP_KIND="
+_FACTORY_METHODS: dict[str, AppKind] = {
+    "create": "application",
+    "create_microservice": "microservice",
+}
+_ANNOTATIONS: dict[str, AppKind] = {
+    "NestipyApplication": "application",
+    "NestipyMicroservice": "microservice",
+}
+_PROBE_SCRIPT = """
+import importlib, sys
+sys.path.insert(0, sys.argv[1])
+app = getattr(importlib.import_module(sys.argv[2]), sys.argv[3])
+from nestipy.core import NestipyApplication, NestipyMicroservice
+is_ms = isinstance(app, NestipyMicroservice) and not isinstance(app, NestipyApplication)
+print("{marker}" + ("microservice" if is_ms else "application"))
+""".format(marker=_PROBE_MARKER)
+
+
+class AppKindError(RuntimeError):
+    """Raised when neither the AST nor the probe could classify the app."""
+
+
+def entry_file(module_dir: Path, module_name: str) -> Path:
+    candidate = module_dir / f"{module_name}.py"
+    if candidate.exists():
+        return candidate
+    return module_dir / module_name / "__init__.py"
+
+
+def _factory_kind(node: ast.AST) -> Optional[AppKind]:
+    """Kind of ``NestipyFactory[...].create(...)``-style calls, else ``None``."""
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+        return None
+    kind = _FACTORY_METHODS.get(node.func.attr)
+    if kind is None:
+        return None
+    target = node.func.value
+    while isinstance(target, (ast.Subscript, ast.Attribute)):
+        if isinstance(target, ast.Attribute) and target.attr == "NestipyFactory":
+            return kind
+        target = target.value
+    if isinstance(target, ast.Name) and target.id == "NestipyFactory":
+        return kind
+    return None
+
+
+def _annotation_kind(node: Optional[ast.AST]) -> Optional[AppKind]:
+    if isinstance(node, ast.Name):
+        return _ANNOTATIONS.get(node.id)
+    if isinstance(node, ast.Attribute):
+        return _ANNOTATIONS.get(node.attr)
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return _ANNOTATIONS.get(node.value.rsplit(".", 1)[-1])
+    return None
+
+
+def detect_app_kind_static(source: str, app_name: str) -> Optional[AppKind]:
+    """Classify ``app_name`` from module-level assignments in ``source``.
+
+    Returns ``None`` when the module cannot be parsed, assigns the name more
+    than one way, or builds it in a way the AST alone cannot resolve.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    kinds: set[Optional[AppKind]] = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            if any(isinstance(t, ast.Name) and t.id == app_name for t in node.targets):
+                kinds.add(_factory_kind(node.value))
+        elif (
+            isinstance(node, ast.AnnAssign)
+            and isinstance(node.target, ast.Name)
+            and node.target.id == app_name
+        ):
+            kinds.add(_factory_kind(node.value) or _annotation_kind(node.annotation))
+    if len(kinds) != 1:
+        return None
+    return kinds.pop()
+
+
+def _read_cache(cache_path: Path, target: str, digest: str) -> Optional[AppKind]:
+    try:
+        entry = json.loads(cache_path.read_text()).get(target) or {}
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not isinstance(entry, dict) or entry.get("sha256") != digest:
+        return None
+    kind = entry.get("kind")
+    return kind if kind in ("application", "microservice") else None
+
+
+def _write_cache(cache_path: Path, target: str, digest: str, kind: AppKind) -> None:
+    try:
+        entries = json.loads(cache_path.read_text())
+        if not isinstance(entries, dict):
+            entries = {}
+    except (OSError, ValueError):
+        entries = {}
+    # One entry per target: a new hash replaces the stale one.
+    entries[target] = {"sha256": digest, "kind": kind}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        staging = cache_path.with_name(f".{cache_path.name}.{os.getpid()}")
+        staging.write_text(json.dumps(entries, indent=2))
+        os.replace(staging, cache_path)
+    except OSError:
+        pass
+
+
+def probe_app_kind(
+    module_dir: Path, module_name: str, app_name: str, timeout: float = 120.0
+) -> AppKind:
+    """Import the app in a throwaway interpreter and report its kind."""
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE_SCRIPT, str(module_dir), module_name, app_name],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise AppKindError(f"Probing {module_name}:{app_name} timed out") from exc
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith(_PROBE_MARKER):
+            kind = line[len(_PROBE_MARKER) :].strip()
+            if kind in ("application", "microservice"):
+                return kind  # type: ignore[return-value]
+    raise AppKindError(
+        f"Could not load {module_name}:{app_name}:\n{result.stderr.strip()}"
+    )
+
+
+def detect_app_kind(
+    module_dir: Path,
+    module_name: str,
+    app_name: str,
+    cache_path: Optional[Path] = None,
+) -> AppKind:
+    """Classify the app without importing it into the current process."""
+    path = entry_file(module_dir, module_name)
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return probe_app_kind(module_dir, module_name, app_name)
+    kind = detect_app_kind_static(content.decode("utf-8", "replace"), app_name)
+    if kind is not None:
+        return kind
+    cache_path = cache_path or module_dir / APP_KIND_CACHE
+    target = f"{module_name}:{app_name}"
+    digest = hashlib.sha256(content).hexdigest()
+    kind = _read_cache(cache_path, target, digest)
+    if kind is None:
+        kind = probe_app_kind(module_dir, module_name, app_name)
+        _write_cache(cache_path, target, digest, kind)
+    return kind
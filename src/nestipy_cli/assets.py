@@ -0,0 +1,295 @@
+"""Build-time asset pipeline for ``nestipy build --assets``.
+
+Every file under ``public/`` and ``<web-dir>/dist/`` is copied to
+``.nestipy/assets`` under a content-hashed name (``site.css`` becomes
+``site.3f2a9c1d04b7.css``). Compressible files also get ``.gz`` and ``.br``
+siblings, written at the highest levels by a process pool. Brotli needs the
+optional ``brotli`` package; without it only gzip is written.
+``manifest.json`` maps each URL to its built file.
+
+:class:`PrecompressedAssets` is the server side. ``nestipy start`` wraps the
+app with it when a manifest exists. It answers manifest URLs before the app
+sees them and picks the ``br``/``gzip``/identity variant from
+``Accept-Encoding``. The file itself is handed to granian
+(``http.response.pathsend``), so no bytes are read or compressed in Python.
+Hashed URLs are sent ``immutable``. The original URLs revalidate by ETag,
+except bundler output under ``dist/assets``, which Vite already
+fingerprints.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+ASSETS_DIR = Path(".nestipy") / "assets"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+# Files the bundler already fingerprinted (Vite's ``build.assetsDir``).
+BUNDLER_ASSETS_DIR = "assets"
+COMPRESSIBLE_TYPES = frozenset(
+    {
+        ".css",
+        ".csv",
+        ".html",
+        ".ico",
+        ".js",
+        ".json",
+        ".map",
+        ".mjs",
+        ".otf",
+        ".svg",
+        ".ttf",
+        ".txt",
+        ".wasm",
+        ".webmanifest",
+        ".xml",
+    }
+)
+# Smaller files are not worth a compressed variant.
+MIN_COMPRESS_SIZE = 512
+_HASH_LENGTH = 12
+_PRIVATE_DIRS = frozenset({"ssr"})
+_IMMUTABLE = b"public, max-age=31536000, immutable"
+_REVALIDATE = b"public, max-age=0, must-revalidate"
+_ENCODING_SUFFIX = {"br": ".br", "gzip": ".gz"}
+# Strong ETags must differ between content-codings of the same resource.
+_ETAG_SUFFIX = {None: "", "br": "-br", "gzip": "-gz"}
+
+
+@dataclass(frozen=True)
+class AssetSource:
+    """A directory whose files are served under the URL ``prefix``."""
+
+    name: str
+    directory: Path
+    prefix: str = "/"
+    # Subdirectory whose files the bundler already fingerprinted.
+    fingerprinted: Optional[str] = None
+
+
+def brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def iter_source_files(source: AssetSource) -> Iterator[tuple[str, Path]]:
+    """``(relative posix path, file)`` pairs, skipping hidden and SSR files."""
+    for root, dirs, files in os.walk(source.directory):
+        top = Path(root) == source.directory
+        dirs[:] = sorted(
+            d for d in dirs if not d.startswith(".") and not (top and d in _PRIVATE_DIRS)
+        )
+        for name in sorted(files):
+            if not name.startswith("."):
+                path = Path(root) / name
+                yield path.relative_to(source.directory).as_posix(), path
+
+
+def hashed_name(relative: str, digest: str) -> str:
+    stem, dot, suffix = relative.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{relative}.{digest}"
+    return f"{stem}.{digest}.{suffix}"
+
+
+def _url(prefix: str, relative: str) -> str:
+    return "/" + "/".join(part for part in (prefix.strip("/"), relative) if part)
+
+
+def _build_file(job: tuple[str, str, str, bool, bool]) -> dict[str, Any]:
+    """Hash, copy and precompress one file (runs in a worker process)."""
+    source, relative, out_dir, fingerprinted, use_brotli = job
+    data = Path(source).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()[:_HASH_LENGTH]
+    built = relative if fingerprinted else hashed_name(relative, digest)
+    target = Path(out_dir) / built
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+    encodings: dict[str, int] = {}
+    if Path(relative).suffix.lower() in COMPRESSIBLE_TYPES and len(data) >= MIN_COMPRESS_SIZE:
+        variants = {"gzip": lambda: gzip.compress(data, compresslevel=9, mtime=0)}
+        if use_brotli:
+            import brotli
+
+            variants["br"] = lambda: brotli.compress(data, quality=11)
+        for encoding, compress in variants.items():
+            compressed = compress()
+            # Keep a variant only when it saves a meaningful share.
+            if len(compressed) < len(data) * 0.9:
+                Path(f"{target}{_ENCODING_SUFFIX[encoding]}").write_bytes(compressed)
+                encodings[encoding] = len(compressed)
+    return {
+        "file": built,
+        "etag": digest,
+        "size": len(data),
+        "encodings": encodings,
+        "fingerprinted": fingerprinted,
+    }
+
+
+def build_assets(
+    sources: list[AssetSource],
+    out_dir: Path = ASSETS_DIR,
+    jobs: Optional[int] = None,
+    use_brotli: Optional[bool] = None,
+) -> dict[str, Any]:
+    """Build every source into ``out_dir`` and write its manifest."""
+    if use_brotli is None:
+        use_brotli = brotli_available()
+    manifest_path = out_dir / MANIFEST_FILE
+    if out_dir.exists():
+        if any(out_dir.iterdir()) and not manifest_path.exists():
+            raise FileExistsError(f"{out_dir} exists and was not built by nestipy")
+        shutil.rmtree(out_dir)
+    jobs_for: list[tuple[str, AssetSource]] = []
+    work: list[tuple[str, str, str, bool, bool]] = []
+    seen: set[str] = set()
+    for source in sources:
+        if not source.directory.is_dir():
+            continue
+        for relative, path in iter_source_files(source):
+            url = _url(source.prefix, relative)
+            if url in seen:
+                continue  # an earlier source already serves this URL
+            seen.add(url)
+            fingerprinted = bool(source.fingerprinted) and relative.startswith(
+                f"{source.fingerprinted}/"
+            )
+            jobs_for.append((url, source))
+            work.append(
+                (str(path), relative, str(out_dir / source.name), fingerprinted, use_brotli)
+            )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files: dict[str, Any] = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for (url, source), entry in zip(jobs_for, pool.map(_build_file, work, chunksize=8)):
+            entry["url"] = _url(source.prefix, entry["file"])
+            entry["file"] = f"{source.name}/{entry['file']}"
+            entry["type"] = mimetypes.guess_type(url)[0] or "application/octet-stream"
+            files[url] = entry
+    manifest = {"version": MANIFEST_VERSION, "files": files}
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+def _accepted_encodings(header: bytes) -> set[str]:
+    accepted = set()
+    for item in header.decode("latin-1").lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:].strip("0.") == "":
+            continue  # q=0: explicitly refused
+        accepted.add(coding.strip())
+    if "*" in accepted:
+        accepted.update(_ENCODING_SUFFIX)
+    return accepted
+
+
+def _etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    """If-None-Match uses the weak comparison: ``W/`` prefixes are ignored."""
+    for candidate in if_none_match.split(b","):
+        candidate = candidate.strip()
+        if candidate == b"*" or candidate.removeprefix(b"W/") == etag:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class _Asset:
+    path: str
+    size: int
+    # Digest without quotes; each variant's ETag adds its coding's suffix.
+    digest: str
+    content_type: bytes
+    cache_control: bytes
+    encodings: dict[str, tuple[str, int]]
+
+
+class PrecompressedAssets:
+    """ASGI middleware serving the built assets listed in a manifest."""
+
+    def __init__(self, app: Any, manifest_path: Path) -> None:
+        self.app = app
+        self.routes: dict[str, _Asset] = {}
+        root = manifest_path.parent
+        manifest = json.loads(manifest_path.read_text())
+        for url, entry in manifest["files"].items():
+            path = str(root / entry["file"])
+            encodings = {
+                encoding: (path + _ENCODING_SUFFIX[encoding], size)
+                for encoding, size in entry["encodings"].items()
+            }
+            common = dict(
+                path=path,
+                size=entry["size"],
+                digest=entry["etag"],
+                content_type=entry["type"].encode("latin-1"),
+                encodings=encodings,
+            )
+            self.routes[entry["url"]] = _Asset(cache_control=_IMMUTABLE, **common)
+            self.routes.setdefault(
+                url,
+                _Asset(
+                    cache_control=_IMMUTABLE if entry["fingerprinted"] else _REVALIDATE,
+                    **common,
+                ),
+            )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            asset = self.routes.get(scope["path"])
+            if asset is not None:
+                await self._send_asset(asset, scope, send)
+                return
+        await self.app(scope, receive, send)
+
+    async def _send_asset(self, asset: _Asset, scope, send) -> None:
+        accept = if_none_match = b""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value
+            elif name == b"if-none-match":
+                if_none_match = value
+        path, size, chosen = asset.path, asset.size, None
+        if asset.encodings and accept:
+            accepted = _accepted_encodings(accept)
+            for encoding in ("br", "gzip"):
+                if encoding in accepted and encoding in asset.encodings:
+                    path, size = asset.encodings[encoding]
+                    chosen = encoding
+                    break
+        etag = f'"{asset.digest}{_ETAG_SUFFIX[chosen]}"'.encode()
+        headers = [
+            (b"cache-control", asset.cache_control),
+            (b"etag", etag),
+            (b"vary", b"accept-encoding"),
+        ]
+        if if_none_match and _etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if chosen is not None:
+            headers.append((b"content-encoding", chosen.encode()))
+        headers += [
+            (b"content-type", asset.content_type),
+            (b"content-length", str(size).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+        elif "http.response.pathsend" in (scope.get("extensions") or ()):
+            await send({"type": "http.response.pathsend", "path": path})
+        else:
+            with open(path, "rb") as file:
+                body = file.read()
+            await send({"type": "http.response.body", "body": body})
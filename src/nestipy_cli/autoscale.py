@@ -0,0 +1,192 @@
+"""Grow and shrink the granian worker pool between ``--workers-min`` and ``--workers-max``.
+
+The master samples each worker's CPU time from ``/proc``. A granian worker
+runs one Python event loop, so a worker that keeps a core busy is one whose
+loop is saturated and whose requests queue up. :class:`Autoscaler` adds a
+worker after the mean utilisation has stayed above ``scale_up_at`` for
+``up_after`` seconds. It retires one after utilisation has stayed below
+``scale_down_at`` for ``cooldown`` seconds. It never shrinks when the load
+spread over one worker fewer would cross the scale-up threshold, so the
+pool does not flap between two sizes.
+
+:func:`autoscaling_server` wraps granian's server class. Pipes and metrics
+slots are sized for the maximum. Workers are only ever added or retired at
+the highest index, so granian's own crash and reload respawns (which
+address workers by index) keep working.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from . import procfs
+
+logger = logging.getLogger("_granian")
+
+
+@dataclass(frozen=True)
+class ScalePolicy:
+    min_workers: int
+    max_workers: int
+    scale_up_at: float = 0.75
+    scale_down_at: float = 0.25
+    up_after: float = 10.0
+    cooldown: float = 60.0
+    interval: float = 2.0
+
+
+class Autoscaler:
+    """Pure scaling decisions; the caller supplies the load and the clock."""
+
+    def __init__(self, policy: ScalePolicy, now: float) -> None:
+        self.policy = policy
+        self._busy_since: Optional[float] = None
+        self._idle_since: Optional[float] = None
+        self._changed_at = now
+
+    def decide(self, workers: int, load: float, now: float) -> int:
+        """Return the worker count to run, given the mean utilisation ``load``."""
+        policy = self.policy
+        if load >= policy.scale_up_at:
+            self._idle_since = None
+            if self._busy_since is None:
+                self._busy_since = now
+            if (
+                workers < policy.max_workers
+                and now - self._busy_since >= policy.up_after
+                and now - self._changed_at >= policy.up_after
+            ):
+                return self._changed(workers + 1, now)
+        elif load <= policy.scale_down_at:
+            self._busy_since = None
+            if self._idle_since is None:
+                self._idle_since = now
+            if (
+                workers > policy.min_workers
+                and now - self._idle_since >= policy.cooldown
+                and now - self._changed_at >= policy.cooldown
+                and load * workers / (workers - 1) < policy.scale_up_at
+            ):
+                return self._changed(workers - 1, now)
+        else:
+            self._busy_since = self._idle_since = None
+        return workers
+
+    def _changed(self, workers: int, now: float) -> int:
+        # The new pool size has to earn its own sustained signal.
+        self._busy_since = self._idle_since = None
+        self._changed_at = now
+        return workers
+
+
+class CpuLoad:
+    """Mean CPU utilisation (0..1 per worker) since the previous sample."""
+
+    def __init__(self) -> None:
+        self._last: dict[int, tuple[float, float]] = {}
+
+    def sample(self, pids: list[int], now: float) -> Optional[float]:
+        loads = []
+        current: dict[int, tuple[float, float]] = {}
+        for pid in pids:
+            cpu = procfs.cpu_seconds(pid)
+            if cpu is None:
+                continue
+            current[pid] = (now, cpu)
+            previous = self._last.get(pid)
+            if previous is not None and now > previous[0]:
+                loads.append(min(1.0, (cpu - previous[1]) / (now - previous[0])))
+        self._last = current
+        if not loads:
+            return None
+        return sum(loads) / len(loads)
+
+
+def autoscaling_server(base: type) -> type:
+    """Subclass granian's (multi-process) server class with autoscaling."""
+
+    class AutoscalingServer(base):  # type: ignore[misc, valid-type]
+        def __init__(self, *args: Any, scale_policy: ScalePolicy, **kwargs: Any) -> None:
+            kwargs["workers"] = scale_policy.max_workers
+            super().__init__(*args, **kwargs)
+            self.scale_policy = scale_policy
+            self._scale_lock = threading.RLock()
+            self._scale_stop = threading.Event()
+            self._scale_targets: Optional[tuple[Any, Any]] = None
+
+        def startup(self, spawn_target, target_loader):
+            self._scale_targets = (spawn_target, target_loader)
+            super().startup(spawn_target, target_loader)
+            threading.Thread(
+                target=self._autoscale, name="nestipy-autoscaler", daemon=True
+            ).start()
+
+        def _spawn_workers(self, spawn_target, target_loader):
+            # IPC pipes and metrics slots already exist for max_workers.
+            self.workers = self.scale_policy.min_workers
+            super()._spawn_workers(spawn_target, target_loader)
+
+        def _respawn_workers(self, workers, spawn_target, target_loader, delay: float = 0):
+            with self._scale_lock:
+                # A crashed worker may have been retired in the meantime.
+                workers = [idx for idx in workers if idx < len(self.wrks)]
+                super()._respawn_workers(workers, spawn_target, target_loader, delay)
+
+        def _stop_workers(self):
+            self._scale_stop.set()
+            with self._scale_lock:
+                super()._stop_workers()
+
+        def _autoscale(self) -> None:
+            policy = self.scale_policy
+            scaler = Autoscaler(policy, time.monotonic())
+            cpu = CpuLoad()
+            while not self._scale_stop.wait(policy.interval):
+                with self._scale_lock:
+                    if self.interrupt_children or self.interrupt_signal:
+                        continue
+                    pids = [wrk._id() for wrk in self.wrks]
+                now = time.monotonic()
+                load = cpu.sample(pids, now)
+                if load is None:
+                    continue
+                target = scaler.decide(len(pids), load, now)
+                if target > len(pids):
+                    self.scale_up(load)
+                elif target < len(pids):
+                    self.scale_down(load)
+
+        def scale_up(self, load: float = 0.0) -> None:
+            spawn_target, target_loader = self._scale_targets
+            with self._scale_lock:
+                if self._scale_stop.is_set() or len(self.wrks) >= self.scale_policy.max_workers:
+                    return
+                idx = len(self.wrks)
+                logger.info(f"Autoscale: load {load:.0%}, adding worker-{idx + 1}")
+                wrk = self._spawn_worker(
+                    idx=idx, target=spawn_target, callback_loader=target_loader
+                )
+                wrk.start()
+                self.wrks.append(wrk)
+                self.workers = len(self.wrks)
+                self._metrics.incr_spawn(1)
+
+        def scale_down(self, load: float = 0.0) -> None:
+            with self._scale_lock:
+                if len(self.wrks) <= self.scale_policy.min_workers:
+                    return
+                wrk = self.wrks.pop()
+                self.workers = len(self.wrks)
+                logger.info(f"Autoscale: load {load:.0%}, retiring worker-{wrk.idx + 1}")
+                wrk.terminate()
+            # Drain outside the lock so crash respawns are not held up.
+            wrk.join(self.workers_kill_timeout)
+            if wrk.is_alive():
+                logger.warning(f"Killing worker-{wrk.idx + 1} after it refused to retire")
+                wrk.kill()
+                wrk.join()
+            logger.info(f"Retired worker-{wrk.idx + 1}")
+
+    return AutoscalingServer
@@ -0,0 +1,436 @@
+"""HTTP load generation for ``nestipy bench``.
+
+The app is served by :func:`~nestipy_cli.server.create_granian_instance` in a
+child process on a local port, with the settings under test. Several load
+processes then drive it over keep-alive HTTP/1.1 connections, one asyncio
+loop each. Spreading the client over processes keeps it from saturating a
+single core before the server does.
+
+Two modes:
+
+* fixed concurrency (the default): every connection sends its next request
+  as soon as the previous response is read, so the result is the maximum
+  throughput at that concurrency;
+* fixed rate (``--rate``): requests are scheduled at the target rate. A
+  request's latency is measured from its scheduled time, not from when it
+  was sent, so a stalled server shows up in the percentiles instead of
+  silently lowering the offered load.
+
+Runs are saved as JSON under ``.nestipy/bench/``. ``--save-baseline`` marks
+one as the reference, and later runs are compared against it.
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import socket
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+BENCH_DIR = Path(".nestipy") / "bench"
+BASELINE_FILE = "baseline.json"
+SERVER_LOG_FILE = "server.log"
+# Seconds the load processes get to start before the first timed request.
+_START_DELAY = 1.0
+_PERCENTILES = {"p50_ms": 0.50, "p90_ms": 0.90, "p99_ms": 0.99, "p999_ms": 0.999}
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    paths: tuple[str, ...] = ("/",)
+    connections: int = 64
+    duration: float = 10.0
+    warmup: float = 2.0
+    # Total requests per second; None runs at fixed concurrency.
+    rate: Optional[float] = None
+    processes: int = 1
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    requests: int
+    errors: int
+    duration: float
+    rps: float
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    p999_ms: float
+    max_ms: float
+
+
+@dataclass
+class _Counts:
+    latencies: array = field(default_factory=lambda: array("d"))
+    errors: int = 0
+
+
+def _requests(host: str, port: int, paths: tuple[str, ...]) -> list[bytes]:
+    return [
+        f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nUser-Agent: nestipy-bench\r\n\r\n".encode()
+        for path in paths
+    ]
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bool]:
+    """Read one response; returns its status and whether the server closes."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length: Optional[int] = None
+    chunked = close = False
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"transfer-encoding":
+            chunked = b"chunked" in value
+        elif name == b"connection":
+            close = value == b"close"
+    if chunked:
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    elif length is None and status >= 200 and status not in (204, 304):
+        await reader.read()  # body delimited by the end of the connection
+        close = True
+    return status, close
+
+
+async def _connection(
+    host: str,
+    port: int,
+    requests: list[bytes],
+    index: int,
+    first: float,
+    start: float,
+    deadline: float,
+    interval: Optional[float],
+    counts: _Counts,
+) -> None:
+    """Drive one keep-alive connection until ``deadline`` (``perf_counter``)."""
+    loop_time = time.perf_counter
+    reader = writer = None
+    sent = index
+    scheduled = first
+    await asyncio.sleep(max(0.0, first - loop_time()))
+    try:
+        while True:
+            if interval:
+                delay = scheduled - loop_time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                started = scheduled
+                scheduled += interval
+            else:
+                started = loop_time()
+            if started >= deadline:
+                return
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                writer.write(requests[sent % len(requests)])
+                sent += 1
+                status, close = await _read_response(reader)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                if started >= start:
+                    counts.errors += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                await asyncio.sleep(0.01)
+                continue
+            if started >= start:
+                counts.latencies.append(loop_time() - started)
+                if status >= 400:
+                    counts.errors += 1
+            if close:
+                writer.close()
+                reader = writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def _drive(
+    host: str, port: int, profile: LoadProfile, connections: int, rate: float, start_at: float
+) -> _Counts:
+    # ``start_at`` is wall-clock time, shared by all load processes.
+    start = start_at - time.time() + time.perf_counter()
+    deadline = start + profile.duration
+    warm_start = start - profile.warmup
+    interval = connections / rate if rate else None
+    requests = _requests(host, port, profile.paths)
+    counts = _Counts()
+    # In fixed-rate mode the connections are staggered across one interval.
+    await asyncio.gather(
+        *(
+            _connection(
+                host,
+                port,
+                requests,
+                index,
+                warm_start + (interval * index / connections if interval else 0.0),
+                start,
+                deadline,
+                interval,
+                counts,
+            )
+            for index in range(connections)
+        )
+    )
+    return counts
+
+
+def _load_process(
+    host: str, port: int, profile: LoadProfile, connections: int, rate: float, start_at: float
+) -> tuple[array, int]:
+    try:
+        from uvloop import new_event_loop as loop_factory
+    except ImportError:
+        loop_factory = None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        counts = runner.run(_drive(host, port, profile, connections, rate, start_at))
+    return counts.latencies, counts.errors
+
+
+def percentile(ordered: array, quantile: float) -> float:
+    """Nearest-rank percentile of an ascending sequence."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(quantile * len(ordered)) - 1))]
+
+
+def summarize(latencies: array, errors: int, duration: float) -> BenchResult:
+    ordered = array("d", sorted(latencies))
+    count = len(ordered)
+    return BenchResult(
+        requests=count,
+        errors=errors,
+        duration=duration,
+        rps=count / duration if duration else 0.0,
+        mean_ms=(sum(ordered) / count * 1000) if count else 0.0,
+        max_ms=(ordered[-1] * 1000) if count else 0.0,
+        **{
+            name: percentile(ordered, quantile) * 1000
+            for name, quantile in _PERCENTILES.items()
+        },
+    )
+
+
+def run_load(host: str, port: int, profile: LoadProfile) -> BenchResult:
+    """Run ``profile`` against ``host:port`` and summarize the timed window."""
+    processes = max(1, min(profile.processes, profile.connections))
+    shares = [
+        profile.connections // processes + (index < profile.connections % processes)
+        for index in range(processes)
+    ]
+    latencies = array("d")
+    errors = 0
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        start_at = time.time() + _START_DELAY + profile.warmup
+        futures = [
+            pool.submit(
+                _load_process,
+                host,
+                port,
+                profile,
+                connections,
+                profile.rate * connections / profile.connections if profile.rate else 0.0,
+                start_at,
+            )
+            for connections in shares
+        ]
+        for future in futures:
+            part, part_errors = future.result()
+            latencies.extend(part)
+            errors += part_errors
+    return summarize(latencies, errors, profile.duration)
+
+
+def free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def _serve(cfg: Any, log_path: str) -> None:
+    from .server import configure_logging, create_granian_instance
+
+    # Keep the server's output out of the report.
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    if cfg.log_dictconfig:
+        configure_logging(cfg.log_dictconfig)
+    create_granian_instance(cfg).serve()
+
+
+@contextlib.contextmanager
+def serving(cfg: Any, log_path: Path, timeout: float = 60.0) -> Iterator[None]:
+    """Serve ``cfg`` in a child process until the block exits."""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    process = multiprocessing.get_context("spawn").Process(
+        target=_serve, args=(cfg, str(log_path)), name="nestipy-bench-server"
+    )
+    process.start()
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if not process.is_alive():
+                raise RuntimeError(
+                    f"the server exited with {process.exitcode}; see {log_path}"
+                )
+            try:
+                socket.create_connection((cfg.host, cfg.port), timeout=0.5).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(
+                        f"the server did not listen on {cfg.host}:{cfg.port} "
+                        f"within {timeout:.0f}s; see {log_path}"
+                    ) from None
+                time.sleep(0.2)
+        yield
+    finally:
+        process.terminate()
+        process.join(15)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def bench_record(
+    app_path: str, settings: dict[str, Any], profile: LoadProfile, result: BenchResult
+) -> dict[str, Any]:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "app": app_path,
+        "settings": settings,
+        "load": dict(asdict(profile), paths=list(profile.paths)),
+        "result": asdict(result),
+    }
+
+
+def save_record(record: dict[str, Any], directory: Path = BENCH_DIR, baseline: bool = False) -> Path:
+    """Write ``record`` as a timestamped run (and as the baseline if asked)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.fromisoformat(record["created"]).strftime("%Y%m%d-%H%M%S")
+    path = directory / f"{stamp}.json"
+    text = json.dumps(record, indent=2, sort_keys=True)
+    path.write_text(text)
+    if baseline:
+        (directory / BASELINE_FILE).write_text(text)
+    return path
+
+
+def load_baseline(directory: Path = BENCH_DIR) -> Optional[dict[str, Any]]:
+    try:
+        return json.loads((directory / BASELINE_FILE).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def baseline_mismatches(record: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Settings and load parameters that differ from the baseline run."""
+    differences = []
+    for section in ("settings", "load"):
+        current, saved = record[section], baseline.get(section, {})
+        for key in sorted(set(current) | set(saved)):
+            if current.get(key) != saved.get(key):
+                differences.append(f"{key}: {saved.get(key)} -> {current.get(key)}")
+    return differences
+
+
+def find_regressions(
+    result: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Metrics worse than the baseline by more than ``tolerance`` (a fraction)."""
+    regressions = []
+    if baseline["rps"] and result["rps"] < baseline["rps"] * (1 - tolerance):
+        regressions.append(
+            f"throughput {result['rps']:,.0f} req/s vs {baseline['rps']:,.0f}"
+        )
+    for name in ("p50_ms", "p99_ms"):
+        if baseline[name] and result[name] > baseline[name] * (1 + tolerance):
+            regressions.append(
+                f"{name[:-3]} {result[name]:.2f} ms vs {baseline[name]:.2f} ms"
+            )
+    if result["errors"] > baseline["errors"]:
+        regressions.append(f"errors {result['errors']} vs {baseline['errors']}")
+    return regressions
+
+
+def bench_server_config(
+    app_path: str,
+    host: str,
+    port: int,
+    workers: int,
+    loop: str,
+    http: str,
+    interface: str,
+    tuning: Any,
+) -> Any:
+    """A production :class:`GranianStartConfig` with access logging off."""
+    from .server import (
+        GranianStartConfig,
+        LoggingOptions,
+        build_logging_config,
+        ensure_log_dir,
+        write_logging_config,
+    )
+
+    ensure_log_dir()
+    config = build_logging_config(
+        False, use_color=False, options=LoggingOptions(access_sample=0.0)
+    )
+    return GranianStartConfig(
+        app_path=app_path,
+        dev=False,
+        host=host,
+        port=port,
+        workers=workers,
+        ssl_keyfile=None,
+        ssl_cert_file=None,
+        loop=loop,
+        http=http,
+        is_microservice=False,
+        log_config_path=write_logging_config(config),
+        reload_any=False,
+        reload_paths=[],
+        reload_ignore_dirs=[],
+        reload_ignore_patterns=[],
+        reload_ignore_paths=[],
+        reload_tick=None,
+        reload_ignore_worker_failure=False,
+        log_dictconfig=config,
+        tuning=tuning,
+        interface=interface,
+    )
+
+
+def server_settings(cfg: Any) -> dict[str, Any]:
+    """The settings under test, as recorded with each run."""
+    settings = {
+        "workers": cfg.workers,
+        "loop": cfg.loop,
+        "http": cfg.http,
+        "interface": cfg.interface,
+    }
+    settings.update(
+        (name, value) for name, value in asdict(cfg.tuning).items() if value is not None
+    )
+    return settings
@@ -1,49 +1,232 @@
-import asyncio
 import atexit
+import functools
 import importlib
 import os
 import sys
+import time
 import warnings
 from pathlib import Path
-from subprocess import DEVNULL, check_call
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
-import questionary
 import rich_click as click
 import shutil
 import subprocess
 from click_aliases import ClickAliasedGroup
-from rich.box import ROUNDED
-from rich.console import Console
-from rich.panel import Panel
-from rich.style import Style
-from rich.text import Text
-from yaspin import yaspin
-
-from . import frontend
-from .handler import NestipyCliHandler
-from .repl import REPL
-from .server import (
-    GranianStartConfig,
-    build_logging_config,
-    configure_logging,
-    create_granian_instance,
-    ensure_log_dir,
-    granian_log_prefixer,
-    select_port,
-    write_logging_config,
-)
+
 from .style import CliStyle
 
-console = Console()
+if TYPE_CHECKING:
+    from .handler import NestipyCliHandler
 
-handler = NestipyCliHandler()
+# Heavy dependencies (questionary, yaspin, rich panels, granian helpers and the
+# code generators behind NestipyCliHandler) are imported inside the commands
+# that use them, so `nestipy --help`, `nestipy run` and shell completion stay
+# fast. tests/test_cli_startup.py guards this.
 echo = CliStyle()
 
 
+@functools.lru_cache(maxsize=None)
+def get_handler() -> "NestipyCliHandler":
+    from .handler import NestipyCliHandler
+
+    return NestipyCliHandler()
+
+
+class ByteSize(click.ParamType):
+    """Click type for sizes such as ``1048576``, ``100M`` or ``1.5G``."""
+
+    name = "size"
+
+    def convert(self, value, param, ctx):
+        from .server import parse_byte_size
+
+        try:
+            return parse_byte_size(value)
+        except ValueError as exc:
+            self.fail(str(exc), param, ctx)
+
+
+class FileMode(click.ParamType):
+    """Click type for octal permission bits such as ``660`` or ``0o660``."""
+
+    name = "mode"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int):
+            return value
+        try:
+            mode = int(value.removeprefix("0o"), 8)
+        except ValueError:
+            self.fail(f"{value!r} is not an octal mode", param, ctx)
+        if not 0 <= mode <= 0o777:
+            self.fail("must be between 000 and 777", param, ctx)
+        return mode
+
+
+class WorkerCount(click.ParamType):
+    """Click type for ``--workers``: a positive integer or ``auto``."""
+
+    name = "count|auto"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int) or value == "auto":
+            return value
+        try:
+            count = int(value)
+        except ValueError:
+            self.fail(f"{value!r} is neither a number nor 'auto'", param, ctx)
+        if count < 1:
+            self.fail("must be at least 1", param, ctx)
+        return count
+
+
+class CommaSeparated(click.ParamType):
+    """Click type for ``1,2,4``: a list of values of ``item_type``."""
+
+    def __init__(self, item_type: click.ParamType) -> None:
+        self.item_type = item_type
+        self.name = f"{item_type.name}[,...]"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, list):
+            return value
+        items = [item.strip() for item in str(value).split(",") if item.strip()]
+        if not items:
+            self.fail("expected at least one value", param, ctx)
+        values = [self.item_type.convert(item, param, ctx) for item in items]
+        return list(dict.fromkeys(values))
+
+
+def _flag_or_none(name: str, help: str):
+    return click.option(f"--{name}/--no-{name}", default=None, help=help)
+
+
+# Granian performance settings, named after (and validated like) granian's own
+# CLI options. Unset options keep granian's defaults; see --explain-config.
+_GRANIAN_TUNING_OPTIONS = (
+    click.option(
+        "--runtime-threads",
+        type=click.IntRange(min=1),
+        help="Rust runtime threads per worker.",
+    ),
+    click.option(
+        "--runtime-blocking-threads",
+        type=click.IntRange(min=1),
+        help="Rust runtime blocking threads per worker.",
+    ),
+    click.option(
+        "--runtime-mode",
+        type=click.Choice(["auto", "mt", "st"]),
+        help="Rust runtime mode: multi-threaded (mt) or single-threaded (st).",
+    ),
+    click.option(
+        "--task-impl",
+        type=click.Choice(["asyncio", "rust"]),
+        help="Async task implementation.",
+    ),
+    click.option(
+        "--backlog",
+        type=click.IntRange(min=128),
+        help="Maximum number of pending connections on the listening socket.",
+    ),
+    click.option(
+        "--backpressure",
+        type=click.IntRange(min=1),
+        help="Concurrent requests per worker (granian default: backlog / workers).",
+    ),
+    click.option(
+        "--http1-buffer-size",
+        "http1_max_buffer_size",
+        type=click.IntRange(min=8192),
+        help="HTTP/1 maximum buffer size, in bytes.",
+    ),
+    click.option(
+        "--http1-header-read-timeout",
+        type=click.IntRange(1, 60_000),
+        help="HTTP/1 header read timeout, in milliseconds.",
+    ),
+    _flag_or_none("http1-keep-alive", "Enable HTTP/1 keep-alive."),
+    _flag_or_none("http1-pipeline-flush", "Aggregate HTTP/1 flushes for pipelined responses."),
+    _flag_or_none("http2-adaptive-window", "Use HTTP/2 adaptive flow control."),
+    click.option(
+        "--http2-initial-connection-window-size",
+        type=click.IntRange(min=1024),
+        help="HTTP/2 initial connection window size, in bytes.",
+    ),
+    click.option(
+        "--http2-initial-stream-window-size",
+        type=click.IntRange(min=1024),
+        help="HTTP/2 initial stream window size, in bytes.",
+    ),
+    click.option(
+        "--http2-keep-alive-interval",
+        type=click.IntRange(1, 60_000),
+        help="HTTP/2 keep-alive ping interval, in milliseconds.",
+    ),
+    click.option(
+        "--http2-keep-alive-timeout",
+        type=click.IntRange(min=1),
+        help="HTTP/2 keep-alive ping timeout, in seconds.",
+    ),
+    click.option(
+        "--http2-max-concurrent-streams",
+        type=click.IntRange(min=10),
+        help="HTTP/2 maximum concurrent streams per connection.",
+    ),
+    click.option(
+        "--http2-max-frame-size",
+        type=click.IntRange(min=1024),
+        help="HTTP/2 maximum frame size, in bytes.",
+    ),
+    click.option(
+        "--http2-max-headers-size",
+        type=click.IntRange(min=1),
+        help="HTTP/2 maximum size of received headers, in bytes.",
+    ),
+    click.option(
+        "--http2-max-send-buffer-size",
+        type=click.IntRange(min=1024),
+        help="HTTP/2 maximum write buffer size per stream, in bytes.",
+    ),
+)
+
+
+def granian_tuning_options(func):
+    for option in reversed(_GRANIAN_TUNING_OPTIONS):
+        func = option(func)
+    return func
+
+
 @click.group(cls=ClickAliasedGroup)
-def main():
+@click.pass_context
+def main(ctx: click.Context):
     click.clear()
+    if ctx.invoked_subcommand == "start":
+        _use_pyproject_start_defaults(ctx)
+
+
+def _use_pyproject_start_defaults(ctx: click.Context) -> None:
+    """Make ``[tool.nestipy.start]`` the defaults of ``nestipy start``."""
+    import tomllib
+
+    from .pyproject import PYPROJECT_FILE, load_start_defaults
+
+    try:
+        defaults = load_start_defaults(Path(PYPROJECT_FILE))
+    except tomllib.TOMLDecodeError as exc:
+        echo.warning(f"[START] Ignoring {PYPROJECT_FILE}: {exc}")
+        return
+    if not defaults:
+        return
+    known = {param.name for param in start.params}
+    for name in sorted(set(defaults) - known):
+        echo.warning(
+            f"[START] Unknown option in [tool.nestipy.start]: {name.replace('_', '-')}"
+        )
+        del defaults[name]
+    ctx.default_map = {**(ctx.default_map or {}), "start": defaults}
+    applied = ", ".join(f"{name}={value}" for name, value in defaults.items())
+    echo.info(f"[START] Defaults from {PYPROJECT_FILE}: {applied}")
 
 
 @main.command(aliases=["n"])
@@ -65,6 +248,10 @@ def main():
 @click.option("--svelte", is_flag=True, default=False, help="Use Svelte for the Inertia frontend.")
 def new(name, full: bool, fullstack: bool, react: bool, vue: bool, svelte: bool):
     """Create new project"""
+    import questionary
+
+    from . import frontend
+
     click.clear()
 
     chosen = [fw for fw, on in (("react", react), ("vue", vue), ("svelte", svelte)) if on]
@@ -84,7 +271,7 @@ def new(name, full: bool, fullstack: bool, react: bool, vue: bool, svelte: bool)
             or "react"
         )
 
-    destination = handler.create_project(name, full=full, fullstack=fullstack)
+    destination = get_handler().create_project(name, full=full, fullstack=fullstack)
     if destination is None:
         echo.error(f"Folder {name} already exist.")
         return
@@ -181,11 +368,70 @@ def make():
 @click.option("-D", "--dev", is_flag=True, default=False, help="Development server")
 @click.option("-P", "--port", required=False, default=8000, help="Server port")
 @click.option("-H", "--host", required=False, default="0.0.0.0", help="Server host")
-@click.option("--workers", default=1, type=int, help="Number of worker processes.")
+@click.option(
+    "--workers",
+    default=1,
+    type=WorkerCount(),
+    help="Number of worker processes, or 'auto' to size from CPU/memory limits.",
+)
+@click.option(
+    "--worker-memory",
+    type=ByteSize(),
+    default="256M",
+    help="Expected memory per worker, used by --workers auto.",
+)
+@click.option(
+    "--pin-cpus",
+    is_flag=True,
+    default=False,
+    help="Pin each worker to its own CPU core (Linux).",
+)
+@click.option(
+    "--workers-min",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Fewest workers to keep when autoscaling (default: 1).",
+)
+@click.option(
+    "--workers-max",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Autoscale the worker count up to this many workers under load (production).",
+)
+@click.option(
+    "--scale-cooldown",
+    type=click.FloatRange(min=0.0),
+    default=60.0,
+    help="Seconds a worker pool must stay idle before a worker is retired.",
+)
 @click.option("--ssl-keyfile", type=str, help="SSL certificate key.")
 @click.option("--ssl-cert-file", type=str, help="SSL certificate file.")
 @click.option("--loop", type=str, help="Event loop.", default="auto")
 @click.option("--http", type=str, help="HTTP protocol version.", default="auto")
+@click.option(
+    "--interface",
+    type=click.Choice(["asgi", "rsgi"]),
+    default="asgi",
+    help="Granian interface; rsgi serves the app through nestipy's RSGI adapter.",
+)
+@click.option(
+    "--uds",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Bind a Unix domain socket at this path instead of --host/--port.",
+)
+@click.option(
+    "--uds-permissions",
+    type=FileMode(),
+    default=None,
+    help="Octal permissions for the --uds socket, e.g. 660.",
+)
+@click.option(
+    "--uds-owner",
+    type=str,
+    default=None,
+    help="Owner of the --uds socket: USER, USER:GROUP or :GROUP.",
+)
 @click.option(
     "--reload-any",
     is_flag=True,
@@ -239,16 +485,203 @@ def make():
     default="inertia",
     help="Frontend directory for --web (default: inertia).",
 )
+@click.option(
+    "--static/--no-static",
+    "serve_static",
+    default=True,
+    help="In production, let granian serve public/ and <web-dir>/dist/ directly.",
+)
+@click.option(
+    "--static-prefix",
+    default="/",
+    help="URL prefix for public/ (/ mounts each subdirectory, e.g. /css).",
+)
+@click.option(
+    "--dist-prefix",
+    default="/",
+    help="URL prefix for the built frontend in <web-dir>/dist/.",
+)
+@click.option(
+    "--static-expires",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Cache-Control max-age in seconds for static files (granian default: 86400; 0 disables).",
+)
+@click.option(
+    "--log-format",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    help="Access log format; json emits one object per request.",
+)
+@click.option(
+    "--log-queue-size",
+    type=int,
+    default=10000,
+    help="Max log records buffered per file before the overflow policy applies (production).",
+)
+@click.option(
+    "--log-queue-overflow",
+    type=click.Choice(["drop-oldest", "block"]),
+    default="drop-oldest",
+    help="What to do when the log queue is full (production).",
+)
+@click.option(
+    "--log-flush-interval",
+    type=float,
+    default=1.0,
+    help="Seconds between log file flushes (production).",
+)
+@click.option(
+    "--log-max-bytes",
+    type=ByteSize(),
+    default="0",
+    help="Rotate log files once they reach this size, e.g. 100M (production; 0 disables).",
+)
+@click.option(
+    "--log-rotate-when",
+    type=click.Choice(["S", "M", "H", "D", "midnight"]),
+    default=None,
+    help="Rotate log files every second/minute/hour/day or at midnight (production).",
+)
+@click.option(
+    "--log-backups",
+    type=int,
+    default=7,
+    help="Number of gzip-compressed rotated log files to keep.",
+)
+@click.option(
+    "--access-log-sample",
+    type=click.FloatRange(0.0, 1.0),
+    default=1.0,
+    help="Fraction of successful requests to log, e.g. 0.01.",
+)
+@click.option(
+    "--access-log-rate-limit",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Max successful access lines per second and worker (0 = unlimited).",
+)
+@click.option(
+    "--access-log-errors-always",
+    is_flag=True,
+    default=False,
+    help="Always log 4xx/5xx responses when sampling or rate limiting.",
+)
+@click.option(
+    "--access-log-slow-ms",
+    type=float,
+    default=0.0,
+    help="Always log requests slower than this many ms when sampling (0 disables).",
+)
+@click.option(
+    "--log-collector/--no-log-collector",
+    default=None,
+    help=(
+        "Write log files from one collector process (production; default: on "
+        "with --workers > 1 or log rotation)."
+    ),
+)
+@click.option(
+    "--raw-logs",
+    is_flag=True,
+    default=False,
+    help=(
+        "Forward granian output untouched (no [NESTIPY] rewriting). Production "
+        "skips the rewrite pipe unless route stats, metrics, rolling restarts or "
+        "--max-requests need it; this flag also turns rewriting off then."
+    ),
+)
+@click.option(
+    "--route-stats",
+    is_flag=True,
+    default=False,
+    help="Track per-route counts and p50/p95/p99 latency from the access log.",
+)
+@click.option(
+    "--route-stats-interval",
+    type=click.FloatRange(min=1.0),
+    default=30.0,
+    help="Seconds between route stats tables (dev) or logs/route-stats.json snapshots.",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(0, 65535),
+    default=None,
+    help="Serve Prometheus metrics for all workers from the master on this port.",
+)
+@click.option(
+    "--metrics-host",
+    default="127.0.0.1",
+    help="Address for the --metrics-port endpoint.",
+)
+@click.option(
+    "--preload",
+    is_flag=True,
+    default=False,
+    help="Import the app once in the master and fork workers from it (shared memory).",
+)
+@click.option(
+    "--max-worker-rss",
+    type=ByteSize(),
+    default="0",
+    help="Gracefully recycle a worker whose RSS reaches this size, e.g. 1.5G (0 disables).",
+)
+@click.option(
+    "--max-requests",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Gracefully recycle a worker after this many requests (0 disables).",
+)
+@click.option(
+    "--max-requests-jitter",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Add up to this many requests to each worker's --max-requests limit.",
+)
+@click.option(
+    "--rolling-restart",
+    is_flag=True,
+    default=False,
+    help="On SIGHUP or `nestipy restart`, replace workers one at a time once each is ready.",
+)
+@click.option(
+    "--ready-timeout",
+    type=click.FloatRange(min=1.0),
+    default=60.0,
+    help="Seconds a replacement worker may take to become ready in a rolling restart.",
+)
+@click.option(
+    "--pid-file",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Write the master PID here (default with --rolling-restart: .nestipy/nestipy.pid).",
+)
+@granian_tuning_options
+@click.option(
+    "--explain-config",
+    is_flag=True,
+    default=False,
+    help="Print the effective granian settings and where each comes from, then exit.",
+)
 def start(
     app_path: str,
     dev: bool,
     port: int,
     host: str,
-    workers: int,
+    workers: int | Literal["auto"],
+    worker_memory: int,
+    pin_cpus: bool,
+    workers_min: int | None,
+    workers_max: int | None,
+    scale_cooldown: float,
     ssl_keyfile: str,
     ssl_cert_file,
     loop: Literal["auto", "asyncio", "rloop", "uvloop"],
     http: Literal["auto", "1", "2"],
+    interface: Literal["asgi", "rsgi"],
+    uds: str | None,
+    uds_permissions: int | None,
+    uds_owner: str | None,
     reload_any: bool,
     reload_paths: tuple[str, ...],
     reload_ignore_dirs: tuple[str, ...],
@@ -258,8 +691,81 @@ def start(
     reload_ignore_worker_failure: bool,
     web: bool,
     web_dir: str,
+    serve_static: bool,
+    static_prefix: str,
+    dist_prefix: str,
+    static_expires: int | None,
+    log_format: Literal["text", "json"],
+    log_queue_size: int,
+    log_queue_overflow: Literal["drop-oldest", "block"],
+    log_flush_interval: float,
+    log_max_bytes: int,
+    log_rotate_when: Literal["S", "M", "H", "D", "midnight"] | None,
+    log_backups: int,
+    access_log_sample: float,
+    access_log_rate_limit: int,
+    access_log_errors_always: bool,
+    access_log_slow_ms: float,
+    log_collector: bool | None,
+    raw_logs: bool,
+    route_stats: bool,
+    route_stats_interval: float,
+    metrics_port: int | None,
+    metrics_host: str,
+    preload: bool,
+    max_worker_rss: int,
+    max_requests: int,
+    max_requests_jitter: int,
+    rolling_restart: bool,
+    ready_timeout: float,
+    pid_file: str | None,
+    explain_config: bool,
+    **tuning,
 ) -> None:
     """Starting nestipy server"""
+    import asyncio
+    import dataclasses
+    from subprocess import DEVNULL, check_call
+
+    from rich.box import ROUNDED
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.style import Style
+    from rich.text import Text
+    from yaspin import yaspin
+
+    from .app_kind import AppKindError, detect_app_kind
+    from .autoscale import ScalePolicy
+    from .collector import LogCollector
+    from .metrics import MetricsRegistry, MetricsServer, WorkerTracker
+    from .recycle import RecyclePolicy
+    from .resources import CpuPinner, auto_worker_count, detect_limits
+    from .rolling import DEFAULT_PID_FILE
+    from .server import (
+        GranianStartConfig,
+        GranianTuning,
+        LoggingOptions,
+        UnsupportedGranianError,
+        access_log_thinning,
+        build_logging_config,
+        configure_logging,
+        create_granian_instance,
+        ensure_log_dir,
+        granian_log_prefixer,
+        preload_application,
+        preload_supported,
+        report_worker_memory,
+        rsgi_supported,
+        select_port,
+        should_passthrough_logs,
+        stdout_supports_color,
+        write_logging_config,
+    )
+    from .stats import ROUTE_STATS_FILE, RouteStats, RouteStatsReporter
+    from .assets import ASSETS_DIR, MANIFEST_FILE
+    from .static import detect_static_mounts
+    from .uds import SocketInUseError, parse_owner
+
     try:
         import nestipy  # noqa: F401
     except ImportError:
@@ -302,51 +808,130 @@ def start(
         app_ = getattr(mod, app_name)
         return mod, app_
 
-    m, app = import_app()
-    from nestipy.core import NestipyApplication, NestipyMicroservice
-
-    is_ms: bool = isinstance(app, NestipyMicroservice) and not isinstance(
-        app, NestipyApplication
-    )
-    config = build_logging_config(dev)
-    configure_logging(config)
-    if not dev:
-        ensure_log_dir()
-    environment = "Development" if dev else "Production"
-    selected_port = select_port(port, is_ms)
-    scheme = "https" if ssl_cert_file else "http"
-    multiline_text = Text(style=Style(color="green"))
-    if is_ms:
-        multiline_text.append(
-            "Microservice server running ...", Style(bold=True, color="green")
+    # Keep the master thin: only a microservice run in production needs the
+    # app object here; granian workers import it themselves.
+    try:
+        app_kind = detect_app_kind(module_file_path.parent, module_name, app_name)
+    except AppKindError as exc:
+        echo.error(f"[START] {exc}")
+        sys.exit(1)
+    is_ms: bool = app_kind == "microservice"
+    if workers == "auto":
+        limits = detect_limits()
+        workers = auto_worker_count(limits, worker_memory)
+        echo.info(
+            f"[WORKERS] auto: {workers} (cpus={limits.cpus}, "
+            f"cpu quota={limits.cpu_quota or 'none'}, "
+            f"memory limit={limits.memory_limit or 'none'})"
         )
-    else:
-        multiline_text.append(f"Serving at: {scheme}://{host}:{selected_port}")
-        if dev:
-            multiline_text.append(
-                f"\nDev server running on: {scheme}://{host}:{selected_port}",
-                Style(bold=True, color="green"),
+    scale_policy = None
+    if workers_max is not None:
+        if workers_min is not None and workers_min > workers_max:
+            raise click.BadParameter(
+                "must not exceed --workers-max", param_hint="'--workers-min'"
+            )
+        if dev or is_ms:
+            echo.warning(
+                "[WORKERS] --workers-max is ignored with --dev and for microservices."
+            )
+        else:
+            scale_policy = ScalePolicy(
+                min_workers=workers_min or 1,
+                max_workers=workers_max,
+                cooldown=scale_cooldown,
             )
-    multiline_text.append(f"\nRunning in {environment.lower()} mode")
-    if dev:
-        multiline_text.append("\nFor production, use : ")
-        multiline_text.append("nestipy start", Style(bold=True, color="green"))
-
-    panel = Panel(
-        multiline_text,
-        title=f"Nestipy CLI - {environment} mode",
-        box=ROUNDED,
-        border_style=Style(bold=True, encircle=True, color="green", dim=True),
-        width=50,
-        padding=(0, 1, 0, 6),
-        highlight=True,
-        style=Style(color="green"),
+            # Logging and IPC are set up for the largest pool.
+            workers = workers_max
+    elif workers_min is not None:
+        echo.warning("[WORKERS] --workers-min has no effect without --workers-max.")
+    if rolling_restart and (dev or is_ms):
+        echo.warning(
+            "[RESTART] --rolling-restart is ignored with --dev and for microservices."
+        )
+        rolling_restart = False
+    if (max_worker_rss or max_requests) and (dev or is_ms):
+        echo.warning(
+            "[WORKERS] --max-worker-rss and --max-requests are ignored with --dev "
+            "and for microservices."
+        )
+        max_worker_rss = max_requests = 0
+    if interface == "rsgi" and is_ms:
+        echo.warning("[START] --interface rsgi does not apply to microservices; using asgi.")
+        interface = "asgi"
+    elif interface == "rsgi" and not rsgi_supported():
+        echo.warning("[START] The installed granian has no RSGI support; using asgi.")
+        interface = "asgi"
+    uds_path = uds_owner_ids = None
+    if uds and sys.platform == "win32":
+        echo.error("[START] --uds is not supported on Windows.")
+        sys.exit(1)
+    if uds and is_ms:
+        echo.warning("[START] --uds does not apply to microservices; ignoring it.")
+    elif uds:
+        uds_path = Path(uds).resolve()
+        if uds_owner:
+            try:
+                uds_owner_ids = parse_owner(uds_owner)
+            except ValueError as exc:
+                raise click.BadParameter(str(exc), param_hint="'--uds-owner'")
+    elif uds_permissions is not None or uds_owner:
+        echo.warning("[START] --uds-permissions and --uds-owner need --uds; ignoring them.")
+    route_stats = route_stats and not is_ms
+    if is_ms:
+        metrics_port = None
+    # Route stats, metrics, rolling-restart readiness and request-count
+    # recycling need to see the worker output, so they keep the pipe in place.
+    observe_logs = (
+        route_stats or metrics_port is not None or rolling_restart or bool(max_requests)
     )
-    console.print(panel)
-    if is_ms and not dev:
-        asyncio.run(app.start())
-
-    log_config_path = write_logging_config(config)
+    passthrough_logs = should_passthrough_logs(dev, raw_logs) and not observe_logs
+    logging_options = LoggingOptions(
+        log_format=log_format,
+        queue_size=log_queue_size,
+        queue_overflow=log_queue_overflow,
+        flush_interval=log_flush_interval,
+        max_bytes=log_max_bytes,
+        rotate_when=log_rotate_when,
+        backups=log_backups,
+        access_sample=access_log_sample,
+        access_rate_limit=access_log_rate_limit,
+        access_errors_always=access_log_errors_always,
+        access_slow_ms=access_log_slow_ms,
+        max_requests=max_requests,
+        max_requests_jitter=max_requests_jitter,
+    )
+    thinning = " and ".join(access_log_thinning(logging_options))
+    if metrics_port is not None and thinning:
+        # Prometheus counters must be exact; sampled ones would be off by the
+        # sample rate, with histograms skewed towards errors and slow requests.
+        raise click.BadParameter(
+            f"counts requests from the access log and cannot be combined with {thinning}",
+            param_hint="'--metrics-port'",
+        )
+    if route_stats and thinning:
+        echo.warning(
+            f"[STATS] --route-stats counts the access lines left by {thinning}: "
+            "request counts are sampled and percentiles lean towards the requests "
+            "that are always logged (errors, slow requests)."
+        )
+    # When output goes through the rewrite pipe, the rewriter adds the color.
+    config = build_logging_config(
+        dev,
+        use_color=passthrough_logs and stdout_supports_color(),
+        options=logging_options,
+    )
+    rotating = bool(log_max_bytes or log_rotate_when)
+    if log_collector is None:
+        # The master writes logs/default.log too, so with rotation even a
+        # single worker would share the files; the collector owns rotation.
+        log_collector = workers > 1 or rotating
+    if not log_collector and rotating and not dev:
+        echo.warning(
+            "[LOG] Rotation without --log-collector lets the master and every "
+            "worker rotate the same files; enable --log-collector to rotate them "
+            "from one process."
+        )
+    selected_port = select_port(port, is_ms)
     project_root = module_file_path.parent.resolve()
     cwd_root = Path.cwd().resolve()
 
@@ -374,76 +959,969 @@ def start(
     if dev and not reload_any and not reload_paths_list:
         reload_paths_list.append(str(project_root))
 
-    # --web (dev only): run the Inertia frontend dev server (vite) alongside the backend
-    web_process = None
-    if web and dev:
-        web_path = project_root / web_dir
-        if not web_path.exists():
-            echo.warning(
-                f"[WEB] '{web_dir}/' not found — skipping frontend dev server."
+    static_mounts = []
+    assets_manifest = project_root / ASSETS_DIR / MANIFEST_FILE
+    if not serve_static or dev or is_ms or not assets_manifest.is_file():
+        assets_manifest = None
+    if assets_manifest is not None:
+        echo.info(f"[STATIC] Serving built assets from {assets_manifest.parent}")
+    elif serve_static and not dev and not is_ms:
+        static_mounts, skipped = detect_static_mounts(
+            project_root, web_dir, static_prefix, dist_prefix
+        )
+        for mount in static_mounts:
+            echo.info(f"[STATIC] {mount.route} -> {mount.directory}")
+        for entry in skipped:
+            echo.warning(f"[STATIC] Not serving {entry}")
+
+    pid_path = None
+    if pid_file or rolling_restart:
+        pid_path = Path(pid_file or DEFAULT_PID_FILE).resolve()
+    granian_config = GranianStartConfig(
+        app_path=app_path,
+        dev=dev,
+        host=host,
+        port=selected_port,
+        workers=workers,
+        ssl_keyfile=ssl_keyfile,
+        ssl_cert_file=ssl_cert_file,
+        loop=loop,
+        http=http,
+        is_microservice=is_ms,
+        # Written below, once we know the server will run.
+        log_config_path=None,
+        reload_any=reload_any,
+        reload_paths=reload_paths_list,
+        reload_ignore_dirs=reload_ignore_dirs_list,
+        reload_ignore_patterns=list(reload_ignore_patterns),
+        reload_ignore_paths=reload_ignore_paths_list,
+        reload_tick=reload_tick,
+        reload_ignore_worker_failure=reload_ignore_worker_failure,
+        log_dictconfig=config,
+        scale_policy=scale_policy,
+        pid_file=pid_path,
+        ready_timeout=ready_timeout if rolling_restart else None,
+        recycle_policy=(
+            RecyclePolicy(max_rss=max_worker_rss, max_requests=max_requests)
+            if max_worker_rss or max_requests
+            else None
+        ),
+        tuning=GranianTuning(**tuning),
+        interface=interface,
+        uds=uds_path,
+        uds_permissions=uds_permissions if uds_path else None,
+        uds_owner=uds_owner_ids,
+        static_mounts=tuple(static_mounts),
+        static_expires=static_expires,
+        assets_manifest=assets_manifest,
+    )
+    # Nothing so far has started a process or touched the filesystem.
+    if explain_config:
+        _print_granian_config(granian_config)
+        return
+
+    collector = None
+    if log_collector and not dev and not is_ms:
+        collector = LogCollector(config, reorder_window=log_flush_interval + 0.5)
+        collector.start()
+        config = collector.worker_config
+    # Everything below runs with the collector up; stop it (and the helper
+    # threads started further down) however the start-up ends.
+    pinner = reporter = metrics_server = None
+    try:
+        configure_logging(config)
+        log_dir = None
+        if not dev:
+            log_dir = ensure_log_dir()
+        environment = "Development" if dev else "Production"
+        scheme = "https" if ssl_cert_file else "http"
+        multiline_text = Text(style=Style(color="green"))
+        if is_ms:
+            multiline_text.append(
+                "Microservice server running ...", Style(bold=True, color="green")
             )
-        elif not shutil.which("npm"):
-            echo.warning("[WEB] npm not found — skipping frontend dev server.")
         else:
-            if not (web_path / "node_modules").exists():
-                echo.info("[WEB] Installing frontend dependencies (npm install)...")
-                subprocess.run(["npm", "install"], cwd=str(web_path), check=False)
-            echo.info(f"[WEB] Starting Inertia dev server (npm run dev in {web_dir}/)...")
-            web_process = subprocess.Popen(
-                ["npm", "run", "dev"],
-                cwd=str(web_path),
-                env=os.environ.copy(),
+            address = f"unix:{uds_path}" if uds_path else f"{host}:{selected_port}"
+            multiline_text.append(f"Serving at: {scheme}://{address}")
+            if dev:
+                multiline_text.append(
+                    f"\nDev server running on: {scheme}://{address}",
+                    Style(bold=True, color="green"),
+                )
+        multiline_text.append(f"\nRunning in {environment.lower()} mode")
+        if interface == "rsgi":
+            multiline_text.append("\nInterface: RSGI")
+        if dev:
+            multiline_text.append("\nFor production, use : ")
+            multiline_text.append("nestipy start", Style(bold=True, color="green"))
+
+        panel = Panel(
+            multiline_text,
+            title=f"Nestipy CLI - {environment} mode",
+            box=ROUNDED,
+            border_style=Style(bold=True, encircle=True, color="green", dim=True),
+            width=50,
+            padding=(0, 1, 0, 6),
+            highlight=True,
+            style=Style(color="green"),
+        )
+        Console().print(panel)
+        if is_ms and not dev:
+            _, app = import_app()
+            asyncio.run(app.start())
+
+        # --web (dev only): run the Inertia frontend dev server (vite) alongside the backend
+        web_process = None
+        if web and dev:
+            web_path = project_root / web_dir
+            if not web_path.exists():
+                echo.warning(
+                    f"[WEB] '{web_dir}/' not found — skipping frontend dev server."
+                )
+            elif not shutil.which("npm"):
+                echo.warning("[WEB] npm not found — skipping frontend dev server.")
+            else:
+                if not (web_path / "node_modules").exists():
+                    echo.info("[WEB] Installing frontend dependencies (npm install)...")
+                    subprocess.run(["npm", "install"], cwd=str(web_path), check=False)
+                echo.info(f"[WEB] Starting Inertia dev server (npm run dev in {web_dir}/)...")
+                web_process = subprocess.Popen(
+                    ["npm", "run", "dev"],
+                    cwd=str(web_path),
+                    env=os.environ.copy(),
+                )
+
+                def _terminate_web() -> None:
+                    if web_process and web_process.poll() is None:
+                        web_process.terminate()
+
+                atexit.register(_terminate_web)
+        elif web and not dev:
+            echo.warning(
+                "[WEB] --web only runs the frontend dev server in --dev. "
+                "In production, build it (npm run build) and serve the dist via Inertia."
+            )
+
+        for path in (uds_path, pid_path):
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+        granian_config = dataclasses.replace(
+            granian_config,
+            log_config_path=write_logging_config(config),
+            log_dictconfig=config,
+        )
+        try:
+            server = create_granian_instance(granian_config)
+        except UnsupportedGranianError as exc:
+            echo.error(f"[START] {exc}")
+            sys.exit(1)
+        # Children of the master that are not granian workers.
+        helper_pids = frozenset(
+            process.pid
+            for process in (collector.process if collector else None, web_process)
+            if process is not None
+        )
+        if preload and (dev or is_ms):
+            echo.warning(
+                "[PRELOAD] --preload is ignored with --dev (the reloader re-imports "
+                "the app) and for microservices."
+            )
+            preload = False
+        elif preload and not preload_supported():
+            echo.warning("[PRELOAD] --preload needs the fork start method; ignoring it.")
+            preload = False
+        if preload and rolling_restart:
+            echo.warning(
+                "[RESTART] With --preload, replacement workers fork from the master's "
+                "copy of the app: a rolling restart re-reads config and env files "
+                "but not code changes."
             )
+        if preload:
+            preload_application(app_path)
+            report_worker_memory(
+                scale_policy.min_workers if scale_policy else workers,
+                echo.info,
+                exclude=helper_pids,
+            )
+
+        if pin_cpus:
+            if hasattr(os, "sched_setaffinity"):
+                pinner = CpuPinner(exclude=helper_pids)
+                pinner.start()
+            else:
+                echo.warning("[WORKERS] --pin-cpus is only supported on Linux; ignoring it.")
+
+        observers = []
+        if route_stats or metrics_port is not None:
+            stats = RouteStats()
+            observer = stats.observe_line
+            if route_stats:
+                reporter = RouteStatsReporter(
+                    stats,
+                    interval=route_stats_interval,
+                    output=log_dir / ROUTE_STATS_FILE if log_dir is not None else None,
+                )
+                reporter.start()
+            if metrics_port is not None:
+                registry = MetricsRegistry(stats, WorkerTracker())
+                observer = registry.observe_line
+                metrics_server = MetricsServer(registry, metrics_host, metrics_port)
+                metrics_server.start()
+                echo.info(
+                    f"[METRICS] Serving http://{metrics_host}:{metrics_server.port}/metrics"
+                )
+            observers.append(observer)
+        if max_requests:
+            observers.append(server.observe_line)
+        if rolling_restart:
+            observers.append(server.readiness.observe_line)
+            echo.info(
+                f"[RESTART] Rolling restart on SIGHUP or `nestipy restart` "
+                f"(pid file: {server.pid_file})"
+            )
+
+        def observe_all(line: bytes) -> None:
+            for observe in observers:
+                observe(line)
+
+        observer = observers[0] if len(observers) == 1 else None
+        if len(observers) > 1:
+            observer = observe_all
+        with granian_log_prefixer(
+            passthrough=passthrough_logs, observer=observer, rewrite=not raw_logs
+        ):
+            try:
+                server.serve()
+            except (SocketInUseError, FileExistsError) as exc:
+                echo.error(f"[START] Cannot bind {uds_path}: {exc}")
+                sys.exit(1)
+    finally:
+        if pinner is not None:
+            pinner.stop()
+        if metrics_server is not None:
+            metrics_server.stop()
+        if reporter is not None:
+            reporter.stop()
+        if collector is not None:
+            collector.stop()
+
+
+def _print_granian_config(cfg) -> None:
+    import inspect
+
+    from granian import Granian
+    from rich.console import Console
+    from rich.table import Table
+
+    from .server import explain_granian_config
+
+    table = Table(title="Effective granian settings")
+    table.add_column("Setting")
+    table.add_column("Value")
+    table.add_column("Source")
+    for setting, value, source in explain_granian_config(
+        cfg, inspect.signature(Granian)
+    ):
+        table.add_row(
+            setting, value, source if source != "nestipy start" else f"[green]{source}"
+        )
+    Console().print(table)
 
-            def _terminate_web() -> None:
-                if web_process and web_process.poll() is None:
-                    web_process.terminate()
 
-            atexit.register(_terminate_web)
-    elif web and not dev:
+@main.command(name="restart")
+@click.option(
+    "--pid-file",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="PID file of the running server (default: .nestipy/nestipy.pid).",
+)
+def restart(pid_file: str | None) -> None:
+    """Roll the workers of a server started with --rolling-restart."""
+    from .rolling import DEFAULT_PID_FILE, RestartError, send_restart
+
+    if sys.platform == "win32":
+        echo.error("[RESTART] Rolling restarts need SIGHUP, which Windows lacks.")
+        sys.exit(1)
+    try:
+        pid = send_restart(Path(pid_file) if pid_file else DEFAULT_PID_FILE)
+    except RestartError as exc:
+        echo.error(f"[RESTART] {exc}")
+        sys.exit(1)
+    echo.success(f"[RESTART] Rolling restart requested from server {pid}.")
+
+
+@main.command(name="build")
+@click.option(
+    "--assets",
+    is_flag=True,
+    default=False,
+    help="Fingerprint and precompress public/ and <web-dir>/dist/ into .nestipy/assets.",
+)
+@click.option(
+    "--web-dir",
+    default="inertia",
+    help="Frontend directory whose dist/ is built (default: inertia).",
+)
+@click.option(
+    "--static-prefix",
+    default="/",
+    help="URL prefix for public/ (as for nestipy start).",
+)
+@click.option(
+    "--dist-prefix",
+    default="/",
+    help="URL prefix for the built frontend in <web-dir>/dist/.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Compression processes (default: one per CPU).",
+)
+def build(
+    assets: bool, web_dir: str, static_prefix: str, dist_prefix: str, jobs: int | None
+) -> None:
+    """Build production artifacts for nestipy start."""
+    from .assets import (
+        ASSETS_DIR,
+        BUNDLER_ASSETS_DIR,
+        AssetSource,
+        brotli_available,
+        build_assets,
+    )
+    from .static import DIST_DIR, PUBLIC_DIR
+
+    if not assets:
+        echo.error("[BUILD] Nothing to build; pass --assets.")
+        sys.exit(1)
+    root = Path.cwd()
+    sources = [
+        AssetSource(PUBLIC_DIR, root / PUBLIC_DIR, static_prefix),
+        AssetSource(
+            DIST_DIR, root / web_dir / DIST_DIR, dist_prefix, BUNDLER_ASSETS_DIR
+        ),
+    ]
+    if not any(source.directory.is_dir() for source in sources):
+        echo.error(f"[BUILD] Neither {PUBLIC_DIR}/ nor {web_dir}/{DIST_DIR}/ exists.")
+        sys.exit(1)
+    if not brotli_available():
         echo.warning(
-            "[WEB] --web only runs the frontend dev server in --dev. "
-            "In production, build it (npm run build) and serve the dist via Inertia."
+            "[BUILD] brotli is not installed; writing gzip variants only "
+            "(pip install 'nestipy-cli[assets]')."
+        )
+    started = time.perf_counter()
+    try:
+        manifest = build_assets(sources, root / ASSETS_DIR, jobs=jobs)
+    except FileExistsError as exc:
+        echo.error(f"[BUILD] {exc}")
+        sys.exit(1)
+    files = manifest["files"].values()
+    original = sum(entry["size"] for entry in files)
+    smallest = sum(min([entry["size"], *entry["encodings"].values()]) for entry in files)
+    echo.success(
+        f"[BUILD] {len(files)} assets in {time.perf_counter() - started:.1f}s: "
+        f"{original / 1024:,.1f} KiB, {smallest / 1024:,.1f} KiB precompressed "
+        f"-> {ASSETS_DIR}"
+    )
+
+
+@main.command(name="bench")
+@click.argument("app_path", default="main:app")
+@click.option(
+    "--path",
+    "paths",
+    multiple=True,
+    default=("/",),
+    help="Path to request; repeat to rotate over several routes.",
+)
+@click.option("-H", "--host", default="127.0.0.1", help="Local address to serve on.")
+@click.option(
+    "-P", "--port", type=int, default=0, help="Local port (default: a free one)."
+)
+@click.option("-w", "--workers", type=click.IntRange(min=1), default=1, help="Server workers.")
+@click.option(
+    "--loop",
+    type=click.Choice(["auto", "asyncio", "rloop", "uvloop"]),
+    default="auto",
+    help="Server event loop.",
+)
+@click.option(
+    "--http",
+    type=click.Choice(["auto", "1"]),
+    default="auto",
+    help="Server HTTP version (the load generator speaks HTTP/1.1).",
+)
+@click.option(
+    "--interface",
+    type=click.Choice(["asgi", "rsgi"]),
+    default="asgi",
+    help="Interface between granian and the app.",
+)
+@click.option(
+    "-c",
+    "--connections",
+    type=click.IntRange(min=1),
+    default=64,
+    help="Concurrent keep-alive connections.",
+)
+@click.option(
+    "-d",
+    "--duration",
+    type=click.FloatRange(min=1),
+    default=10.0,
+    help="Measured seconds.",
+)
+@click.option(
+    "--warmup",
+    type=click.FloatRange(min=0),
+    default=2.0,
+    help="Seconds of untimed load before measuring.",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=1),
+    default=None,
+    help="Fixed rate in requests/s (default: as fast as the connections allow).",
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Load generator processes (default: half the CPUs).",
+)
+@click.option(
+    "--save-baseline",
+    is_flag=True,
+    default=False,
+    help="Store this run as the baseline later runs are compared with.",
+)
+@click.option(
+    "--tolerance",
+    type=click.FloatRange(min=0),
+    default=10.0,
+    help="Percent a metric may worsen against the baseline before it is flagged.",
+)
+@click.option(
+    "--fail-on-regression",
+    is_flag=True,
+    default=False,
+    help="Exit with status 1 when a regression is flagged.",
+)
+@click.option(
+    "--inproc",
+    is_flag=True,
+    default=False,
+    help="Call the ASGI app directly for every route, without a server or socket.",
+)
+@click.option(
+    "--iterations",
+    type=click.IntRange(min=10),
+    default=1000,
+    help="With --inproc: timed calls per route.",
+)
+@click.option(
+    "--route",
+    "route_filters",
+    multiple=True,
+    help="With --inproc: only routes whose 'METHOD /path' or handler contains this.",
+)
+@click.option(
+    "--breakdown/--no-breakdown",
+    default=True,
+    help="With --inproc: profile where each route spends its time.",
+)
+@granian_tuning_options
+def bench(
+    app_path: str,
+    paths: tuple[str, ...],
+    host: str,
+    port: int,
+    workers: int,
+    loop: str,
+    http: str,
+    interface: str,
+    connections: int,
+    duration: float,
+    warmup: float,
+    rate: float | None,
+    processes: int | None,
+    save_baseline: bool,
+    tolerance: float,
+    fail_on_regression: bool,
+    inproc: bool,
+    iterations: int,
+    route_filters: tuple[str, ...],
+    breakdown: bool,
+    **tuning,
+) -> None:
+    """Load-test the app with the given server settings (or in process)."""
+    if inproc:
+        _bench_inproc(app_path, iterations, route_filters, breakdown)
+        return
+    from .app_kind import AppKindError, detect_app_kind
+    from .bench import (
+        BENCH_DIR,
+        SERVER_LOG_FILE,
+        LoadProfile,
+        baseline_mismatches,
+        bench_record,
+        bench_server_config,
+        find_regressions,
+        free_port,
+        load_baseline,
+        run_load,
+        save_record,
+        server_settings,
+        serving,
+    )
+    from .server import GranianTuning, rsgi_supported
+
+    module_path, app_name = app_path.split(":")
+    module_file_path = Path(module_path).resolve()
+    try:
+        app_kind = detect_app_kind(module_file_path.parent, module_file_path.stem, app_name)
+    except AppKindError as exc:
+        echo.error(f"[BENCH] {exc}")
+        sys.exit(1)
+    if app_kind == "microservice":
+        echo.error("[BENCH] Microservices have no HTTP routes to benchmark.")
+        sys.exit(1)
+    if interface == "rsgi" and not rsgi_supported():
+        echo.error("[BENCH] The installed granian has no RSGI support.")
+        sys.exit(1)
+    cfg = bench_server_config(
+        app_path,
+        host,
+        port or free_port(host),
+        workers,
+        loop,
+        http,
+        interface,
+        GranianTuning(**tuning),
+    )
+    profile = LoadProfile(
+        paths=tuple(paths),
+        connections=connections,
+        duration=duration,
+        warmup=warmup,
+        rate=rate,
+        processes=processes or max(1, (os.cpu_count() or 1) // 2),
+    )
+    mode = f"{rate:,.0f} req/s" if rate else f"{connections} connections"
+    echo.info(
+        f"[BENCH] {app_path} on {host}:{cfg.port}, {workers} worker(s), "
+        f"{mode} for {duration:g}s from {profile.processes} process(es)"
+    )
+    try:
+        with serving(cfg, BENCH_DIR / SERVER_LOG_FILE):
+            result = run_load(host, cfg.port, profile)
+    except RuntimeError as exc:
+        echo.error(f"[BENCH] {exc}")
+        sys.exit(1)
+
+    record = bench_record(app_path, server_settings(cfg), profile, result)
+    baseline = None if save_baseline else load_baseline()
+    _print_bench_result(record["result"], baseline["result"] if baseline else None)
+    saved = save_record(record, baseline=save_baseline)
+    if save_baseline:
+        echo.success(f"[BENCH] Saved {saved} as the baseline.")
+        return
+    echo.info(f"[BENCH] Saved {saved}")
+    if baseline is None:
+        return
+    differences = baseline_mismatches(record, baseline)
+    if differences:
+        for difference in differences:
+            echo.warning(f"[BENCH] Baseline differs: {difference}")
+        echo.warning("[BENCH] Not checking for regressions against a different setup.")
+        return
+    regressions = find_regressions(record["result"], baseline["result"], tolerance / 100)
+    for regression in regressions:
+        echo.error(f"[BENCH] Regression: {regression}")
+    if not regressions:
+        echo.success(f"[BENCH] Within {tolerance:g}% of the baseline.")
+    elif fail_on_regression:
+        sys.exit(1)
+
+
+def _print_bench_result(result: dict, baseline: dict | None) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="nestipy bench")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    if baseline is not None:
+        table.add_column("Baseline", justify="right")
+        table.add_column("Change", justify="right")
+    rows = [("requests", "requests", "{:,}"), ("errors", "errors", "{:,}")]
+    rows += [("req/s", "rps", "{:,.0f}"), ("mean", "mean_ms", "{:.2f} ms")]
+    rows += [
+        (name[:-3], name, "{:.2f} ms")
+        for name in ("p50_ms", "p90_ms", "p99_ms", "p999_ms", "max_ms")
+    ]
+    for label, key, template in rows:
+        cells = [label, template.format(result[key])]
+        if baseline is not None:
+            before = baseline.get(key)
+            cells.append(template.format(before) if before is not None else "-")
+            cells.append(f"{(result[key] / before - 1) * 100:+.1f}%" if before else "-")
+        table.add_row(*cells)
+    Console().print(table)
+
+
+def _bench_inproc(
+    app_path: str, iterations: int, route_filters: tuple[str, ...], breakdown: bool
+) -> None:
+    import asyncio
+    import json
+    from dataclasses import asdict
+
+    from rich.console import Console
+    from rich.table import Table
+
+    from .bench import BENCH_DIR
+    from .inproc import InprocError, bench_routes, import_app, route_targets
+
+    try:
+        app, project_root = import_app(app_path)
+        targets = route_targets(app)
+    except (ImportError, AttributeError, InprocError) as exc:
+        echo.error(f"[BENCH] Cannot load {app_path}: {exc}")
+        sys.exit(1)
+    if route_filters:
+        targets = [
+            target
+            for target in targets
+            if any(
+                text in f"{target.method} {target.route}" or text in target.handler
+                for text in route_filters
+            )
+        ]
+    if not targets:
+        echo.error("[BENCH] No route to benchmark.")
+        sys.exit(1)
+    echo.info(f"[BENCH] {len(targets)} routes in process, {iterations} calls each")
+    try:
+        timings = asyncio.run(
+            bench_routes(app, targets, iterations, breakdown, project_root)
         )
+    except InprocError as exc:
+        echo.error(f"[BENCH] {exc}")
+        sys.exit(1)
 
-    server = create_granian_instance(
-        GranianStartConfig(
-            app_path=app_path,
-            dev=dev,
-            host=host,
-            port=selected_port,
-            workers=workers,
-            ssl_keyfile=ssl_keyfile,
-            ssl_cert_file=ssl_cert_file,
-            loop=loop,
-            http=http,
-            is_microservice=is_ms,
-            log_config_path=log_config_path,
-            reload_any=reload_any,
-            reload_paths=reload_paths_list,
-            reload_ignore_dirs=reload_ignore_dirs_list,
-            reload_ignore_patterns=list(reload_ignore_patterns),
-            reload_ignore_paths=reload_ignore_paths_list,
-            reload_tick=reload_tick,
-            reload_ignore_worker_failure=reload_ignore_worker_failure,
+    table = Table(title="nestipy bench --inproc (microseconds per call)")
+    for column in ("Route", "Handler", "Status"):
+        table.add_column(column)
+    for column in ("mean", "p99", "alloc KiB", "blocks"):
+        table.add_column(column, justify="right")
+    if breakdown:
+        table.add_column("Own time")
+    for timing in sorted(timings, key=lambda item: -item.mean_us):
+        row = [
+            f"{timing.method} {timing.route}",
+            timing.handler,
+            str(timing.status) if timing.status < 400 else f"[yellow]{timing.status}",
+            f"{timing.mean_us:,.1f}",
+            f"{timing.p99_us:,.1f}",
+            f"{timing.alloc_bytes / 1024:,.1f}",
+            f"{timing.retained_blocks:+.1f}",
+        ]
+        if breakdown:
+            row.append(
+                " ".join(
+                    f"{name} {share:.0%}"
+                    for name, share in list(timing.breakdown.items())[:3]
+                    if share >= 0.01
+                )
+            )
+        table.add_row(*row)
+    Console().print(table)
+
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    report = BENCH_DIR / f"inproc-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    report.write_text(
+        json.dumps(
+            {"app": app_path, "routes": [asdict(timing) for timing in timings]},
+            indent=2,
         )
     )
-    with granian_log_prefixer():
-        server.serve()
+    echo.info(f"[BENCH] Saved {report}")
+
+
+@main.command(name="tune")
+@click.argument("app_path", default="main:app")
+@click.option(
+    "--path",
+    "paths",
+    multiple=True,
+    default=("/",),
+    help="Route to load; repeat for a representative mix.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    "workers_choices",
+    type=CommaSeparated(click.IntRange(min=1)),
+    default=None,
+    help="Worker counts to try (default: 1, half and all CPUs).",
+)
+@click.option(
+    "--loop",
+    "loops",
+    type=CommaSeparated(click.Choice(["asyncio", "rloop", "uvloop"])),
+    default=None,
+    help="Event loops to try (default: every installed one).",
+)
+@click.option(
+    "--http",
+    "http_modes",
+    type=CommaSeparated(click.Choice(["auto", "1"])),
+    default="auto",
+    help="HTTP modes to try.",
+)
+@click.option(
+    "--interface",
+    "interfaces",
+    type=CommaSeparated(click.Choice(["asgi", "rsgi"])),
+    default="asgi",
+    help="Interfaces to try.",
+)
+@click.option(
+    "--runtime-threads",
+    "runtime_threads_choices",
+    type=CommaSeparated(click.IntRange(min=1)),
+    default=None,
+    help="Rust runtime threads per worker to try (default: granian's).",
+)
+@click.option(
+    "--slo-p99",
+    type=click.FloatRange(min=0, min_open=True),
+    default=50.0,
+    help="Latency objective: p99 in milliseconds.",
+)
+@click.option(
+    "-c",
+    "--connections",
+    type=click.IntRange(min=1),
+    default=64,
+    help="Concurrent keep-alive connections per run.",
+)
+@click.option(
+    "-d",
+    "--duration",
+    type=click.FloatRange(min=1),
+    default=5.0,
+    help="Measured seconds per run.",
+)
+@click.option(
+    "--warmup",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    help="Seconds of untimed load before each run.",
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Load generator processes (default: half the CPUs).",
+)
+@click.option(
+    "--max-runs",
+    type=click.IntRange(min=1),
+    default=16,
+    help="Refuse sweeps with more combinations than this.",
+)
+@click.option(
+    "--write/--no-write",
+    default=True,
+    help="Write the winner to [tool.nestipy.start] in pyproject.toml.",
+)
+def tune(
+    app_path: str,
+    paths: tuple[str, ...],
+    workers_choices: list[int] | None,
+    loops: list[str] | None,
+    http_modes: list[str],
+    interfaces: list[str],
+    runtime_threads_choices: list[int] | None,
+    slo_p99: float,
+    connections: int,
+    duration: float,
+    warmup: float,
+    processes: int | None,
+    max_runs: int,
+    write: bool,
+) -> None:
+    """Find the fastest server settings that meet a latency objective."""
+    import json
+    import tomllib
+
+    from .app_kind import AppKindError, detect_app_kind
+    from .bench import (
+        BENCH_DIR,
+        SERVER_LOG_FILE,
+        LoadProfile,
+        bench_server_config,
+        free_port,
+        run_load,
+        serving,
+    )
+    from .pyproject import PYPROJECT_FILE, write_start_defaults
+    from .server import GranianTuning, rsgi_supported
+    from .tune import (
+        TuneRun,
+        default_workers,
+        describe,
+        installed_loops,
+        meets_slo,
+        rank_runs,
+        tune_matrix,
+    )
+
+    module_path, app_name = app_path.split(":")
+    module_file_path = Path(module_path).resolve()
+    try:
+        app_kind = detect_app_kind(module_file_path.parent, module_file_path.stem, app_name)
+    except AppKindError as exc:
+        echo.error(f"[TUNE] {exc}")
+        sys.exit(1)
+    if app_kind == "microservice":
+        echo.error("[TUNE] Microservices have no HTTP routes to tune against.")
+        sys.exit(1)
+    if "rsgi" in interfaces and not rsgi_supported():
+        echo.warning("[TUNE] The installed granian has no RSGI support; skipping rsgi.")
+        interfaces = [name for name in interfaces if name != "rsgi"] or ["asgi"]
+    matrix = tune_matrix(
+        workers_choices or default_workers(),
+        loops or installed_loops(),
+        http_modes,
+        interfaces,
+        runtime_threads_choices,
+    )
+    if len(matrix) > max_runs:
+        echo.error(
+            f"[TUNE] {len(matrix)} combinations exceed --max-runs {max_runs}; "
+            "narrow --workers/--loop/--http/--interface/--runtime-threads or raise it."
+        )
+        sys.exit(1)
+    profile = LoadProfile(
+        paths=tuple(paths),
+        connections=connections,
+        duration=duration,
+        warmup=warmup,
+        processes=processes or max(1, (os.cpu_count() or 1) // 2),
+    )
+    echo.info(
+        f"[TUNE] {len(matrix)} runs of about {duration + warmup + 3:.0f}s each, "
+        f"{connections} connections, p99 objective {slo_p99:g} ms"
+    )
+    runs = []
+    for index, settings in enumerate(matrix, 1):
+        tuning = GranianTuning(runtime_threads=settings.get("runtime_threads"))
+        cfg = bench_server_config(
+            app_path,
+            "127.0.0.1",
+            free_port("127.0.0.1"),
+            settings["workers"],
+            settings["loop"],
+            settings["http"],
+            settings["interface"],
+            tuning,
+        )
+        try:
+            with serving(cfg, BENCH_DIR / SERVER_LOG_FILE):
+                result = run_load(cfg.host, cfg.port, profile)
+        except RuntimeError as exc:
+            echo.warning(f"[TUNE] {index}/{len(matrix)} {describe(settings)}: {exc}")
+            continue
+        runs.append(TuneRun(settings, result))
+        echo.info(
+            f"[TUNE] {index}/{len(matrix)} {describe(settings)}: "
+            f"{result.rps:,.0f} req/s, p99 {result.p99_ms:.2f} ms, {result.errors} errors"
+        )
+    if not runs:
+        echo.error("[TUNE] No run completed.")
+        sys.exit(1)
+    ranked = rank_runs(runs, slo_p99)
+    _print_tune_runs(ranked, slo_p99)
+
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    report = BENCH_DIR / f"tune-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    report.write_text(
+        json.dumps(
+            {
+                "app": app_path,
+                "slo_p99_ms": slo_p99,
+                "load": dict(vars(profile), paths=list(profile.paths)),
+                "runs": [dict(vars(run.result), settings=run.settings) for run in ranked],
+            },
+            indent=2,
+        )
+    )
+    best = ranked[0]
+    if not meets_slo(best.result, slo_p99):
+        echo.warning(
+            f"[TUNE] No setting met p99 <= {slo_p99:g} ms without errors; "
+            f"nothing written. Results: {report}"
+        )
+        return
+    echo.success(f"[TUNE] Best: {describe(best.settings)} ({best.result.rps:,.0f} req/s)")
+    if not write:
+        echo.info(f"[TUNE] Results: {report}")
+        return
+    try:
+        write_start_defaults(
+            Path(PYPROJECT_FILE),
+            best.settings,
+            comment=f"Written by nestipy tune: p99 <= {slo_p99:g} ms on {', '.join(paths)}",
+        )
+    except tomllib.TOMLDecodeError as exc:
+        echo.error(f"[TUNE] Could not update {PYPROJECT_FILE}: {exc}")
+        sys.exit(1)
+    echo.success(f"[TUNE] Wrote [tool.nestipy.start] to {PYPROJECT_FILE}; results: {report}")
+
+
+def _print_tune_runs(runs: list, slo_p99: float) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    from .tune import describe, meets_slo
+
+    table = Table(title=f"nestipy tune (p99 objective {slo_p99:g} ms)")
+    table.add_column("#", justify="right")
+    table.add_column("Settings")
+    table.add_column("req/s", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Errors", justify="right")
+    for rank, run in enumerate(runs, 1):
+        ok = meets_slo(run.result, slo_p99)
+        table.add_row(
+            str(rank) if ok else "-",
+            describe(run.settings),
+            f"{run.result.rps:,.0f}",
+            f"{run.result.p50_ms:.2f} ms",
+            f"{run.result.p99_ms:.2f} ms" if ok else f"[red]{run.result.p99_ms:.2f} ms",
+            str(run.result.errors),
+        )
+    Console().print(table)
 
 
 @make.command(name="resource", aliases=["r", "res"])
 @click.argument("name")
 def resource(name: str) -> None:
     """Create new resource for project."""
+    import questionary
+
     name = str(name).lower()
     choice = questionary.select(
         "Select resource type:", choices=["api", "graphql"]
     ).ask()
     if choice == "graphql":
-        handler.generate_resource_graphql(name)
+        get_handler().generate_resource_graphql(name)
     else:
-        handler.generate_resource_api(name)
+        get_handler().generate_resource_api(name)
     echo.success(f"Resource created successfully inside src/{name}.")
 
 
@@ -452,7 +1930,7 @@ def resource(name: str) -> None:
 def module(name):
     """Create new module"""
     name = str(name).lower()
-    handler.generate_module(name, prefix="single")
+    get_handler().generate_module(name, prefix="single")
     echo.success(f"Module created successfully inside src/{name}.")
 
 
@@ -461,7 +1939,7 @@ def module(name):
 def controller(name):
     """Create new controller"""
     name = str(name).lower()
-    handler.generate_controller(name, prefix="single")
+    get_handler().generate_controller(name, prefix="single")
     echo.success(f"Controller created successfully inside src/{name}.")
 
 
@@ -470,7 +1948,7 @@ def controller(name):
 def command(name):
     """Create new command"""
     name = str(name).lower()
-    handler.generate_command(name)
+    get_handler().generate_command(name)
     echo.success(f"Command created successfully inside src/{name}.")
 
 
@@ -478,7 +1956,7 @@ def command(name):
 @click.argument("name")
 def resolver(name):
     """Create new graphql resolver"""
-    handler.generate_resolver(name, prefix="single")
+    get_handler().generate_resolver(name, prefix="single")
     echo.success(f"Resolver created successfully inside src/{name}.")
 
 
@@ -487,7 +1965,7 @@ def resolver(name):
 def service(name):
     """Create new service"""
     name = str(name).lower()
-    handler.generate_service(name, prefix="single")
+    get_handler().generate_service(name, prefix="single")
     echo.success(f"Service created successfully inside src/{name}.")
 
 
@@ -496,7 +1974,7 @@ def service(name):
 def graphql_input(name):
     """Create new graphql input"""
     name = str(name).lower()
-    handler.generate_service(name, prefix="single")
+    get_handler().generate_service(name, prefix="single")
     echo.success(f"Graphql Input created successfully inside src/{name}.")
 
 
@@ -508,6 +1986,8 @@ def graphql_input(name):
 @click.argument("args", nargs=-1, required=False, type=click.UNPROCESSED)
 def run(path: str, name: str, args: any):
     """Run nestipy commander app"""
+    import asyncio
+
     module_path, cmd_name = path.split(":")
     module_file_path = Path(module_path).resolve()
     module_name = module_file_path.stem
@@ -521,6 +2001,8 @@ def run(path: str, name: str, args: any):
 @click.option("-P", "--path", default="main:app", help="Nestipy Application path")
 def repl(path: str):
     """Run nestipy REPL"""
+    from .repl import REPL
+
     module_path, app_name = path.split(":")
     module_file_path = Path(module_path).resolve()
     module_name = module_file_path.stem
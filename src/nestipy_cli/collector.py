@@ -0,0 +1,220 @@
+"""Central log collector for multi-worker ``nestipy start``.
+
+Instead of every granian worker opening ``logs/default.log`` and
+``logs/access.log``, workers log through
+:class:`nestipy_cli.config._NestipyCollectorHandler`, which ships raw record
+batches over a unix socket. A single collector process (``python -m
+nestipy_cli.collector``) formats them, restores timestamp order across
+workers and writes each file from one place.
+"""
+
+import contextlib
+import copy
+import heapq
+import itertools
+import json
+import logging
+import logging.config
+import os
+import pickle
+import signal
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from .config import COLLECTOR_FRAME
+
+COLLECTOR_DESTINATIONS = ("default", "access")
+COLLECTOR_LOGGER_PREFIX = "nestipy.collector."
+
+
+def split_collector_config(
+    config: dict[str, Any], path: str
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Split a production logging config between workers and the collector.
+
+    Returns ``(worker_config, collector_config)``: in the worker config the
+    file handlers are replaced by collector handlers pointing at ``path``; the
+    collector config keeps the original file handlers, each fed by a
+    ``nestipy.collector.<destination>`` logger.
+    """
+    worker_config = copy.deepcopy(config)
+    collector_config: dict[str, Any] = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": copy.deepcopy(config["formatters"]),
+        "handlers": {},
+        "loggers": {},
+    }
+    for name in COLLECTOR_DESTINATIONS:
+        handler = config["handlers"][name]
+        collector_config["handlers"][name] = copy.deepcopy(handler)
+        collector_config["loggers"][COLLECTOR_LOGGER_PREFIX + name] = {
+            "handlers": [name],
+            "level": "DEBUG",
+            "propagate": False,
+        }
+        worker_handler: dict[str, Any] = {
+            "()": "nestipy_cli.config._NestipyCollectorHandler",
+            "path": path,
+            "destination": name,
+        }
+        for key in ("queue_size", "overflow", "flush_interval", "flush_size"):
+            if key in handler:
+                worker_handler[key] = handler[key]
+        worker_config["handlers"][name] = worker_handler
+    return worker_config, collector_config
+
+
+class LogCollector:
+    """Run the collector process for the lifetime of ``nestipy start``."""
+
+    def __init__(self, config: dict[str, Any], reorder_window: float = 1.5) -> None:
+        self.directory = tempfile.mkdtemp(prefix="nestipy-logs-")
+        self.path = os.path.join(self.directory, "collector.sock")
+        self.worker_config, self.collector_config = split_collector_config(
+            config, self.path
+        )
+        self.reorder_window = reorder_window
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self, timeout: float = 10.0) -> None:
+        config_path = os.path.join(self.directory, "collector.json")
+        with open(config_path, "w") as handle:
+            json.dump(self.collector_config, handle)
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "nestipy_cli.collector",
+                self.path,
+                config_path,
+                str(self.reorder_window),
+            ],
+            cwd=os.getcwd(),
+        )
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(self.path):
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("Log collector failed to start")
+            time.sleep(0.02)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the collector once this process has handed over its records.
+
+        ``logging.shutdown()`` flushes the calling process's collector
+        handlers first, so the master's last lines are not lost.
+        """
+        logging.shutdown()
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+        for name in ("collector.sock", "collector.json"):
+            with contextlib.suppress(OSError):
+                os.unlink(os.path.join(self.directory, name))
+        with contextlib.suppress(OSError):
+            os.rmdir(self.directory)
+
+
+class _ReorderBuffer:
+    """Hold records briefly and release them in ``created`` order.
+
+    Workers flush on their own schedule, so batches arrive out of order; a
+    record is only written once it is older than ``window`` seconds.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._heap: list[tuple[float, int, str, dict[str, Any]]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def push(self, destination: str, records: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for record in records:
+                heapq.heappush(
+                    self._heap,
+                    (record.get("created", 0.0), next(self._counter), destination, record),
+                )
+
+    def release(self, everything: bool = False) -> None:
+        horizon = time.time() - self.window
+        ready = []
+        with self._lock:
+            while self._heap and (everything or self._heap[0][0] <= horizon):
+                ready.append(heapq.heappop(self._heap))
+        for _, _, destination, fields in ready:
+            logging.getLogger(COLLECTOR_LOGGER_PREFIX + destination).handle(
+                logging.makeLogRecord(fields)
+            )
+
+
+def _make_request_handler(buffer: _ReorderBuffer) -> type:
+    class _FrameHandler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            stream = self.request.makefile("rb")
+            while True:
+                header = stream.read(COLLECTOR_FRAME.size)
+                if len(header) < COLLECTOR_FRAME.size:
+                    return
+                (size,) = COLLECTOR_FRAME.unpack(header)
+                payload = stream.read(size)
+                if len(payload) < size:
+                    return
+                destination, records = pickle.loads(payload)
+                if destination in COLLECTOR_DESTINATIONS:
+                    buffer.push(destination, records)
+
+    return _FrameHandler
+
+
+class _CollectorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(path: str, config: dict[str, Any], reorder_window: float) -> None:
+    logging.config.dictConfig(config)
+    buffer = _ReorderBuffer(reorder_window)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    # Ctrl+C reaches the whole process group; keep collecting until the
+    # master has stopped its workers and terminates us.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Bind under a temporary name so the socket path only appears once the
+    # collector is ready to accept workers.
+    staging = f"{path}.{os.getpid()}"
+    server = _CollectorServer(staging, _make_request_handler(buffer))
+    os.chmod(staging, 0o600)
+    os.rename(staging, path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        while not stop.wait(0.1):
+            buffer.release()
+    finally:
+        server.shutdown()
+        server.server_close()
+        # Give in-flight connections a moment to hand over their last batch.
+        time.sleep(0.1)
+        buffer.release(everything=True)
+        logging.shutdown()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    path, config_path, reorder_window = (argv or sys.argv[1:])[:3]
+    config = json.loads(Path(config_path).read_text())
+    serve(path, config, float(reorder_window))
+
+
+if __name__ == "__main__":
+    main()
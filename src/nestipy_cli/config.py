@@ -1,5 +1,20 @@
+import abc
+import gzip
+import json
 import logging
+import logging.handlers
+import multiprocessing.util
 import os
+import pickle
+import queue
+import random
+import re
+import shutil
+import socket
+import struct
+import threading
+import time
+from datetime import datetime, timedelta
 from typing import Any, Iterable, Optional
 
 from rich.console import Console
@@ -7,9 +22,40 @@ from rich.logging import RichHandler
 from rich.style import Style
 
 DEFAULT_LOG_FORMAT = "[NESTIPY] %(levelname)s %(message)s"
+ACCESS_LOG_FORMAT = (
+    '[%(time)s] %(addr)s - "%(method)s %(path)s %(protocol)s" %(status)d - %(dt_ms).3f ms'
+)
+# Over a Unix socket granian has no peer address to log.
+UDS_ACCESS_LOG_FORMAT = ACCESS_LOG_FORMAT.replace("%(addr)s", "unix")
+# Length prefix of each pickled batch sent to the log collector.
+COLLECTOR_FRAME = struct.Struct("!I")
 logger = logging.getLogger("nestipy")
 console = Console(color_system="auto", style=Style(bold=True))
 
+_QUOTED_STATUS_RE = re.compile(r"\"[^\"]*\"\s+(\d{3})\b")
+_STATUS_CANDIDATE_RE = re.compile(r"(?<!\d)(\d{3})(?!\d)")
+# ANSI color code per status class, shared by the console formatter and the
+# granian output rewriter.
+STATUS_COLORS = {
+    "2xx": "32",
+    "3xx": "36",
+    "4xx": "33",
+    "5xx": "31",
+}
+
+_ANSI_GREEN = "\x1b[32m"
+_ANSI_RESET = "\x1b[0m"
+# Indexed by ``status // 100``; anything outside 2xx-5xx is white.
+_STATUS_ANSI: tuple[str, ...] = (
+    "\x1b[37m",
+    "\x1b[37m",
+    *(f"\x1b[{STATUS_COLORS[f'{klass}xx']}m" for klass in range(2, 6)),
+)
+
+
+def _status_ansi(status: int) -> str:
+    return _STATUS_ANSI[status // 100] if 0 <= status < 600 else _STATUS_ANSI[0]
+
 
 class _NestipyRichFormatter(logging.Formatter):
     _LEVEL_STYLES = {
@@ -40,34 +86,28 @@ class _NestipyRichFormatter(logging.Formatter):
 
     @classmethod
     def _colorize_status(cls, message: str, status: int) -> str:
-        try:
-            import re
-
-            style = cls._style_status(status)
-            pattern = re.compile(rf"(?<!\d){status}(?!\d)")
-            return pattern.sub(f"[{style}]{status}[/{style}]", message, count=1)
-        except Exception:
-            return message
+        style = cls._style_status(status)
+        text = str(status)
+        for match in _STATUS_CANDIDATE_RE.finditer(message):
+            if match.group(1) == text:
+                start, end = match.span(1)
+                return f"{message[:start]}[{style}]{text}[/{style}]{message[end:]}"
+        return message
 
     @staticmethod
     def _extract_status_from_message(message: str) -> Optional[int]:
-        try:
-            import re
-
-            primary = re.search(r"\"[^\"]*\"\s+(\d{3})\b", message)
-            if primary:
-                value = int(primary.group(1))
-                if 100 <= value <= 599:
-                    return value
-            candidates = [
-                int(match.group(1))
-                for match in re.finditer(r"(?<!\d)(\d{3})(?!\d)", message)
-                if 100 <= int(match.group(1)) <= 599
-            ]
-            if candidates:
-                return candidates[-1]
-        except Exception:
-            return None
+        primary = _QUOTED_STATUS_RE.search(message)
+        if primary:
+            value = int(primary.group(1))
+            if 100 <= value <= 599:
+                return value
+        candidates = [
+            int(match.group(1))
+            for match in _STATUS_CANDIDATE_RE.finditer(message)
+            if 100 <= int(match.group(1)) <= 599
+        ]
+        if candidates:
+            return candidates[-1]
         return None
 
     def format(self, record: logging.LogRecord) -> str:
@@ -89,6 +129,554 @@ class _NestipyRichFormatter(logging.Formatter):
             record.levelname = original_levelname
 
 
+class _NestipyFastFormatter(logging.Formatter):
+    """Production console formatter that bypasses Rich.
+
+    The format string is applied directly to the record, the status comes from
+    granian's access atoms (or a ``status``/``status_code`` attribute) instead
+    of scanning the message, and colors are plain ANSI from lookup tables.
+    The output matches :class:`_NestipyRichFormatter` line for line.
+    """
+
+    _STATUS_FIELD = "%(status)d"
+
+    def __init__(
+        self,
+        fmt: str = DEFAULT_LOG_FORMAT,
+        datefmt: Optional[str] = None,
+        use_color: bool = True,
+    ) -> None:
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        self.use_color = use_color
+        self._template = self._style._fmt
+        self._uses_time = self.usesTime()
+        # Access formats split around ``%(status)d``, keyed by record.msg.
+        self._splits: dict[str, Optional[tuple[str, str]]] = {}
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = self._render_message(record)
+        if self._uses_time:
+            record.asctime = self.formatTime(record, self.datefmt)
+        line = self._template % record.__dict__
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        if record.stack_info:
+            line = f"{line}\n{self.formatStack(record.stack_info)}"
+        if self.use_color:
+            return f"{_ANSI_GREEN}{line}{_ANSI_RESET}"
+        return line
+
+    def _render_message(self, record: logging.LogRecord) -> str:
+        if not self.use_color:
+            return record.getMessage()
+        atoms = record.args
+        if isinstance(atoms, dict):
+            status = atoms.get("status")
+            split = self._split(record.msg)
+            if isinstance(status, int) and split is not None:
+                head, tail = split
+                return (
+                    f"{head % atoms}{_status_ansi(status)}{status}"
+                    f"{_ANSI_GREEN}{tail % atoms}"
+                )
+            return record.getMessage()
+        status = getattr(record, "status", None)
+        if status is None:
+            status = getattr(record, "status_code", None)
+        message = record.getMessage()
+        if isinstance(status, int):
+            return self._colorize_status(message, status)
+        return message
+
+    def _split(self, msg: Any) -> Optional[tuple[str, str]]:
+        try:
+            return self._splits[msg]
+        except KeyError:
+            pass
+        except TypeError:
+            return None
+        split = None
+        if isinstance(msg, str) and msg.count(self._STATUS_FIELD) == 1:
+            head, tail = msg.split(self._STATUS_FIELD)
+            split = (head, tail)
+        self._splits[msg] = split
+        return split
+
+    @staticmethod
+    def _colorize_status(message: str, status: int) -> str:
+        text = str(status)
+        start = message.find(text)
+        while start != -1:
+            end = start + len(text)
+            if not (start and message[start - 1].isdigit()) and not (
+                end < len(message) and message[end].isdigit()
+            ):
+                return (
+                    f"{message[:start]}{_status_ansi(status)}{text}"
+                    f"{_ANSI_GREEN}{message[end:]}"
+                )
+            start = message.find(text, end)
+        return message
+
+
+class _NestipyJsonAccessFormatter(logging.Formatter):
+    """Render granian access records as one JSON object per line.
+
+    Granian logs each request as ``access_logger.info(fmt, atoms)``; the atoms
+    dict is serialized directly so the text format is never interpolated.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        atoms = record.args if isinstance(record.args, dict) else {}
+        if not atoms:
+            return json.dumps(
+                {"ts": self._isotime(record), "message": record.getMessage()},
+                separators=(",", ":"),
+            )
+        query = atoms.get("query_string")
+        path = atoms.get("path")
+        return json.dumps(
+            {
+                "ts": self._isotime(record),
+                "client": atoms.get("addr") or None,
+                "method": atoms.get("method"),
+                "path": f"{path}?{query}" if query else path,
+                "protocol": atoms.get("protocol"),
+                "status": atoms.get("status"),
+                "duration_ms": round(atoms.get("dt_ms", 0.0), 3),
+                "pid": record.process,
+            },
+            separators=(",", ":"),
+        )
+
+    @staticmethod
+    def _isotime(record: logging.LogRecord) -> str:
+        return (
+            datetime.fromtimestamp(record.created)
+            .astimezone()
+            .isoformat(timespec="milliseconds")
+        )
+
+
+class _NestipyAccessSampler(logging.Filter):
+    """Thin out granian access records before any handler formats them.
+
+    Successful requests are kept with probability ``sample`` and at most
+    ``rate_limit`` per second (per worker, 0 = no cap). With
+    ``errors_always`` 4xx/5xx responses are always kept, and so is any
+    request slower than ``slow_ms`` when set.
+    """
+
+    def __init__(
+        self,
+        sample: float = 1.0,
+        rate_limit: int = 0,
+        errors_always: bool = False,
+        slow_ms: float = 0.0,
+    ) -> None:
+        super().__init__()
+        self.sample = min(max(sample, 0.0), 1.0)
+        self.rate_limit = max(rate_limit, 0)
+        self.errors_always = errors_always
+        self.slow_ms = slow_ms
+        self._random = random.random
+        self._window = 0
+        self._kept = 0
+        self._pid = os.getpid()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if os.getpid() != self._pid:
+            # Granian configures logging in the master as well, and a forked
+            # worker's dictConfig adds its own filter next to the inherited
+            # one instead of replacing it: leave the work to that one.
+            return True
+        atoms = record.args
+        if not isinstance(atoms, dict):
+            return True
+        if self.errors_always and atoms.get("status", 0) >= 400:
+            return True
+        if self.slow_ms and atoms.get("dt_ms", 0.0) >= self.slow_ms:
+            return True
+        if self.sample < 1.0 and self._random() >= self.sample:
+            return False
+        if self.rate_limit:
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window = window
+                self._kept = 0
+            if self._kept >= self.rate_limit:
+                return False
+            self._kept += 1
+        return True
+
+
+class _NestipyRequestCounter(logging.Filter):
+    """Count a worker's requests and ask the master to recycle it.
+
+    Every granian access record is one request. Once the worker has served
+    ``max_requests`` plus a random share of ``jitter``, drawn per worker so
+    that workers do not all hit the limit together, one line naming its pid
+    goes to the ``_granian`` logger. The master watches the worker output
+    for it. Records are never dropped here.
+    """
+
+    def __init__(self, max_requests: int, jitter: int = 0) -> None:
+        super().__init__()
+        # SystemRandom: workers forked from one master share random's state.
+        self.limit = max_requests + random.SystemRandom().randint(0, max(jitter, 0))
+        self.count = 0
+        self._pid = os.getpid()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if os.getpid() != self._pid:
+            return True  # inherited copy, see _NestipyAccessSampler.filter
+        self.count += 1
+        if self.count == self.limit:
+            logging.getLogger("_granian").info(
+                "Worker %d served %d requests, requesting recycle",
+                os.getpid(),
+                self.count,
+            )
+        return True
+
+
+class _BatchWriter(threading.Thread, abc.ABC):
+    """Drain a record queue in batches on a background thread.
+
+    A batch is handed to :meth:`write_batch` once ``flush_size`` items are
+    pending or ``flush_interval`` seconds have passed, whichever comes first.
+    """
+
+    STOP = object()
+
+    def __init__(
+        self, records: "queue.Queue[Any]", flush_interval: float, flush_size: int
+    ) -> None:
+        super().__init__(name="nestipy-log-writer", daemon=True)
+        self.records = records
+        self.flush_interval = flush_interval
+        self.flush_size = max(1, flush_size)
+
+    def run(self) -> None:
+        pending: list[Any] = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+        while not stopping:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self.records.get(timeout=max(timeout, 0.0))
+                while True:
+                    if item is self.STOP:
+                        stopping = True
+                        break
+                    pending.append(item)
+                    if len(pending) >= self.flush_size:
+                        break
+                    item = self.records.get_nowait()
+            except queue.Empty:
+                pass
+            if pending and (
+                stopping
+                or len(pending) >= self.flush_size
+                or time.monotonic() >= deadline
+            ):
+                try:
+                    self.write_batch(pending)
+                except Exception:  # noqa: BLE001
+                    pass
+                pending = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+        self.close_sink()
+
+    @abc.abstractmethod
+    def write_batch(self, items: list[Any]) -> None:
+        """Write one batch; exceptions are swallowed so logging never fails."""
+
+    def close_sink(self) -> None:
+        pass
+
+
+ROTATE_INTERVALS = {"S": 1, "M": 60, "H": 3600, "D": 86400}
+
+
+def _next_rollover(when: str, now: float) -> float:
+    if when == "midnight":
+        tomorrow = datetime.fromtimestamp(now) + timedelta(days=1)
+        return tomorrow.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    return now + ROTATE_INTERVALS[when]
+
+
+def _gzip_segment(source: str, target: str) -> None:
+    try:
+        with open(source, "rb") as raw, gzip.open(target, "wb") as packed:
+            shutil.copyfileobj(raw, packed, 1024 * 1024)
+            inode = os.fstat(raw.fileno()).st_ino
+        # Another writer may have rotated a newer segment to the same name.
+        if os.stat(source).st_ino == inode:
+            os.unlink(source)
+    except OSError:
+        pass
+
+
+class _BatchFileWriter(_BatchWriter):
+    """Append formatted records to a file, one write and flush per batch.
+
+    With ``max_bytes`` and/or ``rotate_when`` the file is rotated after the
+    batch that crosses the threshold: it becomes ``<file>.1.gz`` (older
+    segments shift up to ``backups``), and the gzip runs on its own thread so
+    the writer goes straight back to draining the queue. When another writer
+    has already rotated the file, it is reopened instead of rotated again.
+    """
+
+    def __init__(
+        self,
+        records: "queue.Queue[Any]",
+        filename: str,
+        flush_interval: float,
+        flush_size: int,
+        max_bytes: int = 0,
+        rotate_when: Optional[str] = None,
+        backups: int = 7,
+    ) -> None:
+        super().__init__(records, flush_interval, flush_size)
+        if rotate_when is not None and rotate_when not in (*ROTATE_INTERVALS, "midnight"):
+            raise ValueError(f"Unknown log rotation interval: {rotate_when}")
+        self.filename = os.path.abspath(filename)
+        self.max_bytes = max_bytes
+        self.rotate_when = rotate_when
+        self.backups = max(0, backups)
+        self.rollover_at = (
+            _next_rollover(rotate_when, time.time()) if rotate_when else None
+        )
+        self._compressor: Optional[threading.Thread] = None
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        self.stream = open(self.filename, "a", encoding="utf-8")
+
+    def write_batch(self, items: list[Any]) -> None:
+        lines = [item.msg for item in items]
+        lines.append("")
+        self._reopen_if_moved()
+        self.stream.write("\n".join(lines))
+        self.stream.flush()
+        if self._should_rollover():
+            self.rollover()
+
+    def _reopen_if_moved(self) -> bool:
+        try:
+            moved = os.stat(self.filename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            self.stream.close()
+            self.stream = open(self.filename, "a", encoding="utf-8")
+            if self.rollover_at is not None and time.time() >= self.rollover_at:
+                self.rollover_at = _next_rollover(self.rotate_when, time.time())
+        return moved
+
+    def _should_rollover(self) -> bool:
+        if self.max_bytes and self.stream.tell() >= self.max_bytes:
+            return True
+        return self.rollover_at is not None and time.time() >= self.rollover_at
+
+    def rollover(self) -> None:
+        if self._reopen_if_moved():
+            return
+        self.stream.close()
+        if self._compressor is not None:
+            self._compressor.join()
+            self._compressor = None
+        if self.rollover_at is not None:
+            self.rollover_at = _next_rollover(self.rotate_when, time.time())
+        if self.backups:
+            for index in range(self.backups - 1, 0, -1):
+                source = f"{self.filename}.{index}.gz"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.filename}.{index + 1}.gz")
+            segment = f"{self.filename}.1"
+            os.replace(self.filename, segment)
+            self._compressor = threading.Thread(
+                target=_gzip_segment,
+                args=(segment, f"{segment}.gz"),
+                name="nestipy-log-compress",
+                daemon=True,
+            )
+            self._compressor.start()
+        else:
+            os.unlink(self.filename)
+        self.stream = open(self.filename, "a", encoding="utf-8")
+
+    def close_sink(self) -> None:
+        self.stream.close()
+        if self._compressor is not None:
+            self._compressor.join()
+
+
+class _CollectorSender(_BatchWriter):
+    """Ship batches of wire records to the log collector over a unix socket.
+
+    A batch that cannot be delivered is dropped (and counted) rather than
+    retried, so a missing collector never backs up the worker.
+    """
+
+    def __init__(
+        self,
+        records: "queue.Queue[Any]",
+        path: str,
+        destination: str,
+        flush_interval: float,
+        flush_size: int,
+    ) -> None:
+        super().__init__(records, flush_interval, flush_size)
+        self.path = path
+        self.destination = destination
+        self.sock: Optional[socket.socket] = None
+        self.undelivered = 0
+
+    def write_batch(self, items: list[Any]) -> None:
+        payload = pickle.dumps(
+            (self.destination, items), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        try:
+            if self.sock is None:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(self.path)
+            self.sock.sendall(COLLECTOR_FRAME.pack(len(payload)) + payload)
+        except OSError:
+            self.undelivered += len(items)
+            self.close_sink()
+
+    def close_sink(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class _NestipyQueueHandler(logging.handlers.QueueHandler):
+    """File handler that never does disk I/O on the logging thread.
+
+    Records are formatted and put on a bounded queue; a background
+    :class:`_BatchFileWriter` appends them to ``filename`` and rotates it.
+    When the queue is full, ``overflow="drop-oldest"`` discards the oldest
+    pending record and ``overflow="block"`` waits for room.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        queue_size: int = 10000,
+        overflow: str = "drop-oldest",
+        flush_interval: float = 1.0,
+        flush_size: int = 256,
+        max_bytes: int = 0,
+        rotate_when: Optional[str] = None,
+        backups: int = 7,
+    ) -> None:
+        self._setup_queue(queue_size, overflow)
+        self._start_writer(
+            _BatchFileWriter(
+                self.queue,
+                filename,
+                flush_interval,
+                flush_size,
+                max_bytes=max_bytes,
+                rotate_when=rotate_when,
+                backups=backups,
+            )
+        )
+
+    def _setup_queue(self, queue_size: int, overflow: str) -> None:
+        if overflow not in ("drop-oldest", "block"):
+            raise ValueError(f"Unknown log queue overflow policy: {overflow}")
+        super().__init__(queue.Queue(maxsize=max(1, queue_size)))
+        self.overflow = overflow
+        self.dropped = 0
+        self._pid = os.getpid()
+
+    def _start_writer(self, writer: _BatchWriter) -> None:
+        self._writer = writer
+        self._writer.start()
+        # Granian workers leave through os._exit(), which skips atexit and
+        # logging.shutdown(); multiprocessing finalizers still run there.
+        multiprocessing.util.Finalize(self, self.close, exitpriority=10)
+
+    def enqueue(self, record: Any) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def close(self) -> None:
+        # After a fork the writer thread only exists in the parent.
+        if os.getpid() == self._pid and self._writer.is_alive():
+            self.enqueue(_BatchWriter.STOP)
+            self._writer.join(timeout=5)
+        super().close()
+
+
+class _NestipyCollectorHandler(_NestipyQueueHandler):
+    """Queue handler that forwards raw records to the central log collector.
+
+    Nothing is formatted in the worker: :meth:`prepare` only reduces the
+    record to a small picklable dict, and the collector process formats and
+    writes it to the file configured for ``destination``.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def __init__(
+        self,
+        path: str,
+        destination: str,
+        queue_size: int = 10000,
+        overflow: str = "drop-oldest",
+        flush_interval: float = 1.0,
+        flush_size: int = 256,
+    ) -> None:
+        self._setup_queue(queue_size, overflow)
+        self._start_writer(
+            _CollectorSender(
+                self.queue, path, destination, flush_interval, flush_size
+            )
+        )
+
+    def prepare(self, record: logging.LogRecord) -> dict[str, Any]:
+        args = record.args
+        # Keep mapping args (granian access atoms) for the collector's
+        # formatter, as long as they can cross the socket.
+        if isinstance(args, dict) and all(
+            isinstance(value, (str, int, float, type(None))) for value in args.values()
+        ):
+            msg = record.msg
+        else:
+            msg, args = record.getMessage(), None
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = self._exc_formatter.formatException(record.exc_info)
+        return {
+            "name": record.name,
+            "msg": msg,
+            "args": args,
+            "levelname": record.levelname,
+            "levelno": record.levelno,
+            "created": record.created,
+            "msecs": record.msecs,
+            "process": record.process,
+            "exc_text": exc_text,
+        }
+
+
 class _NestipyRichHandler(RichHandler):
     def __init__(self, *args, **kwargs):
         from rich.highlighter import NullHighlighter
@@ -191,6 +779,7 @@ def build_granian_log_dictconfig(
             "class": "logging.StreamHandler",
             "level": level,
             "formatter": "nestipy",
+            "stream": "ext://sys.stdout",
         }
     return {
         "version": 1,
@@ -0,0 +1,324 @@
+"""In-process route benchmarks for ``nestipy bench --inproc``.
+
+The application is imported and called as an ASGI callable. There is no
+socket, no granian and no event loop hop between client and server, so the
+time measured is the framework and application code alone. Routes come from
+the app's router spec. Each one is called with a synthetic request: path and
+required query/header parameters get a sample value of their declared type,
+and routes that take a body get ``{}`` as JSON.
+
+Three passes per route:
+
+* timing: ``--iterations`` calls after a short warm-up; mean, p50 and p99 in
+  microseconds;
+* memory: CPython has no per-call allocation counter, so the peak memory
+  traced by :mod:`tracemalloc` during a call is reported as the bytes
+  allocated by it. The net number of memory blocks left allocated after a
+  call (collected) flags caches and leaks;
+* breakdown: a :mod:`cProfile` pass attributes each function's own time to
+  a component (guards, interceptors, pipes, middleware, DI, serialization,
+  routing/adapter, app code), which shows where a slow route spends it.
+"""
+
+import asyncio
+import cProfile
+import gc
+import importlib
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+import uuid
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from .bench import percentile
+
+_PATH_PARAM_RE = re.compile(r"{(\w+)(?::(\w+))?}")
+_SAMPLES: dict[Any, str] = {
+    int: "1",
+    float: "1.0",
+    bool: "true",
+    uuid.UUID: "00000000-0000-0000-0000-000000000001",
+    "int": "1",
+    "float": "1.0",
+    "uuid": "00000000-0000-0000-0000-000000000001",
+}
+# Own time of functions whose file or name contains one of these fragments is
+# attributed to the component; the first match wins.
+COMPONENTS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("guards", ("/nestipy/core/guards/",)),
+    ("interceptors", ("/nestipy/core/interceptor/",)),
+    ("pipes", ("/nestipy/core/pipes/",)),
+    ("middleware", ("/nestipy/core/middleware/", "/nestipy/ioc/middleware")),
+    ("DI", ("/nestipy/ioc/",)),
+    ("serialization", ("/json/", "json.", "orjson", "ujson", "msgspec", "pydantic")),
+    ("routing/adapter", ("/nestipy/", "/starlette/", "/fastapi/", "/blacksheep/")),
+)
+
+
+class InprocError(RuntimeError):
+    """Raised when the app cannot be benchmarked in process."""
+
+
+@dataclass(frozen=True)
+class RouteTarget:
+    method: str
+    route: str
+    handler: str
+    path: str
+    query_string: bytes = b""
+    headers: tuple[tuple[bytes, bytes], ...] = ()
+    body: bytes = b""
+
+
+@dataclass(frozen=True)
+class RouteTiming:
+    method: str
+    route: str
+    handler: str
+    status: int
+    calls: int
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    # Peak bytes traced during one call (averaged over the memory pass).
+    alloc_bytes: float
+    # Memory blocks still allocated per call after a collection.
+    retained_blocks: float
+    # Share of profiled own time per component, largest first.
+    breakdown: dict[str, float] = field(default_factory=dict)
+
+
+def import_app(app_path: str) -> tuple[Any, Path]:
+    """Import ``module:attribute`` the way ``nestipy start`` does."""
+    module_path, _, app_name = app_path.partition(":")
+    module_file = Path(module_path).resolve()
+    sys.path.insert(0, str(module_file.parent))
+    module = importlib.import_module(module_file.stem)
+    return getattr(module, app_name or "app"), module_file.parent
+
+
+def _sample(kind: Any) -> str:
+    return _SAMPLES.get(kind, "sample")
+
+
+def route_targets(app: Any) -> list[RouteTarget]:
+    """One synthetic request per method of every route in the router spec."""
+    get_spec = getattr(app, "get_router_spec", None)
+    if get_spec is None:
+        raise InprocError("the app has no router spec (a Nestipy application is required)")
+    targets = []
+    for route in get_spec().routes:
+        params = {param.name: param for param in route.params}
+        path = _PATH_PARAM_RE.sub(
+            lambda match: _sample(
+                params[match[1]].type if match[1] in params else match[2]
+            ),
+            route.path,
+        )
+        query = "&".join(
+            f"{param.name}={_sample(param.type)}"
+            for param in route.params
+            if param.source == "query" and param.required
+        )
+        headers = [(b"host", b"bench.local"), (b"user-agent", b"nestipy-bench")]
+        headers += [
+            (param.name.lower().encode(), _sample(param.type).encode())
+            for param in route.params
+            if param.source == "header" and param.required
+        ]
+        body = b""
+        if any(param.source == "body" for param in route.params):
+            body = b"{}"
+            headers += [
+                (b"content-type", b"application/json"),
+                (b"content-length", b"2"),
+            ]
+        for method in route.methods:
+            targets.append(
+                RouteTarget(
+                    method=method.upper(),
+                    route=route.path,
+                    handler=f"{route.controller}.{route.handler}",
+                    path=path,
+                    query_string=query.encode(),
+                    headers=tuple(headers),
+                    body=body,
+                )
+            )
+    return targets
+
+
+class _Client:
+    """Calls the ASGI app directly with synthetic scopes."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self.state: dict[str, Any] = {}
+        self._lifespan: Optional[asyncio.Task] = None
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._replies: asyncio.Queue = asyncio.Queue()
+
+    async def startup(self) -> None:
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": self.state}
+        self._lifespan = asyncio.create_task(
+            self.app(scope, self._messages.get, self._replies.put)
+        )
+        await self._messages.put({"type": "lifespan.startup"})
+        reply = asyncio.create_task(self._replies.get())
+        await asyncio.wait({reply, self._lifespan}, return_when=asyncio.FIRST_COMPLETED)
+        if not reply.done():
+            # The app does not speak the lifespan protocol.
+            reply.cancel()
+            if not self._lifespan.cancelled():
+                self._lifespan.exception()
+            self._lifespan = None
+        elif reply.result()["type"] == "lifespan.startup.failed":
+            raise InprocError(reply.result().get("message") or "lifespan startup failed")
+
+    async def shutdown(self) -> None:
+        if self._lifespan is None:
+            return
+        await self._messages.put({"type": "lifespan.shutdown"})
+        try:
+            await asyncio.wait_for(self._lifespan, timeout=10)
+        except Exception:
+            pass  # a failing shutdown does not invalidate the numbers
+
+    async def call(self, target: RouteTarget) -> int:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": target.method,
+            "scheme": "http",
+            "path": target.path,
+            "raw_path": target.path.encode(),
+            "query_string": target.query_string,
+            "root_path": "",
+            "headers": list(target.headers),
+            "client": ("127.0.0.1", 50000),
+            "server": ("127.0.0.1", 8000),
+            "state": dict(self.state),
+        }
+        status = 0
+        delivered = False
+
+        async def receive() -> dict:
+            nonlocal delivered
+            if delivered:
+                return {"type": "http.disconnect"}
+            delivered = True
+            return {"type": "http.request", "body": target.body, "more_body": False}
+
+        async def send(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await self.app(scope, receive, send)
+        return status
+
+
+def component_of(filename: str, function: str, project_root: Optional[str]) -> str:
+    location = f"{filename}:{function}".replace("\\", "/")
+    for name, fragments in COMPONENTS:
+        if any(fragment in location for fragment in fragments):
+            return name
+    if project_root and filename.startswith(project_root) and "site-packages" not in filename:
+        return "app"
+    return "other"
+
+
+def _breakdown(profiler: cProfile.Profile, project_root: Optional[str]) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for (filename, _, function), (_, _, own, _, _) in pstats.Stats(profiler).stats.items():
+        component = component_of(filename, function, project_root)
+        totals[component] = totals.get(component, 0.0) + own
+    overall = sum(totals.values()) or 1.0
+    return {
+        name: share / overall
+        for name, share in sorted(totals.items(), key=lambda item: -item[1])
+    }
+
+
+async def _bench_route(
+    client: _Client,
+    target: RouteTarget,
+    iterations: int,
+    breakdown: bool,
+    project_root: Optional[str],
+) -> RouteTiming:
+    clock = time.perf_counter_ns
+    status = 0
+    for _ in range(max(10, iterations // 10)):
+        status = await client.call(target)
+    samples = array("d")
+    for _ in range(iterations):
+        started = clock()
+        await client.call(target)
+        samples.append((clock() - started) / 1000)
+    ordered = array("d", sorted(samples))
+
+    memory_calls = max(10, min(100, iterations // 10))
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(memory_calls):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await client.call(target)
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    for _ in range(memory_calls):
+        await client.call(target)
+    gc.collect()
+    retained = (sys.getallocatedblocks() - blocks) / memory_calls
+
+    shares: dict[str, float] = {}
+    if breakdown:
+        profiler = cProfile.Profile()
+        for _ in range(memory_calls):
+            profiler.enable()
+            await client.call(target)
+            profiler.disable()
+        shares = _breakdown(profiler, project_root)
+
+    return RouteTiming(
+        method=target.method,
+        route=target.route,
+        handler=target.handler,
+        status=status,
+        calls=iterations,
+        mean_us=sum(ordered) / len(ordered),
+        p50_us=percentile(ordered, 0.50),
+        p99_us=percentile(ordered, 0.99),
+        alloc_bytes=peaks / memory_calls,
+        retained_blocks=retained,
+        breakdown=shares,
+    )
+
+
+async def bench_routes(
+    app: Any,
+    targets: list[RouteTarget],
+    iterations: int = 1000,
+    breakdown: bool = True,
+    project_root: Optional[Path] = None,
+) -> list[RouteTiming]:
+    """Benchmark every target against ``app``, inside the app's lifespan."""
+    client = _Client(app)
+    await client.startup()
+    root = str(project_root) if project_root else None
+    try:
+        return [
+            await _bench_route(client, target, iterations, breakdown, root)
+            for target in targets
+        ]
+    finally:
+        await client.shutdown()
@@ -0,0 +1,238 @@
+"""Prometheus text-format metrics served from the ``nestipy start`` master.
+
+Everything is derived from what the master already sees: access lines and
+granian's own ``Spawning worker-N`` / ``Unexpected exit`` messages on the
+forwarded stdout, plus ``/proc`` for per-worker memory and CPU. Workers are
+never asked for anything, so a scrape costs them nothing.
+"""
+
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from . import procfs
+from .stats import RouteStats
+
+# Prometheus' default histogram buckets, in milliseconds.
+LATENCY_BUCKETS_MS = (
+    5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_SPAWN_RE = re.compile(rb"Spawning worker-(\d+) with PID: (\d+)")
+_UNEXPECTED_EXIT_RE = re.compile(rb"Unexpected exit from worker-(\d+)")
+_RETIRED_RE = re.compile(rb"Retired worker-(\d+)")
+
+
+class WorkerTracker:
+    """Follow granian worker (re)spawns from the master's own log lines."""
+
+    def __init__(self) -> None:
+        self.pids: dict[int, int] = {}
+        self.spawns: dict[int, int] = {}
+        self.unexpected_exits: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def observe_line(self, line: bytes) -> None:
+        if b"worker-" not in line:
+            return
+        spawn = _SPAWN_RE.search(line)
+        if spawn is not None:
+            worker, pid = int(spawn.group(1)), int(spawn.group(2))
+            with self._lock:
+                self.pids[worker] = pid
+                self.spawns[worker] = self.spawns.get(worker, 0) + 1
+            return
+        crash = _UNEXPECTED_EXIT_RE.search(line)
+        if crash is not None:
+            worker = int(crash.group(1))
+            with self._lock:
+                self.unexpected_exits[worker] = self.unexpected_exits.get(worker, 0) + 1
+            return
+        retired = _RETIRED_RE.search(line)
+        if retired is not None:
+            # Scaled down by the autoscaler: gone, not restarting.
+            worker = int(retired.group(1))
+            with self._lock:
+                self.pids.pop(worker, None)
+                self.spawns.pop(worker, None)
+
+    def workers(self) -> list[tuple[int, int, int, int]]:
+        """``(worker, pid, restarts, unexpected_exits)`` for every known worker."""
+        with self._lock:
+            return [
+                (
+                    worker,
+                    pid,
+                    self.spawns.get(worker, 1) - 1,
+                    self.unexpected_exits.get(worker, 0),
+                )
+                for worker, pid in sorted(self.pids.items())
+            ]
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample(name: str, labels: dict[str, str], value: float) -> str:
+    text = repr(value) if isinstance(value, float) else str(value)
+    if not labels:
+        return f"{name} {text}"
+    rendered = ",".join(f'{key}="{_label(item)}"' for key, item in labels.items())
+    return f"{name}{{{rendered}}} {text}"
+
+
+class MetricsRegistry:
+    """Render request and worker metrics in the Prometheus text format."""
+
+    def __init__(self, stats: RouteStats, tracker: WorkerTracker) -> None:
+        self.stats = stats
+        self.tracker = tracker
+        self.started = time.time()
+
+    def observe_line(self, line: bytes) -> None:
+        self.stats.observe_line(line)
+        self.tracker.observe_line(line)
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("nestipy_start_time_seconds", "gauge", "Start time of nestipy start.")
+        lines.append(_sample("nestipy_start_time_seconds", {}, self.started))
+
+        routes = self.stats.export(LATENCY_BUCKETS_MS)
+        family(
+            "nestipy_http_requests_total",
+            "counter",
+            "Requests seen in the access log by route and status class.",
+        )
+        for route in routes:
+            labels = {"method": route["method"], "route": route["route"]}
+            for klass in range(1, 6):
+                if route["statuses"][klass]:
+                    lines.append(
+                        _sample(
+                            "nestipy_http_requests_total",
+                            {**labels, "status_class": f"{klass}xx"},
+                            route["statuses"][klass],
+                        )
+                    )
+
+        name = "nestipy_http_request_duration_seconds"
+        family(name, "histogram", "Request latency from the access log.")
+        for route in routes:
+            labels = {"method": route["method"], "route": route["route"]}
+            for bound, count in zip(LATENCY_BUCKETS_MS, route["buckets"]):
+                lines.append(
+                    _sample(f"{name}_bucket", {**labels, "le": f"{bound / 1000:g}"}, count)
+                )
+            lines.append(_sample(f"{name}_bucket", {**labels, "le": "+Inf"}, route["count"]))
+            lines.append(_sample(f"{name}_sum", labels, route["sum_ms"] / 1000))
+            lines.append(_sample(f"{name}_count", labels, route["count"]))
+
+        workers = [
+            (str(worker), str(pid), restarts, crashes)
+            for worker, pid, restarts, crashes in self.tracker.workers()
+        ]
+        family(
+            "nestipy_worker_resident_memory_bytes",
+            "gauge",
+            "Resident memory of each worker.",
+        )
+        for worker, pid, _, _ in workers:
+            rss = procfs.rss_bytes(int(pid))
+            if rss is not None:
+                lines.append(
+                    _sample(
+                        "nestipy_worker_resident_memory_bytes",
+                        {"worker": worker, "pid": pid},
+                        rss,
+                    )
+                )
+        family(
+            "nestipy_worker_cpu_seconds_total", "counter", "CPU time used by each worker."
+        )
+        for worker, pid, _, _ in workers:
+            cpu = procfs.cpu_seconds(int(pid))
+            if cpu is not None:
+                lines.append(
+                    _sample(
+                        "nestipy_worker_cpu_seconds_total",
+                        {"worker": worker, "pid": pid},
+                        cpu,
+                    )
+                )
+        family(
+            "nestipy_worker_restarts_total", "counter", "Times each worker was respawned."
+        )
+        for worker, _, restarts, _ in workers:
+            lines.append(
+                _sample("nestipy_worker_restarts_total", {"worker": worker}, restarts)
+            )
+        family(
+            "nestipy_worker_unexpected_exits_total",
+            "counter",
+            "Worker exits not requested by the master.",
+        )
+        for worker, _, _, crashes in workers:
+            lines.append(
+                _sample("nestipy_worker_unexpected_exits_total", {"worker": worker}, crashes)
+            )
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _make_request_handler(registry: MetricsRegistry) -> type:
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            # Scrapes must not show up in the application's output.
+            pass
+
+    return _MetricsHandler
+
+
+class MetricsServer:
+    """Serve :class:`MetricsRegistry` on a side port from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, host: str, port: int) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer(
+            (self.host, self.port), _make_request_handler(self.registry)
+        )
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="nestipy-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
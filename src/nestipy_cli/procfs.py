@@ -0,0 +1,84 @@
+"""Small readers for Linux ``/proc`` process statistics.
+
+Every helper returns ``None`` (or an empty result) when the information is
+not available, e.g. on platforms without procfs or for a process that has
+already exited, so callers can simply skip the value.
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+PROC_ROOT = Path("/proc")
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text()
+    except (OSError, ValueError):
+        return None
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of ``pid`` in bytes."""
+    statm = _read(PROC_ROOT / str(pid) / "statm")
+    if not statm:
+        return None
+    try:
+        return int(statm.split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IndexError, ValueError):
+        return None
+
+
+def cpu_seconds(pid: int) -> Optional[float]:
+    """User plus system CPU time consumed by ``pid``, in seconds."""
+    stat = _read(PROC_ROOT / str(pid) / "stat")
+    if not stat:
+        return None
+    # The command name may contain spaces; fields restart after its ")".
+    fields = stat[stat.rfind(")") + 2 :].split()
+    try:
+        ticks = int(fields[11]) + int(fields[12])
+    except (IndexError, ValueError):
+        return None
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+def child_pids(pid: int) -> list[int]:
+    """Direct children of ``pid`` across all of its threads."""
+    children: list[int] = []
+    try:
+        tasks = list((PROC_ROOT / str(pid) / "task").iterdir())
+    except OSError:
+        return children
+    for task in tasks:
+        content = _read(task / "children")
+        if content:
+            children.extend(int(value) for value in content.split())
+    return sorted(children)
+
+
+def memory_rollup(pid: int) -> Optional[dict[str, int]]:
+    """``/proc/<pid>/smaps_rollup`` as a mapping of field name to bytes.
+
+    Includes ``Rss``, ``Pss``, ``Shared_Clean``, ``Shared_Dirty``,
+    ``Private_Clean`` and ``Private_Dirty`` (Linux 4.14+).
+    """
+    content = _read(PROC_ROOT / str(pid) / "smaps_rollup")
+    if not content:
+        return None
+    fields: dict[str, int] = {}
+    for line in content.splitlines()[1:]:
+        name, _, value = line.partition(":")
+        parts = value.split()
+        if parts and parts[0].isdigit():
+            fields[name] = int(parts[0]) * 1024
+    return fields or None
+
+
+def thread_ids(pid: int) -> list[int]:
+    """Thread ids of ``pid`` (including the main thread, whose id is ``pid``)."""
+    try:
+        return sorted(int(task.name) for task in (PROC_ROOT / str(pid) / "task").iterdir())
+    except (OSError, ValueError):
+        return []
@@ -0,0 +1,79 @@
+"""``[tool.nestipy.start]`` in ``pyproject.toml``: defaults for ``nestipy start``.
+
+Keys are ``nestipy start`` option names without the dashes in front
+(``workers = 4``, ``loop = "uvloop"``, ``runtime-threads = 2``). Options
+given on the command line still win. ``nestipy tune`` writes the table; it
+can also be edited by hand.
+"""
+
+import json
+import re
+import tomllib
+from pathlib import Path
+from typing import Any
+
+PYPROJECT_FILE = "pyproject.toml"
+START_TABLE = ("tool", "nestipy", "start")
+_HEADER = "[" + ".".join(START_TABLE) + "]"
+_HEADER_RE = re.compile(r"^\s*\[tool\.nestipy\.start\]\s*(#.*)?$")
+_ANY_HEADER_RE = re.compile(r"^\s*\[\[?[^\]]+\]\]?\s*(#.*)?$")
+
+
+def load_start_defaults(path: Path) -> dict[str, Any]:
+    """The table as ``{option_name: value}``; empty if the file or table is absent.
+
+    Raises :class:`tomllib.TOMLDecodeError` for a malformed file.
+    """
+    try:
+        data = tomllib.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    table: Any = data
+    for key in START_TABLE:
+        table = table.get(key, {}) if isinstance(table, dict) else {}
+    return {key.replace("-", "_"): value for key, value in table.items()}
+
+
+def _toml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_toml_value(item) for item in value) + "]"
+    return json.dumps(str(value))
+
+
+def write_start_defaults(path: Path, settings: dict[str, Any], comment: str = "") -> None:
+    """Replace the table in ``path`` (or append it), keeping the rest as written."""
+    lines = path.read_text().splitlines() if path.exists() else []
+    table = [_HEADER]
+    if comment:
+        table.append(f"# {comment}")
+    table += [
+        f"{name.replace('_', '-')} = {_toml_value(value)}"
+        for name, value in settings.items()
+    ]
+    start = next((i for i, line in enumerate(lines) if _HEADER_RE.match(line)), None)
+    if start is None:
+        while lines and not lines[-1].strip():
+            lines.pop()
+        lines += ([""] if lines else []) + table
+    else:
+        end = next(
+            (
+                i
+                for i in range(start + 1, len(lines))
+                if _ANY_HEADER_RE.match(lines[i])
+            ),
+            len(lines),
+        )
+        # Keep the blank lines that separated the table from the next one.
+        while end > start + 1 and not lines[end - 1].strip():
+            end -= 1
+        lines[start:end] = table
+    text = "\n".join(lines) + "\n"
+    # Refuse to leave an unreadable file behind (e.g. a `start` key already
+    # defined inline under [tool.nestipy]).
+    tomllib.loads(text)
+    path.write_text(text)
@@ -0,0 +1,127 @@
+"""Recycle leaking or long-lived workers for ``--max-worker-rss`` / ``--max-requests``.
+
+The RSS ceiling is granian's own resource monitor (``workers_max_rss``,
+sampled every ``interval`` seconds); nestipy only passes the settings.
+
+Workers count their own requests: a logging filter on the access logger
+emits ``Worker <pid> served <n> requests`` once the worker's jittered limit
+is reached, and the master picks that line up from the worker output. The
+worker is only queued. The replacement happens on granian's main loop,
+through the signal granian's resource monitor uses, so it cannot race crash
+respawns or reloads. It goes through the usual graceful respawn
+(readiness-gated with ``--rolling-restart``). At most one worker is recycled
+per ``interval``, so workers that reach their limit together do not restart
+all at once.
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger("_granian")
+
+_RECYCLE_RE = re.compile(rb"Worker (\d+) served (\d+) requests")
+_MIB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class RecyclePolicy:
+    max_rss: int = 0
+    max_requests: int = 0
+    interval: float = 10.0
+
+
+def granian_rss_options(policy: RecyclePolicy) -> dict[str, int]:
+    """Granian's resource monitor settings for ``policy.max_rss``."""
+    if not policy.max_rss:
+        return {}
+    return {
+        "workers_max_rss": -(-policy.max_rss // _MIB),  # MiB, rounded up
+        "rss_sample_interval": max(1, round(policy.interval)),
+    }
+
+
+def recycling_server(base: type) -> type:
+    """Subclass granian's (multi-process) server with request-count recycling."""
+
+    class RecyclingServer(base):  # type: ignore[misc, valid-type]
+        def __init__(self, *args: Any, recycle_policy: RecyclePolicy, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self.recycle_policy = recycle_policy
+            self._recycle_due: dict[int, str] = {}
+            self._recycle_lock = threading.Lock()
+            self._recycle_stop = threading.Event()
+            # When granian's own RSS sampler (if any) next fires.
+            self._rss_sample_due: Optional[float] = None
+
+        def observe_line(self, line: bytes) -> None:
+            if b" requests" not in line:
+                return
+            match = _RECYCLE_RE.search(line)
+            if match is not None:
+                self.request_recycle(
+                    int(match.group(1)), f"served {int(match.group(2))} requests"
+                )
+
+        def request_recycle(self, pid: int, reason: str) -> None:
+            with self._recycle_lock:
+                self._recycle_due.setdefault(pid, reason)
+            self._signal_recycle()
+
+        def _signal_recycle(self) -> None:
+            self.rss_signal = True
+            self.main_loop_interrupt.set()
+
+        def startup(self, spawn_target, target_loader):
+            super().startup(spawn_target, target_loader)
+            threading.Thread(
+                target=self._monitor, name="nestipy-recycler", daemon=True
+            ).start()
+
+        def _stop_workers(self):
+            self._recycle_stop.set()
+            super()._stop_workers()
+
+        def _monitor(self) -> None:
+            # Re-signal while workers wait their turn, one per interval.
+            while not self._recycle_stop.wait(self.recycle_policy.interval):
+                with self._recycle_lock:
+                    pending = bool(self._recycle_due)
+                if pending:
+                    self._signal_recycle()
+
+        def _watch_workers_rss(self):
+            # Granian re-arms its RSS sampler after every signal, ours
+            # included; keep a single one armed.
+            if self.workers_rss is None:
+                return
+            now = time.monotonic()
+            if self._rss_sample_due is not None and now < self._rss_sample_due:
+                return
+            self._rss_sample_due = now + self.rss_sample_interval
+            super()._watch_workers_rss()
+
+        def _handle_rss_signal(self, spawn_target, target_loader):
+            # Runs on granian's main loop: granian's RSS check when its
+            # sampler is due, then at most one request-count recycle.
+            due = self._rss_sample_due
+            if self.workers_rss is not None and due is not None and time.monotonic() >= due:
+                super()._handle_rss_signal(spawn_target, target_loader)
+            by_pid = {wrk._id(): wrk for wrk in self.wrks}
+            with self._recycle_lock:
+                for pid in [pid for pid in self._recycle_due if pid not in by_pid]:
+                    del self._recycle_due[pid]  # already gone or replaced
+                if not self._recycle_due:
+                    return
+                pid = next(iter(self._recycle_due))
+                reason = self._recycle_due.pop(pid)
+            wrk = by_pid[pid]
+            logger.info(f"worker-{wrk.idx + 1} {reason}, gracefully recycling..")
+            self._respawn_workers(
+                [wrk.idx], spawn_target, target_loader, delay=self.respawn_interval
+            )
+
+    return RecyclingServer
@@ -0,0 +1,186 @@
+"""Container-aware CPU/memory limits for ``nestipy start --workers auto``.
+
+``os.cpu_count()`` reports the host's CPUs, not what a container may use.
+:func:`detect_limits` combines the scheduler affinity (which reflects the
+cpuset) with the cgroup v2 ``cpu.max``/``memory.max`` files or their cgroup
+v1 ``cpu.cfs_quota_us``/``memory.limit_in_bytes`` counterparts, taking the
+tightest limit along the cgroup hierarchy. :class:`CpuPinner` optionally
+pins each granian worker to its own core from the master.
+"""
+
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from . import procfs
+
+# cgroup v1 reports "no limit" as a huge page-aligned number.
+_UNLIMITED_MEMORY = 1 << 60
+_V1_MOUNTS = {
+    "cpu": ("cpu", "cpu,cpuacct", "cpuacct,cpu"),
+    "memory": ("memory",),
+}
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    cpus: int
+    cpu_quota: Optional[float] = None
+    memory_limit: Optional[int] = None
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def cgroup_paths(root: Path = Path("/")) -> dict[str, str]:
+    """Controller -> cgroup path of this process; ``""`` is the v2 hierarchy."""
+    paths: dict[str, str] = {}
+    content = _read(root / "proc" / "self" / "cgroup") or ""
+    for line in content.splitlines():
+        parts = line.split(":", 2)
+        if len(parts) != 3:
+            continue
+        _, controllers, path = parts
+        for controller in controllers.split(",") if controllers else [""]:
+            paths[controller] = path
+    return paths
+
+
+def _walk_up(base: Path, path: str) -> Iterator[Path]:
+    """``base/path`` and each of its parents up to ``base`` itself."""
+    current = base / path.strip("/")
+    while True:
+        if current.is_dir():
+            yield current
+        if current == base:
+            return
+        current = current.parent
+
+
+def _cgroup_dirs(root: Path, controller: str) -> Iterator[Path]:
+    cgroup_root = root / "sys" / "fs" / "cgroup"
+    paths = cgroup_paths(root)
+    if (cgroup_root / "cgroup.controllers").exists():
+        yield from _walk_up(cgroup_root, paths.get("", "/"))
+        return
+    for mount in _V1_MOUNTS[controller]:
+        base = cgroup_root / mount
+        if base.is_dir():
+            yield from _walk_up(base, paths.get(controller, "/"))
+            return
+
+
+def _cpu_quota(directory: Path) -> Optional[float]:
+    cpu_max = _read(directory / "cpu.max")
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota == "max" or not period:
+            return None
+        return int(quota) / int(period)
+    quota = _read(directory / "cpu.cfs_quota_us")
+    period = _read(directory / "cpu.cfs_period_us")
+    if quota is None or period is None or int(quota) <= 0:
+        return None
+    return int(quota) / int(period)
+
+
+def _memory_limit(directory: Path) -> Optional[int]:
+    value = _read(directory / "memory.max")
+    if value is None:
+        value = _read(directory / "memory.limit_in_bytes")
+    if value is None or value == "max" or int(value) >= _UNLIMITED_MEMORY:
+        return None
+    return int(value)
+
+
+def _tightest(values: Iterable[Optional[float]]) -> Optional[float]:
+    limits = [value for value in values if value is not None]
+    return min(limits) if limits else None
+
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def detect_limits(root: Path = Path("/"), cpus: Optional[int] = None) -> ResourceLimits:
+    try:
+        cpu_quota = _tightest(_cpu_quota(d) for d in _cgroup_dirs(root, "cpu"))
+        memory = _tightest(_memory_limit(d) for d in _cgroup_dirs(root, "memory"))
+    except ValueError:
+        cpu_quota = memory = None
+    return ResourceLimits(
+        cpus=cpus if cpus is not None else available_cpus(),
+        cpu_quota=cpu_quota,
+        memory_limit=int(memory) if memory is not None else None,
+    )
+
+
+def auto_worker_count(limits: ResourceLimits, memory_per_worker: int) -> int:
+    """One worker per usable CPU, capped by the quota and the memory limit."""
+    count = limits.cpus
+    if limits.cpu_quota is not None:
+        count = min(count, int(limits.cpu_quota))
+    if limits.memory_limit is not None and memory_per_worker > 0:
+        count = min(count, limits.memory_limit // memory_per_worker)
+    return max(1, count)
+
+
+class CpuPinner(threading.Thread):
+    """Pin every worker process of this master to its own CPU.
+
+    Runs in the master and polls its children, so respawned workers are
+    picked up as well. All threads of a worker are pinned (affinity is
+    per-thread on Linux); workers beyond the number of CPUs share cores
+    round-robin.
+    """
+
+    def __init__(
+        self,
+        exclude: frozenset[int] = frozenset(),
+        cpus: Optional[list[int]] = None,
+        interval: float = 1.0,
+    ) -> None:
+        super().__init__(name="nestipy-cpu-pinner", daemon=True)
+        self.exclude = exclude
+        self.cpus = sorted(cpus if cpus is not None else os.sched_getaffinity(0))
+        self.interval = interval
+        self.assigned: dict[int, int] = {}
+        self._pinned: dict[int, set[int]] = {}
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        self.pin_once()
+        while not self._stop_event.wait(self.interval):
+            self.pin_once()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def pin_once(self) -> None:
+        live = [pid for pid in procfs.child_pids(os.getpid()) if pid not in self.exclude]
+        self.assigned = {pid: cpu for pid, cpu in self.assigned.items() if pid in live}
+        self._pinned = {pid: tids for pid, tids in self._pinned.items() if pid in live}
+        for pid in live:
+            cpu = self.assigned.get(pid)
+            if cpu is None:
+                load = Counter(self.assigned.values())
+                cpu = min(self.cpus, key=lambda candidate: (load[candidate], candidate))
+                self.assigned[pid] = cpu
+            pinned = self._pinned.setdefault(pid, set())
+            for tid in procfs.thread_ids(pid):
+                if tid in pinned:
+                    continue
+                try:
+                    os.sched_setaffinity(tid, {cpu})
+                except OSError:
+                    continue
+                pinned.add(tid)
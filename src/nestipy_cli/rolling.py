@@ -0,0 +1,144 @@
+"""Zero-downtime rolling worker restarts for ``nestipy start --rolling-restart``.
+
+Granian already respawns every worker on ``SIGHUP``. It starts the
+replacement, waits a fixed interval and then stops the old worker, whether
+or not the new one ever came up. :func:`rolling_server` gates each swap on
+readiness instead. A worker is ready once it logs ``Started worker-N``,
+which granian does only after the app was imported, the ASGI lifespan
+startup completed and the worker listens on the shared socket. The master
+sees that line on the forwarded stdout, the same way the metrics tracker
+does. Workers are replaced one at a time and an old worker only drains
+after its replacement is serving, so capacity never drops below N. A
+replacement that dies or misses ``ready_timeout`` is discarded, its old
+worker keeps serving and the restart stops there.
+
+``nestipy restart`` sends ``SIGHUP`` to the master named in the pid file.
+"""
+
+import logging
+import os
+import re
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger("_granian")
+
+DEFAULT_PID_FILE = Path(".nestipy") / "nestipy.pid"
+_STARTED_RE = re.compile(rb"Started worker-(\d+)")
+
+
+class RestartError(RuntimeError):
+    """Raised when no running ``nestipy start`` master can be signalled."""
+
+
+class WorkerReadiness:
+    """Count ``Started worker-N`` lines per worker from the master's output."""
+
+    def __init__(self) -> None:
+        self._started: dict[int, int] = {}
+        self._changed = threading.Condition()
+
+    def observe_line(self, line: bytes) -> None:
+        if b"Started worker-" not in line:
+            return
+        match = _STARTED_RE.search(line)
+        if match is None:
+            return
+        worker = int(match.group(1))
+        with self._changed:
+            self._started[worker] = self._started.get(worker, 0) + 1
+            self._changed.notify_all()
+
+    def mark(self, worker: int) -> int:
+        """Current start count of ``worker``; pass it to :meth:`wait`."""
+        with self._changed:
+            return self._started.get(worker, 0)
+
+    def wait(self, worker: int, mark: int, timeout: float) -> bool:
+        """Wait up to ``timeout`` for ``worker`` to start again after ``mark``."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self._started.get(worker, 0) > mark, timeout
+            )
+
+
+def rolling_server(base: type) -> type:
+    """Subclass granian's (multi-process) server with readiness-gated respawns."""
+
+    class RollingServer(base):  # type: ignore[misc, valid-type]
+        def __init__(self, *args: Any, ready_timeout: float = 60.0, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self.ready_timeout = ready_timeout
+            self.readiness = WorkerReadiness()
+
+        def _await_ready(self, wrk: Any, mark: int) -> bool:
+            deadline = time.monotonic() + self.ready_timeout
+            while wrk.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                if self.readiness.wait(wrk.idx + 1, mark, min(remaining, 0.25)):
+                    return True
+            return False
+
+        def _stop_worker(self, wrk: Any, timeout: Optional[float] = None) -> None:
+            wrk.terminate()
+            wrk.join(timeout if timeout is not None else self.workers_kill_timeout)
+            if wrk.is_alive():
+                logger.warning(
+                    f"Killing worker-{wrk.idx + 1} after it refused to gracefully stop"
+                )
+                wrk.kill()
+                wrk.join()
+
+        def _respawn_workers(self, workers, spawn_target, target_loader, delay: float = 0):
+            spawned = 0
+            for idx in workers:
+                self.respawned_wrks[idx] = time.monotonic()
+                old_wrk = self.wrks[idx]
+                rolling = old_wrk.is_alive()
+                mark = self.readiness.mark(idx + 1)
+                logger.info(f"Respawning worker-{idx + 1}")
+                wrk = self._spawn_worker(
+                    idx=idx, target=spawn_target, callback_loader=target_loader
+                )
+                # Until it is swapped in, a failing replacement is ours to handle,
+                # not a crash for granian to respawn.
+                wrk.interrupt_by_parent = rolling
+                wrk.start()
+                spawned += 1
+                if rolling and not self._await_ready(wrk, mark):
+                    logger.error(
+                        f"Replacement worker-{idx + 1} was not ready within "
+                        f"{self.ready_timeout:g}s; keeping the old worker and "
+                        "stopping the rolling restart"
+                    )
+                    # A worker stuck in startup may ignore SIGTERM for good.
+                    self._stop_worker(wrk, timeout=self.workers_kill_timeout or 5.0)
+                    break
+                wrk.interrupt_by_parent = False
+                self.wrks[idx] = wrk
+                if not rolling:
+                    continue
+                logger.info(f"Stopping old worker-{idx + 1}")
+                self._stop_worker(old_wrk)
+                logger.info(f"Stopped old worker-{idx + 1}")
+            self._metrics.incr_spawn(spawned)
+
+    return RollingServer
+
+
+def send_restart(pid_file: Path = DEFAULT_PID_FILE) -> int:
+    """Ask the master in ``pid_file`` for a rolling restart; return its pid."""
+    try:
+        pid = int(pid_file.read_text().strip())
+    except (OSError, ValueError) as exc:
+        raise RestartError(f"No running server found ({pid_file}: {exc})") from exc
+    try:
+        os.kill(pid, signal.SIGHUP)
+    except ProcessLookupError as exc:
+        raise RestartError(f"Server {pid} from {pid_file} is not running") from exc
+    return pid
@@ -0,0 +1,242 @@
+"""Serve a Nestipy (ASGI) application over granian's RSGI interface.
+
+With ``--interface asgi`` granian builds an ASGI scope dict per request and
+drives the app through awaitable ``receive``/``send`` objects. Every body
+chunk crosses the Rust/Python boundary as a future. :class:`RSGIAdapter` is
+an RSGI application that runs the ASGI app itself, with a few shortcuts:
+
+* the request body is read in one call when it is small and announced by
+  ``Content-Length`` (or absent), and streamed otherwise;
+* a response whose body arrives in one ``http.response.body`` message is
+  handed to granian in one synchronous ``response_bytes`` call instead of a
+  stream;
+* ``http.response.pathsend`` is advertised, so file responses are sent by
+  granian (``response_file``) without reading the file in Python.
+
+ASGI features the adapter does not translate are simply not advertised
+(trailers, zero-copy send, TLS extension), so apps use their plain ASGI code
+path. Websockets and the lifespan protocol behave as under granian's ASGI
+interface. An app that already implements ``__rsgi__`` is served natively.
+"""
+
+import logging
+import sys
+from typing import Any
+
+logger = logging.getLogger("_granian")
+
+_ASGI = {"version": "3.0", "spec_version": "2.3"}
+_EXTENSIONS = {"http.response.pathsend": {}}
+# Request bodies up to this size are read in a single call.
+_READ_AT_ONCE = 1024 * 1024
+
+
+def _address(value: str) -> tuple[str, int]:
+    # Like granian's ASGI scope, a Unix socket peer is ("", 0).
+    host, _, port = value.rpartition(":")
+    return host, int(port) if port.isdigit() else 0
+
+
+def _asgi_headers(scope: Any) -> list[tuple[bytes, bytes]]:
+    return [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        for name, value in scope.headers.items()
+    ]
+
+
+def _rsgi_headers(headers: Any) -> list[tuple[str, str]]:
+    return [(name.decode("latin-1"), value.decode("latin-1")) for name, value in headers]
+
+
+class _HTTPCycle:
+    """One ASGI HTTP request/response cycle on top of an RSGI protocol."""
+
+    __slots__ = (
+        "protocol",
+        "read_at_once",
+        "body_iter",
+        "request_done",
+        "status",
+        "headers",
+        "stream",
+        "done",
+    )
+
+    def __init__(self, protocol: Any, read_at_once: bool) -> None:
+        self.protocol = protocol
+        self.read_at_once = read_at_once
+        self.body_iter = None
+        self.request_done = False
+        self.status = 0
+        self.headers: list[tuple[str, str]] = []
+        self.stream = None
+        self.done = False
+
+    async def receive(self) -> dict:
+        if self.request_done:
+            await self.protocol.client_disconnect()
+            return {"type": "http.disconnect"}
+        if self.read_at_once:
+            self.request_done = True
+            return {"type": "http.request", "body": await self.protocol(), "more_body": False}
+        if self.body_iter is None:
+            self.body_iter = self.protocol.__aiter__()
+        try:
+            chunk = await self.body_iter.__anext__()
+        except StopAsyncIteration:
+            self.request_done = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+    async def send(self, message: dict) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.status = message["status"]
+            self.headers = _rsgi_headers(message.get("headers", ()))
+        elif kind == "http.response.body":
+            if self.done:
+                return
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if self.stream is None:
+                if not more:
+                    self.done = True
+                    if body:
+                        self.protocol.response_bytes(self.status, self.headers, bytes(body))
+                    else:
+                        self.protocol.response_empty(self.status, self.headers)
+                    return
+                self.stream = self.protocol.response_stream(self.status, self.headers)
+            if body:
+                await self.stream.send_bytes(bytes(body))
+            self.done = not more
+        elif kind == "http.response.pathsend":
+            self.done = True
+            self.protocol.response_file(self.status, self.headers, message["path"])
+
+    def finish(self, failed: bool) -> None:
+        if self.stream is None and not self.done:
+            # The app returned (or raised) without a complete response.
+            if failed or not self.status:
+                self.protocol.response_empty(500, [])
+            else:
+                self.protocol.response_empty(self.status, self.headers)
+
+
+class _WebsocketCycle:
+    """One ASGI websocket session on top of an RSGI websocket protocol."""
+
+    __slots__ = ("protocol", "transport", "connected", "closed")
+
+    def __init__(self, protocol: Any) -> None:
+        self.protocol = protocol
+        self.transport = None
+        self.connected = False
+        self.closed = False
+
+    async def receive(self) -> dict:
+        if not self.connected:
+            self.connected = True
+            return {"type": "websocket.connect"}
+        if self.transport is None or self.closed:
+            return {"type": "websocket.disconnect", "code": 1006}
+        try:
+            message = await self.transport.receive()
+        except Exception:
+            self.closed = True
+            return {"type": "websocket.disconnect", "code": 1006}
+        if message.kind == 0:
+            self.closed = True
+            return {"type": "websocket.disconnect", "code": 1000}
+        if message.kind == 1:
+            return {"type": "websocket.receive", "bytes": message.data}
+        return {"type": "websocket.receive", "text": message.data}
+
+    async def send(self, message: dict) -> None:
+        kind = message["type"]
+        if kind == "websocket.accept":
+            self.transport = await self.protocol.accept()
+        elif kind == "websocket.send":
+            if self.transport is None or self.closed:
+                raise RuntimeError("websocket is not connected")
+            if message.get("bytes") is not None:
+                await self.transport.send_bytes(message["bytes"])
+            else:
+                await self.transport.send_str(message["text"])
+        elif kind == "websocket.close":
+            if not self.closed:
+                self.closed = True
+                self.protocol.close(message.get("code", 1000))
+
+    def finish(self, failed: bool) -> None:
+        if not self.closed:
+            self.closed = True
+            self.protocol.close(1000 if self.transport is not None else 403)
+
+
+class RSGIAdapter:
+    """RSGI application wrapping an ASGI application."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self.lifespan = None
+
+    def __rsgi_init__(self, loop: Any) -> None:
+        from granian.asgi import LifespanProtocol
+
+        self.lifespan = LifespanProtocol(self.app)
+        loop.run_until_complete(self.lifespan.startup())
+        if self.lifespan.interrupt:
+            logger.error("ASGI lifespan startup failed", exc_info=self.lifespan.exc)
+            sys.exit(1)
+
+    def __rsgi_del__(self, loop: Any) -> None:
+        if self.lifespan is not None:
+            loop.run_until_complete(self.lifespan.shutdown())
+
+    def _scope(self, scope: Any, kind: str) -> dict:
+        path = scope.path
+        asgi_scope = {
+            "type": kind,
+            "asgi": _ASGI,
+            "http_version": scope.http_version,
+            "server": _address(scope.server),
+            "client": _address(scope.client),
+            "scheme": scope.scheme,
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "query_string": scope.query_string.encode("latin-1"),
+            "root_path": "",
+            "headers": _asgi_headers(scope),
+            "state": self.lifespan.state.copy() if self.lifespan is not None else {},
+        }
+        if kind == "http":
+            asgi_scope["method"] = scope.method
+            asgi_scope["extensions"] = _EXTENSIONS
+        else:
+            protocols = scope.headers.get("sec-websocket-protocol")
+            asgi_scope["scheme"] = "wss" if scope.scheme == "https" else "ws"
+            asgi_scope["subprotocols"] = (
+                [value.strip() for value in protocols.split(",")] if protocols else []
+            )
+        return asgi_scope
+
+    async def __rsgi__(self, scope: Any, protocol: Any) -> None:
+        if scope.proto == "http":
+            length = scope.headers.get("content-length")
+            read_at_once = (
+                length.isdigit() and int(length) <= _READ_AT_ONCE
+                if length is not None
+                else "transfer-encoding" not in scope.headers
+            )
+            cycle = _HTTPCycle(protocol, read_at_once)
+            asgi_scope = self._scope(scope, "http")
+        else:
+            cycle = _WebsocketCycle(protocol)
+            asgi_scope = self._scope(scope, "websocket")
+        try:
+            await self.app(asgi_scope, cycle.receive, cycle.send)
+        except BaseException:
+            cycle.finish(failed=True)
+            raise
+        cycle.finish(failed=False)
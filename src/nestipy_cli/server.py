@@ -2,24 +2,90 @@ from __future__ import annotations
 
 import copy
 import contextlib
+import functools
+import gc
+import importlib.util
 import inspect
 import logging.config
+import multiprocessing
 import os
 import re
 import sys
 import threading
+import time
 import json
 import os
 import random
 import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Any, Literal
-
-from .config import LOGGING_CONFIG, PROD_LOGGER
+from typing import Any, Callable, Literal
+
+from . import procfs
+from .autoscale import ScalePolicy, autoscaling_server
+from .config import (
+    ACCESS_LOG_FORMAT,
+    UDS_ACCESS_LOG_FORMAT,
+    DEFAULT_LOG_FORMAT,
+    LOGGING_CONFIG,
+    PROD_LOGGER,
+    _STATUS_ANSI as _CONSOLE_STATUS_ANSI,
+    build_granian_log_dictconfig,
+)
+from .recycle import RecyclePolicy, granian_rss_options, recycling_server
+from .rolling import rolling_server
+from .static import StaticMount
+from .uds import uds_server
 
 HttpChoice = Literal["auto", "1", "2"]
 LoopChoice = Literal["auto", "asyncio", "rloop", "uvloop"]
+LogFormatChoice = Literal["text", "json"]
+LogOverflowChoice = Literal["drop-oldest", "block"]
+LogRotateChoice = Literal["S", "M", "H", "D", "midnight"]
+
+
+RuntimeModeChoice = Literal["auto", "mt", "st"]
+TaskImplChoice = Literal["asyncio", "rust"]
+InterfaceChoice = Literal["asgi", "rsgi"]
+
+
+@dataclass(frozen=True)
+class GranianTuning:
+    """Granian performance settings; ``None`` leaves granian's own default.
+
+    Fields are named after granian's constructor arguments, except the
+    ``http1_``/``http2_`` ones, which are fields of its ``HTTP1Settings`` and
+    ``HTTP2Settings`` behind that prefix.
+    """
+
+    runtime_threads: int | None = None
+    runtime_blocking_threads: int | None = None
+    runtime_mode: RuntimeModeChoice | None = None
+    task_impl: TaskImplChoice | None = None
+    backlog: int | None = None
+    backpressure: int | None = None
+    http1_max_buffer_size: int | None = None
+    http1_header_read_timeout: int | None = None
+    http1_keep_alive: bool | None = None
+    http1_pipeline_flush: bool | None = None
+    http2_adaptive_window: bool | None = None
+    http2_initial_connection_window_size: int | None = None
+    http2_initial_stream_window_size: int | None = None
+    http2_keep_alive_interval: int | None = None
+    http2_keep_alive_timeout: int | None = None
+    http2_max_concurrent_streams: int | None = None
+    http2_max_frame_size: int | None = None
+    http2_max_headers_size: int | None = None
+    http2_max_send_buffer_size: int | None = None
+
+
+_HTTP_SETTINGS = {"http1_": "http1_settings", "http2_": "http2_settings"}
+_TUNING_ARGS = tuple(
+    field.name
+    for field in fields(GranianTuning)
+    if not field.name.startswith(tuple(_HTTP_SETTINGS))
+)
+_IGNORED = "ignored: not supported by this granian"
 
 
 @dataclass(frozen=True)
@@ -34,7 +100,8 @@ class GranianStartConfig:
     loop: LoopChoice
     http: HttpChoice
     is_microservice: bool
-    log_config_path: Path
+    # None until the logging config is written (e.g. for --explain-config).
+    log_config_path: Path | None
     reload_any: bool
     reload_paths: list[str]
     reload_ignore_dirs: list[str]
@@ -42,6 +109,72 @@ class GranianStartConfig:
     reload_ignore_paths: list[str]
     reload_tick: int | None
     reload_ignore_worker_failure: bool
+    log_dictconfig: dict[str, Any] | None = None
+    scale_policy: ScalePolicy | None = None
+    pid_file: Path | None = None
+    # Seconds a replacement worker may take to become ready during a rolling
+    # restart; None keeps granian's fixed-interval respawns.
+    ready_timeout: float | None = None
+    recycle_policy: RecyclePolicy | None = None
+    tuning: GranianTuning = GranianTuning()
+    interface: InterfaceChoice = "asgi"
+    uds: Path | None = None
+    uds_permissions: int | None = None
+    # (uid, gid) for the socket file; -1 keeps the current id.
+    uds_owner: tuple[int, int] | None = None
+    static_mounts: tuple[StaticMount, ...] = ()
+    # Cache lifetime (seconds) for static responses; None keeps granian's.
+    static_expires: int | None = None
+    # manifest.json of ``nestipy build --assets``; its files are served by
+    # PrecompressedAssets instead of granian's static routes.
+    assets_manifest: Path | None = None
+
+
+@dataclass(frozen=True)
+class LoggingOptions:
+    log_format: LogFormatChoice = "text"
+    queue_size: int = 10000
+    queue_overflow: LogOverflowChoice = "drop-oldest"
+    flush_interval: float = 1.0
+    flush_size: int = 256
+    max_bytes: int = 0
+    rotate_when: LogRotateChoice | None = None
+    backups: int = 7
+    access_sample: float = 1.0
+    access_rate_limit: int = 0
+    access_errors_always: bool = False
+    access_slow_ms: float = 0.0
+    max_requests: int = 0
+    max_requests_jitter: int = 0
+
+
+def access_log_thinning(options: LoggingOptions) -> list[str]:
+    """The options under which workers drop access lines before the master sees them."""
+    flags = []
+    if options.access_sample < 1.0:
+        flags.append("--access-log-sample")
+    if options.access_rate_limit:
+        flags.append("--access-log-rate-limit")
+    return flags
+
+
+_BYTE_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_byte_size(value: str | int) -> int:
+    """Parse ``1048576``, ``512K``, ``100M`` or ``1.5G`` (binary units) to bytes."""
+    if isinstance(value, int):
+        return value
+    text = value.strip().upper().removesuffix("B").removesuffix("I")
+    unit = text[-1:] if text[-1:] in _BYTE_SIZE_UNITS else ""
+    number = text[: len(text) - len(unit)].strip()
+    try:
+        size = float(number) * _BYTE_SIZE_UNITS[unit]
+    except ValueError:
+        raise ValueError(f"Invalid size: {value!r}") from None
+    if size < 0:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(size)
 
 
 def select_port(port: int, is_microservice: bool) -> int:
@@ -58,149 +191,362 @@ def ensure_log_dir() -> Path:
     return log_dir
 
 
-def build_logging_config(dev: bool) -> dict[str, Any]:
+def build_logging_config(
+    dev: bool, use_color: bool = True, options: LoggingOptions | None = None
+) -> dict[str, Any]:
+    options = options or LoggingOptions()
     config = copy.deepcopy(LOGGING_CONFIG)
+    if not use_color:
+        plain = build_granian_log_dictconfig(use_color=False)
+        config["formatters"]["nestipy"] = plain["formatters"]["nestipy"]
+        config["handlers"]["console"] = plain["handlers"]["console"]
     if not dev:
         config["loggers"] = copy.deepcopy(PROD_LOGGER)
+        _use_fast_console(config, use_color)
+        _use_queue_file_handlers(config, options)
+    if options.log_format == "json":
+        _use_json_access_log(config)
+    if options.max_requests:
+        _use_request_counter(config, options)
+    if options.access_sample < 1.0 or options.access_rate_limit:
+        _use_access_sampler(config, options)
     return config
 
 
-def configure_logging(config: dict[str, Any]) -> None:
-    logging.config.dictConfig(config)
+def _use_fast_console(config: dict[str, Any], use_color: bool) -> None:
+    config["formatters"]["nestipy"] = {
+        "()": "nestipy_cli.config._NestipyFastFormatter",
+        "fmt": DEFAULT_LOG_FORMAT,
+        "use_color": use_color,
+    }
+    config["handlers"]["console"] = build_granian_log_dictconfig(use_color=False)[
+        "handlers"
+    ]["console"]
 
 
-STATUS_COLORS = {
-    "2xx": "32",
-    "3xx": "36",
-    "4xx": "33",
-    "5xx": "31",
-}
+def _use_request_counter(config: dict[str, Any], options: LoggingOptions) -> None:
+    config.setdefault("filters", {})["request_counter"] = {
+        "()": "nestipy_cli.config._NestipyRequestCounter",
+        "max_requests": options.max_requests,
+        "jitter": options.max_requests_jitter,
+    }
+    config["loggers"]["granian.access"].setdefault("filters", []).append(
+        "request_counter"
+    )
 
 
-def _style_status(status: int) -> str:
-    if 200 <= status < 300:
-        return STATUS_COLORS["2xx"]
-    if 300 <= status < 400:
-        return STATUS_COLORS["3xx"]
-    if 400 <= status < 500:
-        return STATUS_COLORS["4xx"]
-    if 500 <= status < 600:
-        return STATUS_COLORS["5xx"]
-    return "37"
+def _use_access_sampler(config: dict[str, Any], options: LoggingOptions) -> None:
+    config.setdefault("filters", {})["access_sampler"] = {
+        "()": "nestipy_cli.config._NestipyAccessSampler",
+        "sample": options.access_sample,
+        "rate_limit": options.access_rate_limit,
+        "errors_always": options.access_errors_always,
+        "slow_ms": options.access_slow_ms,
+    }
+    # On the logger rather than its handlers, so a dropped record is never
+    # formatted or enqueued, and appended after the request counter, which
+    # has to see every request before any is dropped.
+    config["loggers"]["granian.access"].setdefault("filters", []).append(
+        "access_sampler"
+    )
 
 
-def _extract_status_from_message(message: str) -> int | None:
-    try:
-        primary = re.search(r"\"[^\"]*\"\s+(\d{3})\b", message)
-        if primary:
-            value = int(primary.group(1))
-            if 100 <= value <= 599:
-                return value
-        candidates = [
-            int(match.group(1))
-            for match in re.finditer(r"(?<!\d)(\d{3})(?!\d)", message)
-            if 100 <= int(match.group(1)) <= 599
-        ]
-        if candidates:
-            return candidates[-1]
-    except Exception:
-        return None
-    return None
+def _use_queue_file_handlers(config: dict[str, Any], options: LoggingOptions) -> None:
+    for name in ("default", "access"):
+        handler = config["handlers"][name]
+        config["handlers"][name] = {
+            "()": "nestipy_cli.config._NestipyQueueHandler",
+            "formatter": handler["formatter"],
+            "filename": handler["filename"],
+            "queue_size": options.queue_size,
+            "overflow": options.queue_overflow,
+            "flush_interval": options.flush_interval,
+            "flush_size": options.flush_size,
+            "max_bytes": options.max_bytes,
+            "rotate_when": options.rotate_when,
+            "backups": options.backups,
+        }
+
+
+def _use_json_access_log(config: dict[str, Any]) -> None:
+    config["formatters"]["access_json"] = {
+        "()": "nestipy_cli.config._NestipyJsonAccessFormatter"
+    }
+    config["handlers"]["access_console"] = {
+        "class": "logging.StreamHandler",
+        "formatter": "access_json",
+        "stream": "ext://sys.stdout",
+    }
+    access_logger = config["loggers"]["granian.access"]
+    access_logger["handlers"] = [
+        "access_console" if name == "console" else name
+        for name in access_logger["handlers"]
+    ]
+    if "access" in access_logger["handlers"]:
+        config["handlers"]["access"]["formatter"] = "access_json"
 
 
-def _colorize_status_ansi(message: str) -> str:
-    status = _extract_status_from_message(message)
-    if status is None:
-        return message
-    color = _style_status(status)
-    pattern = re.compile(rf"(?<!\d){status}(?!\d)")
-    return pattern.sub(f"\x1b[{color}m{status}\x1b[32m", message, count=1)
+def configure_logging(config: dict[str, Any]) -> None:
+    logging.config.dictConfig(config)
 
 
-def _rewrite_access_line(line: str) -> str | None:
-    match = re.match(r"^\[(?P<ts>[^\]]+)\]\s+(?P<rest>.+)$", line)
-    if not match:
-        return None
-    ts = match.group("ts")
-    rest = match.group("rest")
-    access = re.match(
-        r'^(?P<client>.+?)\s+-\s+"(?P<req>[^"]+)"\s+(?P<status>\d{3})\s+(?P<duration>[0-9.]+)(?:\s*ms)?\s*$',
-        rest,
+_ANSI_GREEN = b"\x1b[32m"
+_ANSI_RESET = b"\x1b[0m"
+_ANSI_ESCAPE = b"\x1b["
+_NESTIPY_PREFIX = b"[NESTIPY]"
+# Indexed by ``status // 100`` so coloring a status is a single tuple lookup.
+_STATUS_ANSI: tuple[bytes, ...] = tuple(
+    code.encode("ascii") for code in _CONSOLE_STATUS_ANSI
+)
+
+_ACCESS_LINE_RE = re.compile(
+    rb'\[(?P<ts>[^\]]+)\]\s+(?P<client>.*?)\s*-\s+"(?P<req>[^"]+)"\s+'
+    rb"(?P<status>\d{3})\s+(?P<duration>[0-9.]+)(?:\s*ms)?\s*"
+)
+_LEVEL_LINE_RE = re.compile(rb"\[(?P<level>[A-Z]+)\]\s*(?P<rest>.*)", re.DOTALL)
+_QUOTED_STATUS_RE = re.compile(rb'"[^"]*"\s+(\d{3})\b')
+_STATUS_CANDIDATE_RE = re.compile(rb"(?<!\d)(\d{3})(?!\d)")
+
+REWRITE_READ_SIZE = 64 * 1024
+
+
+def _status_ansi(status: int) -> bytes:
+    klass = status // 100
+    if 2 <= klass <= 5:
+        return _STATUS_ANSI[klass]
+    return _STATUS_ANSI[0]
+
+
+def _find_status_span(message: bytes) -> tuple[int, int] | None:
+    primary = _QUOTED_STATUS_RE.search(message)
+    if primary and 100 <= int(primary.group(1)) <= 599:
+        return primary.span(1)
+    span = None
+    for match in _STATUS_CANDIDATE_RE.finditer(message):
+        if 100 <= int(match.group(1)) <= 599:
+            span = match.span(1)
+    return span
+
+
+def _colorize_line(message: bytes) -> bytes:
+    span = _find_status_span(message)
+    if span is None:
+        return _ANSI_GREEN + message + _ANSI_RESET
+    start, end = span
+    status = message[start:end]
+    return b"".join(
+        (
+            _ANSI_GREEN,
+            message[:start],
+            _status_ansi(int(status)),
+            status,
+            _ANSI_GREEN,
+            message[end:],
+            _ANSI_RESET,
+        )
     )
-    if not access:
+
+
+def _rewrite_access_line(line: bytes, use_color: bool) -> bytes | None:
+    if b' - "' not in line:
+        return None
+    access = _ACCESS_LINE_RE.fullmatch(line)
+    if access is None:
         return None
-    client = access.group("client")
-    req = access.group("req")
-    status = access.group("status")
-    duration = access.group("duration")
-    return (
-        f'[NESTIPY] INFO [{ts}] {client} - "{req}" {status} - {duration} ms'
+    ts, client, req, status, duration = access.groups()
+    # Unix socket connections have no client address.
+    client = client or b"unix"
+    if not use_color:
+        return b"".join(
+            (
+                b"[NESTIPY] INFO [",
+                ts,
+                b"] ",
+                client,
+                b' - "',
+                req,
+                b'" ',
+                status,
+                b" - ",
+                duration,
+                b" ms",
+            )
+        )
+    return b"".join(
+        (
+            _ANSI_GREEN,
+            b"[NESTIPY] INFO [",
+            ts,
+            b"] ",
+            client,
+            b' - "',
+            req,
+            b'" ',
+            _status_ansi(int(status)),
+            status,
+            _ANSI_GREEN,
+            b" - ",
+            duration,
+            b" ms",
+            _ANSI_RESET,
+        )
     )
 
 
-def rewrite_granian_line(line: str, use_color: bool = True) -> str:
-    if line.startswith("[NESTIPY]"):
-        if not use_color or "\x1b[" in line:
+def rewrite_granian_line_bytes(line: bytes, use_color: bool = True) -> bytes:
+    if line.startswith(b"{"):
+        # JSON access records are already machine-formatted; never touch them.
+        return line
+    if line.startswith(_NESTIPY_PREFIX):
+        if not use_color or _ANSI_ESCAPE in line:
             return line
-        colored = _colorize_status_ansi(line)
-        return f"\x1b[32m{colored}\x1b[0m"
-    access_line = _rewrite_access_line(line)
-    if access_line:
-        if not use_color:
-            return access_line
-        colored = _colorize_status_ansi(access_line)
-        return f"\x1b[32m{colored}\x1b[0m"
-    match = re.match(r"^\[(?P<level>[A-Z]+)\]\s*(?P<rest>.*)$", line)
-    if not match:
+        return _colorize_line(line)
+    if not line.startswith(b"["):
+        return line
+    access_line = _rewrite_access_line(line, use_color)
+    if access_line is not None:
+        return access_line
+    match = _LEVEL_LINE_RE.fullmatch(line)
+    if match is None:
         return line
-    level = match.group("level")
-    rest = match.group("rest")
-    formatted = f"[NESTIPY] {level} {rest}".rstrip()
-    if not use_color or "\x1b[" in line:
+    level, rest = match.groups()
+    formatted = b"[NESTIPY] " + level + b" " + rest
+    formatted = formatted.rstrip()
+    if not use_color or _ANSI_ESCAPE in line:
         return formatted
-    colored = _colorize_status_ansi(formatted)
-    return f"\x1b[32m{colored}\x1b[0m"
+    return _colorize_line(formatted)
+
+
+def rewrite_granian_line(line: str, use_color: bool = True) -> str:
+    return rewrite_granian_line_bytes(
+        line.encode("utf-8", errors="surrogateescape"), use_color=use_color
+    ).decode("utf-8", errors="surrogateescape")
+
+
+class GranianLogRewriter:
+    """Incrementally rewrite a granian output stream, one chunk at a time.
+
+    Complete lines are rewritten and returned as a single buffer so the caller
+    can forward a whole chunk with one ``write``; a trailing partial line is
+    kept until the next chunk (or :meth:`flush`) completes it. ``observer``,
+    when given, sees every complete line as granian wrote it; with
+    ``rewrite=False`` lines are only observed and forwarded unchanged.
+    """
+
+    def __init__(
+        self,
+        use_color: bool = True,
+        observer: Callable[[bytes], None] | None = None,
+        rewrite: bool = True,
+    ) -> None:
+        self.use_color = use_color
+        self.observer = observer
+        self.rewrite = rewrite
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        data = self._pending + chunk if self._pending else chunk
+        lines = data.split(b"\n")
+        self._pending = lines.pop()
+        if not lines:
+            return b""
+        observer = self.observer
+        if observer is not None:
+            for line in lines:
+                observer(line)
+        if not self.rewrite:
+            return data[: len(data) - len(self._pending)]
+        use_color = self.use_color
+        rewritten = [rewrite_granian_line_bytes(line, use_color) for line in lines]
+        rewritten.append(b"")
+        return b"\n".join(rewritten)
+
+    def flush(self) -> bytes:
+        pending, self._pending = self._pending, b""
+        if not pending:
+            return b""
+        if self.observer is not None:
+            self.observer(pending)
+        if not self.rewrite:
+            return pending
+        return rewrite_granian_line_bytes(pending, self.use_color)
+
+
+def _write_all(fd: int, data: bytes) -> bool:
+    view = memoryview(data)
+    while view:
+        try:
+            written = os.write(fd, view)
+        except OSError:
+            return False
+        view = view[written:]
+    return True
 
 
 def _start_rewrite_thread(
-    read_fd: int, write_fd: int, use_color: bool
+    read_fd: int,
+    write_fd: int,
+    use_color: bool,
+    observer: Callable[[bytes], None] | None = None,
+    rewrite: bool = True,
 ) -> threading.Thread:
     def _reader() -> None:
-        buffer = ""
+        rewriter = GranianLogRewriter(
+            use_color=use_color, observer=observer, rewrite=rewrite
+        )
         while True:
             try:
-                chunk = os.read(read_fd, 4096)
+                chunk = os.read(read_fd, REWRITE_READ_SIZE)
             except OSError:
                 break
             if not chunk:
                 break
-            buffer += chunk.decode("utf-8", errors="replace")
-            while "\n" in buffer:
-                line, buffer = buffer.split("\n", 1)
-                os.write(
-                    write_fd,
-                    (rewrite_granian_line(line, use_color=use_color) + "\n").encode(
-                        "utf-8"
-                    ),
-                )
-        if buffer:
-            os.write(
-                write_fd,
-                rewrite_granian_line(buffer, use_color=use_color).encode("utf-8"),
-            )
+            output = rewriter.feed(chunk)
+            if output and not _write_all(write_fd, output):
+                return
+        tail = rewriter.flush()
+        if tail:
+            _write_all(write_fd, tail)
 
     thread = threading.Thread(target=_reader, daemon=True)
     thread.start()
     return thread
 
 
+def stdout_supports_color() -> bool:
+    # isatty() rather than os.isatty(fileno()): captured streams have no fd.
+    return sys.stdout.isatty() and os.getenv("NO_COLOR") is None
+
+
+def should_passthrough_logs(dev: bool, raw_logs: bool) -> bool:
+    """Whether granian output can go straight to the terminal.
+
+    Workers run with the nestipy logging config, so their lines already carry
+    the ``[NESTIPY]`` prefix; the rewrite pipe is only kept to colorize them
+    on a dev TTY, unless raw logs are requested.
+    """
+    return raw_logs or not dev or not stdout_supports_color()
+
+
 @contextlib.contextmanager
-def granian_log_prefixer():
+def granian_log_prefixer(
+    passthrough: bool = False,
+    observer: Callable[[bytes], None] | None = None,
+    rewrite: bool = True,
+):
+    """Route granian's stdout/stderr through the rewrite threads.
+
+    ``observer`` receives every stdout line, which is where access logs go;
+    ``rewrite=False`` forwards lines byte for byte.
+    """
+    if passthrough:
+        # Leave stdout/stderr untouched: workers write to the original fds and
+        # the master spends nothing on log forwarding.
+        yield
+        return
     stdout_fd = sys.stdout.fileno()
     stderr_fd = sys.stderr.fileno()
-    use_color = (
-        os.isatty(stdout_fd) and os.getenv("NO_COLOR") is None
-    )
+    use_color = stdout_supports_color()
     orig_stdout_fd = os.dup(stdout_fd)
     orig_stderr_fd = os.dup(stderr_fd)
     stdout_r, stdout_w = os.pipe()
@@ -211,20 +557,24 @@ def granian_log_prefixer():
     os.close(stdout_w)
     os.close(stderr_w)
 
-    stdout_thread = _start_rewrite_thread(stdout_r, orig_stdout_fd, use_color)
-    stderr_thread = _start_rewrite_thread(stderr_r, orig_stderr_fd, use_color)
+    stdout_thread = _start_rewrite_thread(
+        stdout_r, orig_stdout_fd, use_color, observer=observer, rewrite=rewrite
+    )
+    stderr_thread = _start_rewrite_thread(
+        stderr_r, orig_stderr_fd, use_color, rewrite=rewrite
+    )
 
     try:
         yield
     finally:
         os.dup2(orig_stdout_fd, stdout_fd)
         os.dup2(orig_stderr_fd, stderr_fd)
+        stdout_thread.join(timeout=0.2)
+        stderr_thread.join(timeout=0.2)
         os.close(orig_stdout_fd)
         os.close(orig_stderr_fd)
         os.close(stdout_r)
         os.close(stderr_r)
-        stdout_thread.join(timeout=0.2)
-        stderr_thread.join(timeout=0.2)
 
 
 def write_logging_config(config: dict[str, Any]) -> Path:
@@ -258,13 +608,20 @@ def build_granian_options(cfg: GranianStartConfig) -> dict[str, Any]:
     # print("[NESTIPY] INFO [RELOAD] ignore_dirs:", reload_ignore_dirs)
     # print("[NESTIPY] INFO [RELOAD] ignore_patterns:", reload_ignore_patterns)
     options: dict[str, Any] = {
-        "interface": "asgi",
+        "interface": cfg.interface,
         "address": cfg.host,
+        "host": cfg.host,
         "port": cfg.port,
         "workers": cfg.workers,
         "loop": cfg.loop,
         "http": cfg.http,
-        "log_config": str(cfg.log_config_path),
+        "log_config": str(cfg.log_config_path) if cfg.log_config_path else None,
+        "log_dictconfig": cfg.log_dictconfig,
+        "log_access_format": (
+            (UDS_ACCESS_LOG_FORMAT if cfg.uds else ACCESS_LOG_FORMAT)
+            if cfg.log_dictconfig
+            else None
+        ),
         "reload_paths": reload_paths,
         "reload_ignore_dirs": reload_ignore_dirs,
         "reload_ignore_patterns": reload_ignore_patterns,
@@ -280,7 +637,26 @@ def build_granian_options(cfg: GranianStartConfig) -> dict[str, Any]:
         "ssl_certfile": cfg.ssl_cert_file,
         "ssl_certificate": cfg.ssl_cert_file,
         "reload": cfg.dev,
+        "pid_file": cfg.pid_file,
+        "uds": cfg.uds,
+        "uds_permissions": cfg.uds_permissions,
     }
+    if cfg.recycle_policy is not None:
+        options.update(granian_rss_options(cfg.recycle_policy))
+    if cfg.static_mounts:
+        options["static_path_route"] = [mount.route for mount in cfg.static_mounts]
+        options["static_path_mount"] = [mount.directory for mount in cfg.static_mounts]
+        options["static_path_expires"] = cfg.static_expires
+    for field in fields(cfg.tuning):
+        value = getattr(cfg.tuning, field.name)
+        if value is None:
+            continue
+        for prefix, key in _HTTP_SETTINGS.items():
+            if field.name.startswith(prefix):
+                options.setdefault(key, {})[field.name[len(prefix) :]] = value
+                break
+        else:
+            options[field.name] = value
     return {key: value for key, value in options.items() if value is not None}
 
 
@@ -316,8 +692,264 @@ def resolve_granian_init_args(
     return args, kwargs
 
 
+def _http_settings_classes() -> dict[str, type]:
+    try:
+        from granian.http import HTTP1Settings, HTTP2Settings
+    except ImportError:
+        return {}
+    return {"http1_settings": HTTP1Settings, "http2_settings": HTTP2Settings}
+
+
+def build_http_settings(kwargs: dict[str, Any]) -> list[str]:
+    """Turn ``http1_settings``/``http2_settings`` dicts into granian objects.
+
+    Fields the installed granian does not know are dropped; their names are
+    returned, prefixed like the :class:`GranianTuning` fields.
+    """
+    dropped: list[str] = []
+    classes = _http_settings_classes()
+    for prefix, key in _HTTP_SETTINGS.items():
+        values = kwargs.get(key)
+        if not isinstance(values, dict):
+            continue
+        settings_class = classes.get(key)
+        known = {field.name for field in fields(settings_class)} if settings_class else set()
+        dropped.extend(prefix + name for name in values if name not in known)
+        if settings_class is None:
+            del kwargs[key]
+            continue
+        kwargs[key] = settings_class(**{k: v for k, v in values.items() if k in known})
+    return dropped
+
+
+def explain_granian_config(
+    cfg: GranianStartConfig, signature: inspect.Signature
+) -> list[tuple[str, str, str]]:
+    """``(setting, value, source)`` rows for the server granian will run.
+
+    ``source`` is ``nestipy start`` for values we pass, ``granian default``
+    for performance settings left alone, and ``ignored`` for options the
+    installed granian does not accept.
+    """
+    options = build_granian_options(cfg)
+    params = signature.parameters
+    rows: list[tuple[str, str, str]] = []
+    for key, value in options.items():
+        if key == "log_dictconfig":
+            value = "(nestipy logging config)"
+        if key in params and key not in _HTTP_SETTINGS.values():
+            rows.append((key, str(value), "nestipy start"))
+        elif key in _TUNING_ARGS:
+            rows.append((key, str(value), _IGNORED))
+    for name in _TUNING_ARGS:
+        if name in options or name not in params:
+            continue
+        default = params[name].default
+        if name == "backpressure" and default is None and "backlog" in params:
+            backlog = options.get("backlog", params["backlog"].default)
+            default = f"{max(1, backlog // max(1, cfg.workers))} (backlog / workers)"
+        rows.append((name, str(getattr(default, "value", default)), "granian default"))
+    classes = _http_settings_classes()
+    for prefix, key in _HTTP_SETTINGS.items():
+        chosen = options.get(key, {})
+        settings_class = classes.get(key) if key in params else None
+        known = (
+            {field.name: field.default for field in fields(settings_class)}
+            if settings_class
+            else {}
+        )
+        for name, default in known.items():
+            if name in chosen:
+                rows.append((prefix + name, str(chosen[name]), "nestipy start"))
+            else:
+                rows.append((prefix + name, str(default), "granian default"))
+        rows.extend(
+            (prefix + name, str(value), _IGNORED)
+            for name, value in chosen.items()
+            if name not in known
+        )
+    return rows
+
+
+def load_app(
+    target: str,
+    wd: Any = None,
+    factory: bool = False,
+    interface: InterfaceChoice = "asgi",
+    assets_manifest: Path | None = None,
+) -> Any:
+    """Granian target loader wrapping the app for ``nestipy start`` features.
+
+    Built assets are answered by :class:`PrecompressedAssets` in front of the
+    app, and an ASGI app served with ``--interface rsgi`` is wrapped in
+    :class:`RSGIAdapter` (native RSGI apps are returned unchanged). With
+    ``--preload`` the module is already in ``sys.modules`` and is not
+    imported again.
+    """
+    from granian._internal import load_target
+
+    app = load_target(target, wd=wd, factory=factory)
+    if assets_manifest is not None:
+        from .assets import PrecompressedAssets
+
+        app = PrecompressedAssets(app, assets_manifest)
+    if interface == "rsgi" and not hasattr(app, "__rsgi__"):
+        from .rsgi import RSGIAdapter
+
+        app = RSGIAdapter(app)
+    return app
+
+
+def app_loader_server(base: type) -> type:
+    """Subclass granian's server class to load targets with ``app_loader``."""
+
+    class AppLoaderServer(base):  # type: ignore[misc, valid-type]
+        def __init__(self, *args: Any, app_loader: Callable[..., Any], **kwargs: Any):
+            super().__init__(*args, **kwargs)
+            self.app_loader = app_loader
+
+        def serve(self, spawn_target=None, target_loader=None, wrap_loader: bool = True):
+            if target_loader is None:
+                target_loader = functools.partial(
+                    self.app_loader, wd=self.working_dir, factory=self.factory
+                )
+            return super().serve(spawn_target, target_loader, wrap_loader)
+
+    return AppLoaderServer
+
+
+# Granian minor versions whose private server hooks (worker spawn/respawn,
+# the RSS signal, the shared socket) the wrappers below were verified against.
+GRANIAN_VERIFIED_MINORS = ("2.7", "2.8")
+
+
+class UnsupportedGranianError(RuntimeError):
+    """Raised when options rely on granian internals of an unverified version."""
+
+
+def check_granian_internals(options: list[str], version: str | None = None) -> None:
+    if not options:
+        return
+    if version is None:
+        from granian import __version__ as version
+    if ".".join(version.split(".")[:2]) in GRANIAN_VERIFIED_MINORS:
+        return
+    verified = ", ".join(f"{minor}.x" for minor in GRANIAN_VERIFIED_MINORS)
+    raise UnsupportedGranianError(
+        f"{', '.join(options)} hook into granian internals verified with granian "
+        f"{verified}, but granian {version} is installed. Install a verified "
+        "granian or start without these options."
+    )
+
+
 def create_granian_instance(cfg: GranianStartConfig):
     from granian import Granian
 
+    check_granian_internals(
+        [
+            option
+            for option, used in (
+                ("--uds", cfg.uds is not None),
+                ("--rolling-restart", cfg.ready_timeout is not None),
+                (
+                    "--max-requests",
+                    cfg.recycle_policy is not None and cfg.recycle_policy.max_requests > 0,
+                ),
+                ("--workers-max", cfg.scale_policy is not None),
+            )
+            if used
+        ]
+    )
     args, kwargs = resolve_granian_init_args(cfg, inspect.signature(Granian))
-    return Granian(*args, **kwargs)
+    build_http_settings(kwargs)
+    server_class = Granian
+    if cfg.interface == "rsgi" or cfg.assets_manifest is not None:
+        server_class = app_loader_server(server_class)
+        kwargs["app_loader"] = functools.partial(
+            load_app, interface=cfg.interface, assets_manifest=cfg.assets_manifest
+        )
+    if cfg.uds is not None and "uds" in kwargs:
+        server_class = uds_server(server_class)
+        kwargs["uds_owner"] = cfg.uds_owner
+    if cfg.ready_timeout is not None:
+        server_class = rolling_server(server_class)
+        kwargs["ready_timeout"] = cfg.ready_timeout
+    if cfg.recycle_policy is not None and cfg.recycle_policy.max_requests:
+        server_class = recycling_server(server_class)
+        kwargs["recycle_policy"] = cfg.recycle_policy
+    if cfg.scale_policy is not None:
+        server_class = autoscaling_server(server_class)
+        kwargs["scale_policy"] = cfg.scale_policy
+    return server_class(*args, **kwargs)
+
+
+def rsgi_supported() -> bool:
+    return importlib.util.find_spec("granian.rsgi") is not None
+
+
+def preload_supported() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def preload_application(app_path: str) -> Any:
+    """Import the app in the master so forked workers share it copy-on-write.
+
+    Granian's own loader is used, so workers find the very same module in
+    ``sys.modules`` instead of importing it again. ``gc.freeze()`` then moves
+    everything imported so far out of the collector's reach; otherwise the
+    first collection in each worker would touch, and un-share, those pages.
+    """
+    from granian._internal import load_target
+
+    multiprocessing.set_start_method("fork", force=True)
+    app = load_target(app_path)
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def worker_memory(pids: list[int]) -> list[tuple[int, int, int]]:
+    """``(pid, shared_bytes, private_bytes)`` for each pid with smaps data."""
+    report = []
+    for pid in pids:
+        rollup = procfs.memory_rollup(pid)
+        if rollup is None:
+            continue
+        shared = rollup.get("Shared_Clean", 0) + rollup.get("Shared_Dirty", 0)
+        private = rollup.get("Private_Clean", 0) + rollup.get("Private_Dirty", 0)
+        report.append((pid, shared, private))
+    return report
+
+
+def report_worker_memory(
+    expected: int,
+    emit: Callable[[str], None],
+    exclude: frozenset[int] = frozenset(),
+    timeout: float = 30.0,
+    settle: float = 1.0,
+) -> threading.Thread:
+    """Once ``expected`` workers run, emit their shared/private memory split."""
+
+    def _report() -> None:
+        deadline = time.monotonic() + timeout
+        pids: list[int] = []
+        while time.monotonic() < deadline:
+            pids = [pid for pid in procfs.child_pids(os.getpid()) if pid not in exclude]
+            if len(pids) >= expected:
+                break
+            time.sleep(0.25)
+        # Let workers finish their own startup before sampling.
+        time.sleep(settle)
+        rows = worker_memory(pids)
+        if not rows:
+            return
+        mib = 1024 * 1024
+        for index, (pid, shared, private) in enumerate(rows, start=1):
+            emit(
+                f"[PRELOAD] worker {index} (pid {pid}): "
+                f"{shared / mib:.1f} MiB shared, {private / mib:.1f} MiB private"
+            )
+
+    thread = threading.Thread(target=_report, name="nestipy-preload-report", daemon=True)
+    thread.start()
+    return thread
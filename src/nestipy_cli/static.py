@@ -0,0 +1,74 @@
+"""Let granian serve ``public/`` and the built Inertia ``dist/`` from Rust.
+
+Scaffolds call ``app.use_static_assets(public)``, which answers every asset
+request on a Python worker's event loop. Granian can serve directories under
+URL prefixes itself, so ``nestipy start`` maps both directories to granian's
+static routes and those requests never reach the app.
+
+Granian cannot mount a directory at ``/`` without shadowing every route, and
+it answers missing files under a static route with 404 instead of falling
+through to the app. A directory served at the root is therefore mounted one
+subdirectory at a time (``public/css`` at ``/css``), and top-level files such
+as ``favicon.ico`` stay with the app. Vite's server bundle (``dist/ssr``) and
+hidden directories (``dist/.vite``) are never exposed.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+PUBLIC_DIR = "public"
+DIST_DIR = "dist"
+_PRIVATE_DIRS = frozenset({"ssr"})
+
+
+@dataclass(frozen=True)
+class StaticMount:
+    route: str
+    directory: Path
+
+
+def normalize_prefix(prefix: str) -> str:
+    """``static/`` -> ``/static``; the root is ``/``."""
+    return "/" + prefix.strip("/")
+
+
+def directory_mounts(directory: Path, prefix: str) -> list[StaticMount]:
+    """Mounts that serve ``directory`` under the URL ``prefix``."""
+    if not directory.is_dir():
+        return []
+    prefix = normalize_prefix(prefix)
+    if prefix != "/":
+        return [StaticMount(prefix, directory.resolve())]
+    return [
+        StaticMount(f"/{child.name}", child.resolve())
+        for child in sorted(directory.iterdir())
+        if child.is_dir()
+        and not child.name.startswith(".")
+        and child.name not in _PRIVATE_DIRS
+    ]
+
+
+def detect_static_mounts(
+    project_root: Path,
+    web_dir: str | None,
+    public_prefix: str = "/",
+    dist_prefix: str = "/",
+) -> tuple[list[StaticMount], list[str]]:
+    """Mounts for ``public/`` and ``<web_dir>/dist``, and skipped duplicates.
+
+    On a route clash the ``public/`` mount wins, matching the order in which
+    the app would have resolved the file.
+    """
+    candidates = directory_mounts(project_root / PUBLIC_DIR, public_prefix)
+    if web_dir:
+        candidates += directory_mounts(project_root / web_dir / DIST_DIR, dist_prefix)
+    mounts: list[StaticMount] = []
+    skipped: list[str] = []
+    routes: set[str] = set()
+    for mount in candidates:
+        if mount.route in routes:
+            skipped.append(f"{mount.directory} ({mount.route} is already mounted)")
+            continue
+        routes.add(mount.route)
+        mounts.append(mount)
+    return mounts, skipped
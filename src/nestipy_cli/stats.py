@@ -0,0 +1,304 @@
+"""Per-route request statistics built from the granian access stream.
+
+The master process already reads every access line on its way to the
+terminal (see :func:`nestipy_cli.server.granian_log_prefixer`).
+:class:`RouteStats` parses those lines and keeps, per method and templated
+path, request counts by status class and a log-linear latency histogram.
+Memory stays bounded: histograms have a fixed number of buckets per power
+of two and routes beyond ``max_routes`` are folded into one ``<other>`` row.
+"""
+
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+OTHER_ROUTE = "<other>"
+ROUTE_STATS_FILE = "route-stats.json"
+
+_ANSI_RE = re.compile(rb"\x1b\[[0-9;]*m")
+_ACCESS_REQUEST_RE = re.compile(
+    rb'"(?P<method>[A-Z]+) (?P<path>\S+) [^"]*"\s+(?P<status>\d{3})\s+'
+    rb"(?:-\s+)?(?P<duration>[0-9.]+)"
+)
+_ID_SEGMENT_RE = re.compile(
+    r"\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{12,}"
+)
+
+
+class LatencyHistogram:
+    """HDR-style latency histogram with bounded memory.
+
+    Durations are stored in microseconds; below ``2 ** precision_bits`` every
+    value has its own bucket, above it each power of two is split into
+    ``2 ** (precision_bits - 1)`` buckets, so the relative error of any
+    percentile stays under ``2 ** (1 - precision_bits)`` (about 3% by default).
+    """
+
+    def __init__(self, precision_bits: int = 6) -> None:
+        self.precision_bits = precision_bits
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def bucket(self, value_us: int) -> int:
+        """Return the lower bound of the bucket holding ``value_us``."""
+        shift = value_us.bit_length() - self.precision_bits
+        if shift <= 0:
+            return value_us
+        return (value_us >> shift) << shift
+
+    def bucket_upper(self, lower: int) -> int:
+        shift = lower.bit_length() - self.precision_bits
+        if shift <= 0:
+            return lower
+        return lower + (1 << shift) - 1
+
+    def record(self, duration_ms: float) -> None:
+        value = max(int(duration_ms * 1000), 0)
+        key = self.bucket(value)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total_us += value
+        if value > self.max_us:
+            self.max_us = value
+
+    def percentile(self, q: float) -> float:
+        """Return the ``q``-th percentile (0-100) in milliseconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(q / 100 * self.count)))
+        seen = 0
+        for lower in sorted(self.counts):
+            seen += self.counts[lower]
+            if seen >= rank:
+                return min(self.bucket_upper(lower), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def count_le(self, bound_ms: float) -> int:
+        """Number of samples whose bucket lies entirely at or below ``bound_ms``."""
+        bound = bound_ms * 1000
+        return sum(
+            count
+            for lower, count in self.counts.items()
+            if self.bucket_upper(lower) <= bound
+        )
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+
+class RouteStat:
+    __slots__ = ("count", "statuses", "latency")
+
+    def __init__(self) -> None:
+        self.count = 0
+        # Indexed by ``status // 100``; index 0 collects anything out of range.
+        self.statuses = [0] * 6
+        self.latency = LatencyHistogram()
+
+
+@functools.lru_cache(maxsize=4096)
+def template_path(path: str) -> str:
+    """Collapse identifier-like path segments, e.g. ``/users/42`` -> ``/users/:id``."""
+    path = path.split("?", 1)[0]
+    return "/".join(
+        ":id" if segment and _ID_SEGMENT_RE.fullmatch(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+def parse_access_line(line: bytes) -> Optional[tuple[str, str, int, float]]:
+    """Extract ``(method, path, status, duration_ms)`` from one output line.
+
+    Understands granian's own access format, the ``[NESTIPY]`` rewrite of it
+    (colored or not) and ``--log-format json`` records.
+    """
+    if line.startswith(b"{"):
+        if b'"status"' not in line:
+            return None
+        try:
+            record = json.loads(line)
+            return (
+                record["method"],
+                record["path"],
+                int(record["status"]),
+                float(record["duration_ms"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+    if b' - "' not in line:
+        return None
+    if b"\x1b[" in line:
+        line = _ANSI_RE.sub(b"", line)
+    match = _ACCESS_REQUEST_RE.search(line)
+    if match is None:
+        return None
+    method, path, status, duration = match.groups()
+    return (
+        method.decode("ascii"),
+        path.decode("utf-8", errors="replace"),
+        int(status),
+        float(duration),
+    )
+
+
+class RouteStats:
+    """Rolling per-route counters and latency histograms since start-up."""
+
+    def __init__(self, max_routes: int = 200) -> None:
+        self.max_routes = max_routes
+        self.routes: dict[tuple[str, str], RouteStat] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, path: str, status: int, duration_ms: float) -> None:
+        key = (method, template_path(path))
+        with self._lock:
+            stat = self.routes.get(key)
+            if stat is None:
+                if len(self.routes) >= self.max_routes:
+                    key = (method, OTHER_ROUTE)
+                    stat = self.routes.get(key)
+                if stat is None:
+                    stat = self.routes[key] = RouteStat()
+            stat.count += 1
+            stat.statuses[status // 100 if 0 <= status < 600 else 0] += 1
+            stat.latency.record(duration_ms)
+
+    def observe_line(self, line: bytes) -> None:
+        parsed = parse_access_line(line)
+        if parsed is not None:
+            self.observe(*parsed)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            routes = [
+                {
+                    "method": method,
+                    "route": route,
+                    "count": stat.count,
+                    "status": {
+                        f"{klass}xx": stat.statuses[klass] for klass in range(1, 6)
+                    },
+                    "p50_ms": stat.latency.percentile(50),
+                    "p95_ms": stat.latency.percentile(95),
+                    "p99_ms": stat.latency.percentile(99),
+                    "max_ms": stat.latency.max_us / 1000,
+                    "mean_ms": round(stat.latency.mean_ms, 3),
+                }
+                for (method, route), stat in self.routes.items()
+            ]
+        routes.sort(key=lambda item: item["count"], reverse=True)
+        return {
+            "started": self.started,
+            "generated": time.time(),
+            "routes": routes,
+        }
+
+    def export(self, bounds_ms: tuple[float, ...]) -> list[dict[str, Any]]:
+        """Raw per-route data with cumulative counts at ``bounds_ms``."""
+        with self._lock:
+            return [
+                {
+                    "method": method,
+                    "route": route,
+                    "count": stat.count,
+                    "statuses": list(stat.statuses),
+                    "buckets": [stat.latency.count_le(bound) for bound in bounds_ms],
+                    "sum_ms": stat.latency.total_us / 1000,
+                }
+                for (method, route), stat in self.routes.items()
+            ]
+
+
+def format_route_table(snapshot: dict[str, Any], limit: int = 20) -> str:
+    """Render the busiest routes of a snapshot as a plain-text table."""
+    header = ("METHOD", "ROUTE", "COUNT", "2xx", "3xx", "4xx", "5xx", "P50", "P95", "P99", "MAX")
+    rows = [
+        (
+            item["method"],
+            item["route"],
+            str(item["count"]),
+            *(str(item["status"][f"{klass}xx"]) for klass in range(2, 6)),
+            *(f"{item[key]:.1f}" for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")),
+        )
+        for item in snapshot["routes"][:limit]
+    ]
+    widths = [max(len(row[index]) for row in [header, *rows]) for index in range(len(header))]
+    lines = [
+        "  ".join(
+            cell.ljust(width) if index < 2 else cell.rjust(width)
+            for index, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in [header, *rows]
+    ]
+    return "\n".join(lines)
+
+
+def write_route_snapshot(snapshot: dict[str, Any], path: Path) -> None:
+    """Atomically replace ``path`` with the JSON snapshot."""
+    staging = path.with_name(f".{path.name}.{os.getpid()}")
+    staging.write_text(json.dumps(snapshot, indent=2))
+    os.replace(staging, path)
+
+
+class RouteStatsReporter(threading.Thread):
+    """Report :class:`RouteStats` every ``interval`` seconds until stopped.
+
+    With ``output`` set (production) the snapshot is written as JSON to that
+    file; otherwise (dev) a summary table is printed to ``stream``.
+    """
+
+    def __init__(
+        self,
+        stats: RouteStats,
+        interval: float = 30.0,
+        output: Optional[Path] = None,
+        stream: Optional[TextIO] = None,
+    ) -> None:
+        super().__init__(name="nestipy-route-stats", daemon=True)
+        self.stats = stats
+        self.interval = interval
+        self.output = output
+        self.stream = stream
+        self._stop_event = threading.Event()
+        self._last_count = -1
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.report()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=1.0)
+        self.report()
+
+    def report(self) -> None:
+        snapshot = self.stats.snapshot()
+        total = sum(item["count"] for item in snapshot["routes"])
+        if self.output is not None:
+            try:
+                write_route_snapshot(snapshot, self.output)
+            except OSError:
+                pass
+            return
+        # Dev: only print when traffic arrived since the last table.
+        if total == self._last_count or not total:
+            return
+        self._last_count = total
+        stream = self.stream or sys.stdout
+        stream.write(
+            f"[NESTIPY] INFO Route stats ({total} requests, latency in ms)\n"
+            f"{format_route_table(snapshot)}\n"
+        )
+        stream.flush()
@@ -0,0 +1,76 @@
+"""Server settings sweep for ``nestipy tune``.
+
+Every combination of the candidate workers, event loops, HTTP modes,
+interfaces and runtime thread counts is served in turn and loaded the same
+way (:mod:`nestipy_cli.bench`). Runs that meet the latency objective
+(p99 at or under the SLO, no errors) rank above those that do not, and by
+throughput within each group. The winner's settings are written to
+``[tool.nestipy.start]``, where ``nestipy start`` picks them up.
+"""
+
+import importlib.util
+import itertools
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .bench import BenchResult
+from .resources import auto_worker_count, detect_limits
+
+# Loops granian can use besides asyncio, by the module that provides them.
+_OPTIONAL_LOOPS = ("uvloop", "rloop")
+
+
+@dataclass(frozen=True)
+class TuneRun:
+    settings: dict[str, Any]
+    result: BenchResult
+
+
+def installed_loops() -> list[str]:
+    return ["asyncio"] + [
+        loop for loop in _OPTIONAL_LOOPS if importlib.util.find_spec(loop) is not None
+    ]
+
+
+def default_workers() -> list[int]:
+    """1, half and all of the CPUs the container may use."""
+    cpus = auto_worker_count(detect_limits(), memory_per_worker=0)
+    return sorted({1, max(1, cpus // 2), cpus})
+
+
+def tune_matrix(
+    workers: list[int],
+    loops: list[str],
+    http: list[str],
+    interfaces: list[str],
+    runtime_threads: Optional[list[int]] = None,
+) -> list[dict[str, Any]]:
+    """Settings for every combination, in a stable order."""
+    matrix = []
+    for count, loop, mode, interface, threads in itertools.product(
+        workers, loops, http, interfaces, runtime_threads or [None]
+    ):
+        settings: dict[str, Any] = {
+            "workers": count,
+            "loop": loop,
+            "http": mode,
+            "interface": interface,
+        }
+        if threads is not None:
+            settings["runtime_threads"] = threads
+        matrix.append(settings)
+    return matrix
+
+
+def meets_slo(result: BenchResult, slo_p99_ms: float) -> bool:
+    return result.errors == 0 and result.p99_ms <= slo_p99_ms
+
+
+def rank_runs(runs: list[TuneRun], slo_p99_ms: float) -> list[TuneRun]:
+    return sorted(
+        runs, key=lambda run: (not meets_slo(run.result, slo_p99_ms), -run.result.rps)
+    )
+
+
+def describe(settings: dict[str, Any]) -> str:
+    return " ".join(f"{name.replace('_', '-')}={value}" for name, value in settings.items())
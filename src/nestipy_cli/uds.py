@@ -0,0 +1,91 @@
+"""Unix domain socket binding for ``nestipy start --uds``.
+
+Granian binds the socket itself and applies ``--uds-permissions``. This
+module adds what it leaves out. A socket file left behind by a master that
+was killed is removed before binding; a live one is left alone and reported.
+``--uds-owner`` hands the socket to the reverse proxy's user or group once it
+exists.
+"""
+
+import errno
+import logging
+import os
+import socket
+import stat
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger("_granian")
+
+
+class SocketInUseError(RuntimeError):
+    """Raised when the ``--uds`` path is already served by another process."""
+
+
+def parse_owner(value: str) -> tuple[int, int]:
+    """``user``, ``user:group`` or ``:group`` (names or ids) as ``(uid, gid)``.
+
+    ``-1`` leaves the corresponding id unchanged, as with :func:`os.chown`.
+    """
+    import grp
+    import pwd
+
+    user, _, group = value.partition(":")
+    uid = gid = -1
+    if user:
+        try:
+            uid = int(user) if user.isdigit() else pwd.getpwnam(user).pw_uid
+        except KeyError:
+            raise ValueError(f"unknown user {user!r}") from None
+    if group:
+        try:
+            gid = int(group) if group.isdigit() else grp.getgrnam(group).gr_gid
+        except KeyError:
+            raise ValueError(f"unknown group {group!r}") from None
+    if uid == gid == -1:
+        raise ValueError("expected USER, USER:GROUP or :GROUP")
+    return uid, gid
+
+
+def remove_stale_socket(path: Path) -> bool:
+    """Remove a socket file at ``path`` that nothing listens on.
+
+    Returns whether a file was removed. Raises :class:`SocketInUseError` if a
+    process accepts connections on it and :class:`FileExistsError` if
+    ``path`` is not a socket.
+    """
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        return False
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "not a socket", str(path))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            pass
+        else:
+            raise SocketInUseError(f"{path} is in use by another server")
+    path.unlink(missing_ok=True)
+    return True
+
+
+def uds_server(base: type) -> type:
+    """Subclass granian's server to clean up and chown its Unix socket."""
+
+    class UdsServer(base):  # type: ignore[misc, valid-type]
+        def __init__(
+            self, *args: Any, uds_owner: Optional[tuple[int, int]] = None, **kwargs: Any
+        ) -> None:
+            super().__init__(*args, **kwargs)
+            self.uds_owner = uds_owner
+
+        def _init_shared_socket(self):
+            if remove_stale_socket(self.bind_uds):
+                logger.info(f"Removed stale socket {self.bind_uds}")
+            super()._init_shared_socket()
+            if self.uds_owner is not None:
+                os.chown(self.bind_uds, *self.uds_owner)
+
+    return UdsServer
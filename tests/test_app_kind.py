@@ -0,0 +1,84 @@
+import json
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli import app_kind  # noqa: E402
+from nestipy_cli.app_kind import (  # noqa: E402
+    APP_KIND_CACHE,
+    AppKindError,
+    detect_app_kind,
+    detect_app_kind_static,
+)
+
+FAKE_NESTIPY_CORE = """
+class NestipyMicroservice:
+    pass
+
+
+class NestipyApplication(NestipyMicroservice):
+    pass
+"""
+
+
+class TestAppKind(unittest.TestCase):
+    def test_static_detection(self) -> None:
+        cases = {
+            "app = NestipyFactory.create(AppModule)": "application",
+            "app = NestipyFactory[FastApiApplication].create(AppModule)": "application",
+            "app = core.NestipyFactory.create_microservice(AppModule, [])": "microservice",
+            "app: NestipyMicroservice = build()": "microservice",
+            "app = build()": None,
+            "app = NestipyFactory.create(A)\napp = NestipyFactory.create_microservice(A)": None,
+            "server = NestipyFactory.create(AppModule)": None,
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                self.assertEqual(detect_app_kind_static(source, "app"), expected)
+
+    def test_probe_result_is_cached_by_content_hash(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "nestipy").mkdir()
+            (root / "nestipy" / "__init__.py").write_text("")
+            (root / "nestipy" / "core.py").write_text(FAKE_NESTIPY_CORE)
+            entry = root / "main.py"
+            entry.write_text(
+                textwrap.dedent(
+                    """
+                    from nestipy.core import NestipyMicroservice
+
+                    def build():
+                        return NestipyMicroservice()
+
+                    app = build()
+                    """
+                )
+            )
+            self.assertEqual(detect_app_kind(root, "main", "app"), "microservice")
+            cache = json.loads((root / APP_KIND_CACHE).read_text())
+            self.assertEqual(cache["main:app"]["kind"], "microservice")
+
+            with mock.patch.object(app_kind, "probe_app_kind") as probe:
+                self.assertEqual(detect_app_kind(root, "main", "app"), "microservice")
+                probe.assert_not_called()
+                entry.write_text(entry.read_text() + "\n# changed\n")
+                probe.return_value = "application"
+                self.assertEqual(detect_app_kind(root, "main", "app"), "application")
+                probe.assert_called_once()
+
+    def test_probe_failure_raises(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "main.py").write_text("raise RuntimeError('boom')\napp = None\n")
+            with self.assertRaises(AppKindError) as caught:
+                detect_app_kind(Path(tmp), "main", "app")
+            self.assertIn("boom", str(caught.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
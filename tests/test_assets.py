@@ -0,0 +1,178 @@
+import asyncio
+import gzip
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.assets import (  # noqa: E402
+    MANIFEST_FILE,
+    AssetSource,
+    PrecompressedAssets,
+    build_assets,
+    hashed_name,
+)
+
+CSS = b"body { color: #333; }\n" * 100
+
+
+def build(root: Path) -> dict:
+    public = root / "public"
+    (public / "css").mkdir(parents=True)
+    (public / "css" / "site.css").write_bytes(CSS)
+    (public / "robots.txt").write_bytes(b"User-agent: *\n")
+    (public / ".env").write_bytes(b"SECRET=1")
+    dist = root / "inertia" / "dist"
+    (dist / "assets").mkdir(parents=True)
+    (dist / "assets" / "app-abc.js").write_bytes(b"console.log(1);\n" * 100)
+    (dist / "ssr").mkdir()
+    (dist / "ssr" / "ssr.js").write_bytes(b"server only")
+    sources = [
+        AssetSource("public", public),
+        AssetSource("dist", dist, fingerprinted="assets"),
+    ]
+    return build_assets(sources, root / "out", jobs=1, use_brotli=False)
+
+
+async def _not_found(scope, receive, send):
+    await send({"type": "http.response.start", "status": 404, "headers": []})
+    await send({"type": "http.response.body", "body": b"app"})
+
+
+def request(app, path, headers=(), method="GET", extensions=None) -> list[dict]:
+    sent: list[dict] = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": list(headers),
+        "extensions": extensions or {},
+    }
+    asyncio.run(app(scope, None, send))
+    return sent
+
+
+class TestBuildAssets(unittest.TestCase):
+    def test_hashed_name_keeps_the_extension(self) -> None:
+        self.assertEqual(hashed_name("css/site.css", "abc"), "css/site.abc.css")
+        self.assertEqual(hashed_name("LICENSE", "abc"), "LICENSE.abc")
+        self.assertEqual(hashed_name("v1.2/LICENSE", "abc"), "v1.2/LICENSE.abc")
+
+    def test_manifest_maps_urls_to_hashed_and_compressed_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            manifest = build(root)
+            files = manifest["files"]
+            self.assertEqual(
+                sorted(files), ["/assets/app-abc.js", "/css/site.css", "/robots.txt"]
+            )
+            css = files["/css/site.css"]
+            self.assertRegex(css["url"], r"^/css/site\.[0-9a-f]{12}\.css$")
+            self.assertEqual(css["type"], "text/css")
+            self.assertEqual(list(css["encodings"]), ["gzip"])
+            built = root / "out" / css["file"]
+            self.assertEqual(built.read_bytes(), CSS)
+            self.assertEqual(gzip.decompress(Path(f"{built}.gz").read_bytes()), CSS)
+            # Too small to be worth compressing.
+            self.assertEqual(files["/robots.txt"]["encodings"], {})
+            # Vite already fingerprinted it: kept under its own name.
+            script = files["/assets/app-abc.js"]
+            self.assertEqual(script["url"], "/assets/app-abc.js")
+            self.assertTrue(script["fingerprinted"])
+            written = json.loads((root / "out" / MANIFEST_FILE).read_text())
+            self.assertEqual(written, manifest)
+
+    def test_refuses_to_replace_a_foreign_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "out"
+            out.mkdir()
+            (out / "keep.txt").write_text("mine")
+            with self.assertRaises(FileExistsError):
+                build_assets([], out)
+            self.assertTrue((out / "keep.txt").exists())
+
+
+class TestPrecompressedAssets(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.manifest = build(self.root)
+        self.app = PrecompressedAssets(_not_found, self.root / "out" / MANIFEST_FILE)
+
+    def test_gzip_variant_with_revalidation_on_the_logical_url(self) -> None:
+        sent = request(self.app, "/css/site.css", [(b"accept-encoding", b"br, gzip")])
+        headers = dict(sent[0]["headers"])
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertEqual(headers[b"content-encoding"], b"gzip")
+        self.assertEqual(headers[b"vary"], b"accept-encoding")
+        self.assertIn(b"must-revalidate", headers[b"cache-control"])
+        self.assertEqual(gzip.decompress(sent[1]["body"]), CSS)
+
+    def test_hashed_url_is_immutable_and_sent_with_pathsend(self) -> None:
+        entry = self.manifest["files"]["/css/site.css"]
+        sent = request(
+            self.app,
+            entry["url"],
+            [(b"accept-encoding", b"gzip;q=0")],
+            extensions={"http.response.pathsend": {}},
+        )
+        headers = dict(sent[0]["headers"])
+        self.assertIn(b"immutable", headers[b"cache-control"])
+        self.assertNotIn(b"content-encoding", headers)
+        self.assertEqual(headers[b"content-length"], str(len(CSS)).encode())
+        self.assertEqual(
+            sent[1],
+            {"type": "http.response.pathsend", "path": str(self.root / "out" / entry["file"])},
+        )
+
+    def test_matching_etag_answers_304(self) -> None:
+        etag = f'"{self.manifest["files"]["/robots.txt"]["etag"]}"'.encode()
+        sent = request(self.app, "/robots.txt", [(b"if-none-match", etag)])
+        self.assertEqual(sent[0]["status"], 304)
+        self.assertEqual(sent[1]["body"], b"")
+
+    def test_each_content_coding_has_its_own_etag(self) -> None:
+        digest = self.manifest["files"]["/css/site.css"]["etag"]
+        etags = {}
+        for accept in (b"identity", b"gzip", b"br, gzip"):
+            sent = request(self.app, "/css/site.css", [(b"accept-encoding", accept)])
+            headers = dict(sent[0]["headers"])
+            coding = headers.get(b"content-encoding", b"identity")
+            etags[coding] = headers[b"etag"]
+        self.assertEqual(etags[b"identity"], f'"{digest}"'.encode())
+        self.assertEqual(etags[b"gzip"], f'"{digest}-gz"'.encode())
+        if b"br" in etags:  # brotli is optional
+            self.assertEqual(etags[b"br"], f'"{digest}-br"'.encode())
+        self.assertEqual(len(set(etags.values())), len(etags))
+
+        # A validator for one coding does not revalidate another.
+        gzip_only = [(b"accept-encoding", b"gzip")]
+        sent = request(
+            self.app, "/css/site.css", [(b"if-none-match", etags[b"identity"]), *gzip_only]
+        )
+        self.assertEqual(sent[0]["status"], 200)
+        sent = request(
+            self.app,
+            "/css/site.css",
+            [(b"if-none-match", b'"other", W/' + etags[b"gzip"]), *gzip_only],
+        )
+        self.assertEqual(sent[0]["status"], 304)
+        self.assertEqual(dict(sent[0]["headers"])[b"etag"], etags[b"gzip"])
+
+    def test_other_requests_reach_the_app(self) -> None:
+        for path, method in (("/users", "GET"), ("/robots.txt", "POST"), ("/.env", "GET")):
+            with self.subTest(path=path, method=method):
+                sent = request(self.app, path, method=method)
+                self.assertEqual(sent[1]["body"], b"app")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli import autoscale  # noqa: E402
+from nestipy_cli.autoscale import (  # noqa: E402
+    Autoscaler,
+    CpuLoad,
+    ScalePolicy,
+    autoscaling_server,
+)
+
+POLICY = ScalePolicy(min_workers=2, max_workers=4, up_after=10.0, cooldown=60.0)
+
+
+class FakeWorker:
+    def __init__(self, idx: int) -> None:
+        self.idx = idx
+        self.started = self.terminated = False
+
+    def _id(self) -> int:
+        return 100 + self.idx
+
+    def start(self) -> None:
+        self.started = True
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+    def join(self, timeout=None) -> None:
+        pass
+
+    def is_alive(self) -> bool:
+        return False
+
+
+class FakeServer:
+    """The slice of granian's server API the autoscaler relies on."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.wrks: list[FakeWorker] = []
+        self.workers_kill_timeout = None
+        self.interrupt_children: list[int] = []
+        self.interrupt_signal = False
+        self.respawned: list[int] = []
+        self._metrics = mock.Mock()
+
+    def startup(self, spawn_target, target_loader) -> None:
+        self._spawn_workers(spawn_target, target_loader)
+
+    def _spawn_worker(self, idx, target, callback_loader) -> FakeWorker:
+        return FakeWorker(idx)
+
+    def _spawn_workers(self, spawn_target, target_loader) -> None:
+        for idx in range(self.workers):
+            wrk = self._spawn_worker(idx, spawn_target, target_loader)
+            wrk.start()
+            self.wrks.append(wrk)
+
+    def _respawn_workers(self, workers, spawn_target, target_loader, delay=0) -> None:
+        self.respawned.extend(workers)
+
+    def _stop_workers(self) -> None:
+        self.wrks.clear()
+
+
+class TestAutoscaler(unittest.TestCase):
+    def test_scales_up_only_after_sustained_pressure(self) -> None:
+        scaler = Autoscaler(POLICY, now=0.0)
+        self.assertEqual(scaler.decide(2, 0.9, now=20.0), 2)
+        self.assertEqual(scaler.decide(2, 0.9, now=25.0), 2)
+        self.assertEqual(scaler.decide(2, 0.5, now=28.0), 2)  # the streak breaks
+        self.assertEqual(scaler.decide(2, 0.9, now=30.0), 2)
+        self.assertEqual(scaler.decide(2, 0.9, now=40.0), 3)
+        # The bigger pool needs its own sustained signal.
+        self.assertEqual(scaler.decide(3, 0.9, now=42.0), 3)
+        self.assertEqual(scaler.decide(3, 0.9, now=52.0), 4)
+        self.assertEqual(scaler.decide(4, 1.0, now=100.0), 4)
+
+    def test_scales_down_after_cooldown_without_flapping(self) -> None:
+        scaler = Autoscaler(POLICY, now=0.0)
+        self.assertEqual(scaler.decide(4, 0.1, now=10.0), 4)
+        self.assertEqual(scaler.decide(4, 0.1, now=69.0), 4)
+        self.assertEqual(scaler.decide(4, 0.1, now=70.0), 3)
+        self.assertEqual(scaler.decide(3, 0.1, now=100.0), 3)
+        self.assertEqual(scaler.decide(3, 0.1, now=159.0), 3)
+        self.assertEqual(scaler.decide(3, 0.1, now=160.0), 2)
+        self.assertEqual(scaler.decide(2, 0.0, now=500.0), 2)
+
+        # 0.4 spread over one worker fewer is 0.8: shrinking would flap.
+        narrow = ScalePolicy(
+            min_workers=1, max_workers=4, scale_up_at=0.6, scale_down_at=0.5
+        )
+        scaler = Autoscaler(narrow, now=0.0)
+        scaler.decide(2, 0.4, now=1.0)
+        self.assertEqual(scaler.decide(2, 0.4, now=200.0), 2)
+        self.assertEqual(scaler.decide(3, 0.35, now=300.0), 2)
+
+    def test_cpu_load_averages_worker_deltas(self) -> None:
+        samples = iter([1.0, 2.0, None, 1.5, 3.0])
+        load = CpuLoad()
+        with mock.patch.object(
+            autoscale.procfs, "cpu_seconds", side_effect=lambda pid: next(samples)
+        ):
+            self.assertIsNone(load.sample([1, 2, 3], now=0.0))
+            self.assertEqual(load.sample([1, 2], now=2.0), (0.25 + 0.5) / 2)
+
+
+class TestAutoscalingServer(unittest.TestCase):
+    def make_server(self) -> FakeServer:
+        server = autoscaling_server(FakeServer)(workers=1, scale_policy=POLICY)
+        server.startup("target", "loader")
+        return server
+
+    def test_starts_with_min_and_scales_at_the_highest_index(self) -> None:
+        with mock.patch.object(autoscale.threading, "Thread"):
+            server = self.make_server()
+        self.assertEqual([wrk.idx for wrk in server.wrks], [0, 1])
+        for _ in range(3):
+            server.scale_up()
+        self.assertEqual([wrk.idx for wrk in server.wrks], [0, 1, 2, 3])
+        self.assertEqual(server.workers, 4)
+
+        top = server.wrks[-1]
+        for _ in range(3):
+            server.scale_down()
+        self.assertTrue(top.terminated)
+        self.assertEqual([wrk.idx for wrk in server.wrks], [0, 1])
+        self.assertEqual(server.workers, 2)
+
+    def test_respawn_skips_retired_workers(self) -> None:
+        with mock.patch.object(autoscale.threading, "Thread"):
+            server = self.make_server()
+        server.scale_up()
+        server.scale_down()
+        server._respawn_workers([1, 2], "target", "loader")
+        self.assertEqual(server.respawned, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import asyncio
+import sys
+import tempfile
+import threading
+import unittest
+from array import array
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.bench import (  # noqa: E402
+    LoadProfile,
+    _read_response,
+    baseline_mismatches,
+    bench_record,
+    find_regressions,
+    load_baseline,
+    percentile,
+    run_load,
+    save_record,
+    summarize,
+)
+
+
+def read(raw: bytes) -> tuple[tuple[int, bool], bytes]:
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await _read_response(reader), await reader.read()
+
+    return asyncio.run(main())
+
+
+class HTTPServer:
+    """A keep-alive HTTP/1.1 server on a background event loop."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self.handle, "127.0.0.1", 0), self.loop
+        ).result()
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                status = b"404 Not Found" if b" /missing " in head else b"200 OK"
+                writer.write(b"HTTP/1.1 " + status + b"\r\ncontent-length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+class TestLoadGenerator(unittest.TestCase):
+    def test_reads_sized_chunked_and_close_delimited_bodies(self) -> None:
+        self.assertEqual(
+            read(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nokNEXT"),
+            ((200, False), b"NEXT"),
+        )
+        self.assertEqual(
+            read(
+                b"HTTP/1.1 201 Created\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"2\r\nok\r\n0\r\n\r\nNEXT"
+            ),
+            ((201, False), b"NEXT"),
+        )
+        self.assertEqual(
+            read(b"HTTP/1.1 500 Oops\r\nConnection: close\r\n\r\nbody"), ((500, True), b"")
+        )
+        self.assertEqual(
+            read(b"HTTP/1.1 304 Not Modified\r\n\r\nNEXT"), ((304, False), b"NEXT")
+        )
+
+    def test_percentiles_and_summary(self) -> None:
+        ordered = array("d", [0.001 * i for i in range(1, 101)])
+        self.assertAlmostEqual(percentile(ordered, 0.5), 0.050)
+        self.assertAlmostEqual(percentile(ordered, 0.99), 0.099)
+        self.assertEqual(percentile(array("d"), 0.99), 0.0)
+        result = summarize(array("d", reversed(ordered)), errors=2, duration=2.0)
+        self.assertEqual((result.requests, result.errors, result.rps), (100, 2, 50.0))
+        self.assertAlmostEqual(result.p99_ms, 99.0)
+        self.assertAlmostEqual(result.max_ms, 100.0)
+
+    def test_run_load_at_fixed_concurrency_and_rate(self) -> None:
+        server = HTTPServer()
+        self.addCleanup(server.close)
+        result = run_load(
+            "127.0.0.1",
+            server.port,
+            LoadProfile(paths=("/", "/missing"), connections=4, duration=1.0, warmup=0.2),
+        )
+        self.assertGreater(result.requests, 100)
+        # Every other request hits the 404 route.
+        self.assertAlmostEqual(result.errors / result.requests, 0.5, delta=0.05)
+        paced = run_load(
+            "127.0.0.1",
+            server.port,
+            LoadProfile(connections=4, duration=1.0, warmup=0.0, rate=200, processes=2),
+        )
+        self.assertEqual(paced.errors, 0)
+        self.assertAlmostEqual(paced.requests, 200, delta=10)
+
+
+class TestBaseline(unittest.TestCase):
+    def record(self, **result) -> dict:
+        values = dict(rps=100.0, p50_ms=9.0, p99_ms=20.0, errors=0)
+        values.update(result)
+        summary = summarize(array("d"), 0, 10.0)
+        record = bench_record("main:app", {"workers": 1}, LoadProfile(), summary)
+        record["result"].update(values)
+        return record
+
+    def test_saves_runs_and_the_baseline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            self.assertIsNone(load_baseline(directory))
+            record = self.record()
+            saved = save_record(record, directory, baseline=True)
+            self.assertRegex(saved.name, r"^\d{8}-\d{6}\.json$")
+            self.assertEqual(load_baseline(directory), record)
+            save_record(self.record(rps=1.0), directory)
+            self.assertEqual(load_baseline(directory), record)
+
+    def test_flags_regressions_beyond_the_tolerance(self) -> None:
+        baseline = self.record()["result"]
+        within = self.record(rps=95.0, p99_ms=21.0)["result"]
+        self.assertEqual(find_regressions(within, baseline, 0.1), [])
+        worse = self.record(rps=80.0, p99_ms=25.0, errors=3)["result"]
+        self.assertEqual(
+            find_regressions(worse, baseline, 0.1),
+            [
+                "throughput 80 req/s vs 100",
+                "p99 25.00 ms vs 20.00 ms",
+                "errors 3 vs 0",
+            ],
+        )
+
+    def test_reports_setup_differences(self) -> None:
+        baseline = self.record()
+        current = self.record()
+        current["settings"] = {"workers": 2, "loop": "uvloop"}
+        self.assertEqual(
+            baseline_mismatches(current, baseline),
+            ["loop: None -> uvloop", "workers: 1 -> 2"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+import tempfile
+import importlib.util
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from click.testing import CliRunner
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.append(str(SRC))
+
+# Only needed by code generation, `new`, `start` or the REPL; none of them
+# may be imported just to print help or run a commander app.
+HEAVY_MODULES = (
+    "autoflake",
+    "autopep8",
+    "isort",
+    "questionary",
+    "yaspin",
+    "granian",
+    "rich.panel",
+    "nestipy_cli.handler",
+    "nestipy_cli.frontend",
+    "nestipy_cli.repl",
+    "nestipy_cli.server",
+    "nestipy_cli.collector",
+)
+IMPORT_BUDGET_MS = float(os.environ.get("NESTIPY_CLI_IMPORT_BUDGET_MS", "250"))
+
+
+def import_times(args: list[str], cwd: str) -> dict[str, int]:
+    """Run ``nestipy <args>`` under ``-X importtime``; map module -> cumulative us."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(SRC), os.environ.get("PYTHONPATH", "")]),
+    }
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys; from nestipy_cli.cli import main; main(sys.argv[1:])",
+            *args,
+        ],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestCliStartup(unittest.TestCase):
+    def assert_lightweight(self, times: dict[str, int]) -> None:
+        self.assertIn("nestipy_cli.cli", times)
+        self.assertEqual([name for name in HEAVY_MODULES if name in times], [])
+        self.assertLess(times["nestipy_cli.cli"] / 1000, IMPORT_BUDGET_MS)
+
+    def test_help_does_not_import_heavy_modules(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assert_lightweight(import_times(["--help"], tmp))
+
+    def test_run_does_not_import_heavy_modules(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "cli.py").write_text(
+                textwrap.dedent(
+                    """
+                    class _Command:
+                        async def run(self, name, args):
+                            print(name, *args)
+
+                    command = _Command()
+                    """
+                )
+            )
+            self.assert_lightweight(import_times(["run", "hello", "world"], tmp))
+
+
+
+# Without nestipy, `start` would install it before reading its options.
+@unittest.skipUnless(importlib.util.find_spec("nestipy"), "requires nestipy")
+class TestExplainConfig(unittest.TestCase):
+    def explain(self, *args: str) -> None:
+        from nestipy_cli import server
+        from nestipy_cli.cli import main
+        from nestipy_cli.collector import LogCollector
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            self.addCleanup(os.chdir, cwd)
+            # Classified from the source, without a probe subprocess.
+            Path("main.py").write_text(
+                "from nestipy.core import NestipyFactory\n"
+                "app = NestipyFactory.create(object)\n"
+            )
+            Path("web").mkdir()
+            with mock.patch.object(LogCollector, "start") as collector, mock.patch(
+                "subprocess.Popen"
+            ) as popen, mock.patch("subprocess.run") as run, mock.patch(
+                "shutil.which", return_value="/usr/bin/npm"
+            ), mock.patch.object(server, "write_logging_config") as write_config:
+                result = CliRunner().invoke(
+                    main, ["start", "main:app", "--explain-config", *args]
+                )
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn("Effective granian settings", result.output)
+            collector.assert_not_called()
+            popen.assert_not_called()
+            run.assert_not_called()
+            write_config.assert_not_called()
+            self.assertEqual(sorted(os.listdir(".")), ["main.py", "web"])
+            os.chdir(cwd)
+
+    def test_production_explain_has_no_side_effects(self) -> None:
+        self.explain(
+            "--workers",
+            "2",
+            "--log-max-bytes",
+            "1M",
+            "--uds",
+            "run/app.sock",
+            "--rolling-restart",
+            "--pid-file",
+            "run/nestipy.pid",
+        )
+
+    def test_dev_explain_does_not_start_the_frontend(self) -> None:
+        self.explain("--dev", "--web")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,48 @@
+import gzip
 import inspect
+import json
+import logging
 import sys
+import tempfile
 import unittest
+from dataclasses import replace
 from pathlib import Path
 from unittest import mock
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
-from nestipy_cli.config import PROD_LOGGER  # noqa: E402
+from nestipy_cli.config import (  # noqa: E402
+    ACCESS_LOG_FORMAT,
+    PROD_LOGGER,
+    UDS_ACCESS_LOG_FORMAT,
+    _BatchFileWriter,
+    _NestipyAccessSampler,
+    _NestipyFastFormatter,
+    _NestipyJsonAccessFormatter,
+    _NestipyQueueHandler,
+    _NestipyRequestCounter,
+)
 from nestipy_cli.server import (  # noqa: E402
+    GranianLogRewriter,
     GranianStartConfig,
+    GranianTuning,
+    LoggingOptions,
+    UnsupportedGranianError,
     build_granian_options,
+    check_granian_internals,
+    build_http_settings,
+    explain_granian_config,
+    load_app,
+    parse_byte_size,
+    preload_application,
     build_logging_config,
     rewrite_granian_line,
+    rewrite_granian_line_bytes,
     resolve_granian_init_args,
     select_port,
+    should_passthrough_logs,
 )
+from nestipy_cli.static import StaticMount  # noqa: E402
 
 
 class TestGranianServer(unittest.TestCase):
@@ -123,6 +151,118 @@ class TestGranianServer(unittest.TestCase):
         self.assertEqual(kwargs.get("host"), "127.0.0.1")
         self.assertEqual(kwargs.get("port"), 9000)
 
+    def tuned_config(self, tuning: GranianTuning) -> GranianStartConfig:
+        return GranianStartConfig(
+            app_path="main:app",
+            dev=False,
+            host="127.0.0.1",
+            port=9000,
+            workers=2,
+            ssl_keyfile=None,
+            ssl_cert_file=None,
+            loop="auto",
+            http="auto",
+            is_microservice=False,
+            log_config_path=Path("/tmp/granian.json"),
+            reload_any=False,
+            reload_paths=[],
+            reload_ignore_dirs=[],
+            reload_ignore_patterns=[],
+            reload_ignore_paths=[],
+            reload_tick=None,
+            reload_ignore_worker_failure=False,
+            tuning=tuning,
+        )
+
+    def test_build_granian_options_groups_http_settings(self) -> None:
+        options = build_granian_options(
+            self.tuned_config(
+                GranianTuning(
+                    runtime_threads=2,
+                    backlog=2048,
+                    http1_keep_alive=False,
+                    http2_max_concurrent_streams=500,
+                )
+            )
+        )
+        self.assertEqual(options["runtime_threads"], 2)
+        self.assertEqual(options["backlog"], 2048)
+        self.assertNotIn("backpressure", options)
+        self.assertEqual(options["http1_settings"], {"keep_alive": False})
+        self.assertEqual(options["http2_settings"], {"max_concurrent_streams": 500})
+        untuned = build_granian_options(self.tuned_config(GranianTuning()))
+        self.assertNotIn("http1_settings", untuned)
+        self.assertNotIn("uds", untuned)
+
+    def test_build_granian_options_uds(self) -> None:
+        cfg = replace(
+            self.tuned_config(GranianTuning()),
+            uds=Path("/run/app.sock"),
+            uds_permissions=0o660,
+            log_dictconfig={"version": 1},
+        )
+        options = build_granian_options(cfg)
+        self.assertEqual(options["uds"], Path("/run/app.sock"))
+        self.assertEqual(options["uds_permissions"], 0o660)
+        self.assertEqual(options["log_access_format"], UDS_ACCESS_LOG_FORMAT)
+        self.assertNotIn("%(addr)s", UDS_ACCESS_LOG_FORMAT)
+
+    def test_build_granian_options_static_mounts(self) -> None:
+        cfg = replace(
+            self.tuned_config(GranianTuning()),
+            static_mounts=(
+                StaticMount("/css", Path("/srv/public/css")),
+                StaticMount("/assets", Path("/srv/inertia/dist/assets")),
+            ),
+        )
+        options = build_granian_options(cfg)
+        self.assertEqual(options["static_path_route"], ["/css", "/assets"])
+        self.assertEqual(
+            options["static_path_mount"],
+            [Path("/srv/public/css"), Path("/srv/inertia/dist/assets")],
+        )
+        self.assertNotIn("static_path_expires", options)
+        options = build_granian_options(replace(cfg, static_expires=0))
+        self.assertEqual(options["static_path_expires"], 0)
+
+    def test_build_http_settings_drops_unknown_fields(self) -> None:
+        try:
+            from granian.http import HTTP1Settings
+        except ImportError:
+            self.skipTest("granian is not installed")
+        kwargs = {"http1_settings": {"keep_alive": False, "no_such_field": 1}}
+        self.assertEqual(build_http_settings(kwargs), ["http1_no_such_field"])
+        self.assertIsInstance(kwargs["http1_settings"], HTTP1Settings)
+        self.assertFalse(kwargs["http1_settings"].keep_alive)
+
+    def test_explain_granian_config_sources(self) -> None:
+        class DummyGranian:
+            def __init__(
+                self,
+                target,
+                address="127.0.0.1",
+                port=8000,
+                workers=1,
+                backlog=1024,
+                backpressure=None,
+                runtime_threads=1,
+            ) -> None:
+                pass
+
+        rows = {
+            setting: (value, source)
+            for setting, value, source in explain_granian_config(
+                self.tuned_config(GranianTuning(backlog=4096, task_impl="rust")),
+                inspect.signature(DummyGranian),
+            )
+        }
+        self.assertEqual(rows["backlog"], ("4096", "nestipy start"))
+        self.assertEqual(rows["runtime_threads"], ("1", "granian default"))
+        self.assertEqual(
+            rows["backpressure"], ("2048 (backlog / workers)", "granian default")
+        )
+        self.assertEqual(rows["task_impl"][1], "ignored: not supported by this granian")
+
     def test_select_port_microservice_uses_random(self) -> None:
         with mock.patch("nestipy_cli.server.random.randint", return_value=6123):
             self.assertEqual(select_port(8000, True), 6123)
@@ -132,6 +272,269 @@ class TestGranianServer(unittest.TestCase):
         config = build_logging_config(dev=False)
         self.assertEqual(config["loggers"], PROD_LOGGER)
 
+    def test_build_logging_config_without_color_uses_plain_console(self) -> None:
+        config = build_logging_config(dev=True, use_color=False)
+        self.assertEqual(config["handlers"]["console"]["class"], "logging.StreamHandler")
+        self.assertEqual(config["formatters"]["nestipy"]["class"], "logging.Formatter")
+
+    def test_build_logging_config_prod_uses_fast_console(self) -> None:
+        config = build_logging_config(dev=False)
+        self.assertEqual(config["handlers"]["console"]["class"], "logging.StreamHandler")
+        self.assertEqual(
+            config["formatters"]["nestipy"]["()"],
+            "nestipy_cli.config._NestipyFastFormatter",
+        )
+        self.assertTrue(config["formatters"]["nestipy"]["use_color"])
+
+    def test_fast_formatter_colors_status_from_atoms(self) -> None:
+        record = logging.LogRecord(
+            "granian.access", logging.INFO, "", 0, ACCESS_LOG_FORMAT, None, None
+        )
+        record.args = {
+            "time": "2026-02-11 18:20:19 +0300",
+            "addr": "127.0.0.1",
+            "method": "GET",
+            "path": "/users/200",
+            "protocol": "HTTP/1.1",
+            "status": 404,
+            "dt_ms": 1.5,
+        }
+        plain = _NestipyFastFormatter(use_color=False).format(record)
+        self.assertEqual(
+            plain,
+            '[NESTIPY] INFO [2026-02-11 18:20:19 +0300] 127.0.0.1 - '
+            '"GET /users/200 HTTP/1.1" 404 - 1.500 ms',
+        )
+        colored = _NestipyFastFormatter().format(record)
+        self.assertEqual(
+            colored,
+            "\x1b[32m"
+            + plain.replace(" 404 ", " \x1b[33m404\x1b[32m ")
+            + "\x1b[0m",
+        )
+
+        record = logging.LogRecord(
+            "nestipy", logging.INFO, "", 0, "took 12 ms, status 500", None, None
+        )
+        record.status = 500
+        self.assertEqual(
+            _NestipyFastFormatter().format(record),
+            "\x1b[32m[NESTIPY] INFO took 12 ms, status \x1b[31m500\x1b[32m\x1b[0m",
+        )
+
+    def test_build_logging_config_json_access(self) -> None:
+        config = build_logging_config(
+            dev=False, options=LoggingOptions(log_format="json")
+        )
+        self.assertEqual(
+            config["loggers"]["granian.access"]["handlers"],
+            ["access", "access_console"],
+        )
+        self.assertEqual(config["handlers"]["access"]["formatter"], "access_json")
+        self.assertEqual(config["loggers"]["nestipy"], PROD_LOGGER["nestipy"])
+
+    def test_build_logging_config_prod_uses_queue_handlers(self) -> None:
+        config = build_logging_config(
+            dev=False,
+            options=LoggingOptions(queue_size=50, queue_overflow="block"),
+        )
+        for name in ("default", "access"):
+            handler = config["handlers"][name]
+            self.assertEqual(handler["()"], "nestipy_cli.config._NestipyQueueHandler")
+            self.assertEqual(handler["queue_size"], 50)
+            self.assertEqual(handler["overflow"], "block")
+
+    def test_queue_handler_writes_batches_and_drops_oldest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = str(Path(tmp) / "logs" / "access.log")
+            with mock.patch("nestipy_cli.config._BatchFileWriter.start"):
+                handler = _NestipyQueueHandler(
+                    filename, queue_size=2, flush_interval=60, flush_size=100
+                )
+            for index in range(3):
+                handler.handle(
+                    logging.LogRecord("t", logging.INFO, "", 0, f"line {index}", None, None)
+                )
+            self.assertEqual(handler.dropped, 1)
+            handler._writer.start()
+            handler.close()
+            self.assertEqual(Path(filename).read_text(), "line 1\nline 2\n")
+
+    def test_batch_file_writer_rotates_and_compresses(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = str(Path(tmp) / "access.log")
+            writer = _BatchFileWriter(
+                mock.Mock(), filename, 1.0, 10, max_bytes=10, backups=2
+            )
+            for text in ("first line", "second line", "third line"):
+                writer.write_batch([mock.Mock(msg=text)])
+            writer.close_sink()
+            self.assertEqual(Path(filename).read_text(), "")
+            with gzip.open(f"{filename}.1.gz", "rt") as handle:
+                self.assertEqual(handle.read(), "third line\n")
+            with gzip.open(f"{filename}.2.gz", "rt") as handle:
+                self.assertEqual(handle.read(), "second line\n")
+            self.assertFalse(Path(f"{filename}.3.gz").exists())
+
+    def test_batch_file_writers_sharing_a_file_keep_every_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = str(Path(tmp) / "default.log")
+            writers = [
+                _BatchFileWriter(
+                    mock.Mock(), filename, 1.0, 10, max_bytes=200, backups=20
+                )
+                for _ in range(2)
+            ]
+            for index in range(20):
+                for name, writer in zip("ab", writers):
+                    writer.write_batch([mock.Mock(msg=f"{name} line {index:02d}")])
+            for writer in writers:
+                writer.close_sink()
+            lines = Path(filename).read_text().splitlines()
+            for segment in Path(tmp).glob("default.log.*.gz"):
+                with gzip.open(segment, "rt") as handle:
+                    lines += handle.read().splitlines()
+            self.assertEqual(len(lines), 40)
+            self.assertEqual(len(set(lines)), 40)
+            self.assertEqual(list(Path(tmp).glob("default.log.[0-9]")), [])
+
+    def test_access_sampler(self) -> None:
+        def access(status: int, dt_ms: float = 1.0) -> logging.LogRecord:
+            record = logging.LogRecord(
+                "granian.access", logging.INFO, "", 0, "%(status)d", None, None
+            )
+            record.args = {"status": status, "dt_ms": dt_ms}
+            return record
+
+        sampler = _NestipyAccessSampler(
+            sample=0.5, rate_limit=1, errors_always=True, slow_ms=500
+        )
+        sampler._random = lambda: 0.9
+        self.assertFalse(sampler.filter(access(200)))
+        self.assertTrue(sampler.filter(access(503)))
+        self.assertTrue(sampler.filter(access(200, dt_ms=750)))
+        sampler._random = lambda: 0.1
+        self.assertTrue(sampler.filter(access(200)))
+        self.assertFalse(sampler.filter(access(200)))
+
+        # A copy inherited by a forked worker lets everything through, so
+        # the worker's own filter is the only one sampling.
+        sampler._random = lambda: 0.9
+        with mock.patch("os.getpid", return_value=-1):
+            self.assertTrue(sampler.filter(access(200)))
+
+        config = build_logging_config(
+            dev=False, options=LoggingOptions(access_sample=0.01)
+        )
+        self.assertEqual(
+            config["loggers"]["granian.access"]["filters"], ["access_sampler"]
+        )
+
+    def test_request_counter(self) -> None:
+        record = logging.LogRecord("granian.access", logging.INFO, "", 0, "", None, None)
+        counter = _NestipyRequestCounter(max_requests=3, jitter=2)
+        self.assertIn(counter.limit, (3, 4, 5))
+        with self.assertLogs("_granian", logging.INFO) as logs:
+            for _ in range(10):
+                self.assertTrue(counter.filter(record))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn(f"served {counter.limit} requests", logs.output[0])
+
+        # A copy inherited by a forked worker stays out of the way.
+        with mock.patch("os.getpid", return_value=-1):
+            self.assertTrue(counter.filter(record))
+        self.assertEqual(counter.count, 10)
+
+        config = build_logging_config(
+            dev=False,
+            options=LoggingOptions(access_sample=0.5, max_requests=100),
+        )
+        self.assertEqual(
+            config["loggers"]["granian.access"]["filters"],
+            ["request_counter", "access_sampler"],
+        )
+
+    def test_granian_internals_version_guard(self) -> None:
+        check_granian_internals([], version="3.0.0")
+        check_granian_internals(["--max-requests"], version="2.8.4")
+        check_granian_internals(["--uds"], version="2.7.1")
+        with self.assertRaises(UnsupportedGranianError) as raised:
+            check_granian_internals(["--max-requests", "--workers-max"], version="2.9.0")
+        self.assertIn("--max-requests, --workers-max", str(raised.exception))
+        self.assertIn("granian 2.9.0", str(raised.exception))
+
+    def test_preload_application_imports_like_granian(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "preload_target.py").write_text("app = object()\n")
+            with mock.patch(
+                "nestipy_cli.server.multiprocessing.set_start_method"
+            ) as set_method, mock.patch("nestipy_cli.server.gc.freeze") as freeze:
+                app = preload_application(f"{tmp}/preload_target:app")
+            try:
+                self.assertIs(app, sys.modules["preload_target"].app)
+                set_method.assert_called_once_with("fork", force=True)
+                freeze.assert_called_once()
+            finally:
+                sys.modules.pop("preload_target", None)
+                sys.path.remove(tmp)
+
+    def test_load_app_wraps_assets_then_rsgi(self) -> None:
+        from nestipy_cli.assets import PrecompressedAssets
+        from nestipy_cli.rsgi import RSGIAdapter
+
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = Path(tmp, "manifest.json")
+            manifest.write_text('{"version": 1, "files": {}}')
+            app = object()
+            with mock.patch("granian._internal.load_target", return_value=app):
+                self.assertIs(load_app("main:app"), app)
+                wrapped = load_app("main:app", interface="rsgi", assets_manifest=manifest)
+        self.assertIsInstance(wrapped, RSGIAdapter)
+        self.assertIsInstance(wrapped.app, PrecompressedAssets)
+        self.assertIs(wrapped.app.app, app)
+
+    def test_parse_byte_size(self) -> None:
+        self.assertEqual(parse_byte_size("1048576"), 1048576)
+        self.assertEqual(parse_byte_size("100M"), 100 * 1024**2)
+        self.assertEqual(parse_byte_size("1.5G"), int(1.5 * 1024**3))
+        with self.assertRaises(ValueError):
+            parse_byte_size("lots")
+
+    def test_json_access_formatter(self) -> None:
+        record = logging.LogRecord(
+            "granian.access",
+            logging.INFO,
+            __file__,
+            0,
+            "%(method)s %(path)s",
+            None,
+            None,
+        )
+        record.args = {
+            "addr": "127.0.0.1",
+            "method": "GET",
+            "path": "/x",
+            "query_string": "",
+            "protocol": "HTTP/1.1",
+            "status": 200,
+            "dt_ms": 13.40912,
+        }
+        payload = json.loads(_NestipyJsonAccessFormatter().format(record))
+        self.assertEqual(payload["method"], "GET")
+        self.assertEqual(payload["path"], "/x")
+        self.assertEqual(payload["status"], 200)
+        self.assertEqual(payload["duration_ms"], 13.409)
+        self.assertEqual(payload["pid"], record.process)
+        self.assertEqual(rewrite_granian_line('{"status":200}'), '{"status":200}')
+
+    def test_should_passthrough_logs(self) -> None:
+        self.assertTrue(should_passthrough_logs(dev=False, raw_logs=False))
+        self.assertTrue(should_passthrough_logs(dev=True, raw_logs=True))
+        with mock.patch(
+            "nestipy_cli.server.stdout_supports_color", return_value=True
+        ):
+            self.assertFalse(should_passthrough_logs(dev=True, raw_logs=False))
+
     def test_rewrite_granian_line(self) -> None:
         self.assertEqual(
             rewrite_granian_line("[INFO] Starting granian", use_color=False),
@@ -149,6 +552,33 @@ class TestGranianServer(unittest.TestCase):
             ),
             '[NESTIPY] INFO [2026-02-11 18:20:19 +0300] 127.0.0.1 - "GET /x HTTP/1.1" 200 - 13.409 ms',
         )
+        # Unix socket peers have no address.
+        self.assertEqual(
+            rewrite_granian_line(
+                '[2026-02-11 18:20:19 +0300]  - "GET /x HTTP/1.1" 200 1.5', use_color=False
+            ),
+            '[NESTIPY] INFO [2026-02-11 18:20:19 +0300] unix - "GET /x HTTP/1.1" 200 - 1.5 ms',
+        )
+
+    def test_rewrite_granian_line_bytes_colors_status(self) -> None:
+        self.assertEqual(
+            rewrite_granian_line_bytes(
+                b'[2026-02-11 18:20:19 +0300] 127.0.0.1 - "GET /200 HTTP/1.1" 404 1.5'
+            ),
+            b'\x1b[32m[NESTIPY] INFO [2026-02-11 18:20:19 +0300] 127.0.0.1 - '
+            b'"GET /200 HTTP/1.1" \x1b[33m404\x1b[32m - 1.5 ms\x1b[0m',
+        )
+
+    def test_log_rewriter_handles_split_chunks(self) -> None:
+        rewriter = GranianLogRewriter(use_color=False)
+        output = rewriter.feed(b"[INFO] one\n[WARN")
+        output += rewriter.feed(b"ING] two\npartial \xc3")
+        output += rewriter.feed(b"\xa9")
+        output += rewriter.flush()
+        self.assertEqual(
+            output,
+            b"[NESTIPY] INFO one\n[NESTIPY] WARNING two\npartial \xc3\xa9",
+        )
 
 
 if __name__ == "__main__":
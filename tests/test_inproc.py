@@ -0,0 +1,145 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.inproc import (  # noqa: E402
+    InprocError,
+    bench_routes,
+    component_of,
+    route_targets,
+)
+
+
+def param(name: str, source: str, kind: object = str, required: bool = True):
+    return SimpleNamespace(name=name, source=source, type=kind, required=required)
+
+
+class FakeApp:
+    """A raw ASGI app with a Nestipy-like router spec."""
+
+    def __init__(self) -> None:
+        self.started = False
+        self.stopped = False
+        self.requests: list[tuple[str, str, bytes, bytes]] = []
+
+    def get_router_spec(self):
+        return SimpleNamespace(
+            routes=[
+                SimpleNamespace(
+                    path="/users/{id}",
+                    methods=["get", "put"],
+                    controller="UserController",
+                    handler="one",
+                    params=[
+                        param("id", "path", int),
+                        param("page", "query", int),
+                        param("q", "query", required=False),
+                        param("X-Tenant", "header"),
+                    ],
+                ),
+                SimpleNamespace(
+                    path="/users",
+                    methods=["POST"],
+                    controller="UserController",
+                    handler="create",
+                    params=[param("body", "body", dict)],
+                ),
+            ]
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    self.started = True
+                    await send({"type": "lifespan.startup.complete"})
+                else:
+                    self.stopped = True
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        body = (await receive())["body"]
+        self.requests.append(
+            (scope["method"], scope["path"], scope["query_string"], body)
+        )
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+class TestInproc(unittest.TestCase):
+    def test_route_targets_fill_required_parameters(self) -> None:
+        targets = route_targets(FakeApp())
+        self.assertEqual(
+            [(t.method, t.route, t.handler) for t in targets],
+            [
+                ("GET", "/users/{id}", "UserController.one"),
+                ("PUT", "/users/{id}", "UserController.one"),
+                ("POST", "/users", "UserController.create"),
+            ],
+        )
+        get = targets[0]
+        self.assertEqual(get.path, "/users/1")
+        self.assertEqual(get.query_string, b"page=1")
+        self.assertIn((b"x-tenant", b"sample"), get.headers)
+        self.assertEqual(get.body, b"")
+        self.assertEqual(targets[2].body, b"{}")
+        self.assertIn((b"content-type", b"application/json"), targets[2].headers)
+
+    def test_an_app_without_router_spec_is_refused(self) -> None:
+        with self.assertRaises(InprocError):
+            route_targets(object())
+
+    def test_bench_runs_inside_the_lifespan(self) -> None:
+        app = FakeApp()
+        targets = route_targets(app)
+        timings = asyncio.run(bench_routes(app, targets, iterations=20))
+        self.assertTrue(app.started and app.stopped)
+        self.assertEqual(len(timings), 3)
+        for timing in timings:
+            self.assertEqual(timing.status, 201)
+            self.assertEqual(timing.calls, 20)
+            self.assertGreater(timing.mean_us, 0)
+            self.assertLessEqual(timing.p50_us, timing.p99_us)
+            self.assertGreaterEqual(timing.alloc_bytes, 0)
+            self.assertAlmostEqual(sum(timing.breakdown.values()), 1.0)
+        self.assertIn(("POST", "/users", b"", b"{}"), app.requests)
+
+    def test_an_app_without_lifespan_is_still_benchmarked(self) -> None:
+        class NoLifespan(FakeApp):
+            async def __call__(self, scope, receive, send) -> None:
+                if scope["type"] == "lifespan":
+                    raise RuntimeError("unsupported")
+                await super().__call__(scope, receive, send)
+
+        app = NoLifespan()
+        timings = asyncio.run(
+            bench_routes(app, route_targets(app)[:1], iterations=10, breakdown=False)
+        )
+        self.assertEqual(timings[0].status, 201)
+        self.assertEqual(timings[0].breakdown, {})
+
+    def test_component_of(self) -> None:
+        site = "/venv/lib/python3.11/site-packages"
+        self.assertEqual(
+            component_of(f"{site}/nestipy/core/guards/processor.py", "process", None),
+            "guards",
+        )
+        self.assertEqual(
+            component_of(f"{site}/nestipy/ioc/container.py", "get", None), "DI"
+        )
+        self.assertEqual(
+            component_of("/usr/lib/python3.11/json/encoder.py", "encode", None),
+            "serialization",
+        )
+        self.assertEqual(
+            component_of("/srv/app/src/user_service.py", "find", "/srv/app"), "app"
+        )
+        self.assertEqual(component_of("~", "<built-in method time>", "/srv/app"), "other")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import logging
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.collector import LogCollector, split_collector_config  # noqa: E402
+from nestipy_cli.config import _NestipyCollectorHandler  # noqa: E402
+from nestipy_cli.server import build_logging_config  # noqa: E402
+
+
+class TestLogCollector(unittest.TestCase):
+    def test_split_collector_config(self) -> None:
+        config = build_logging_config(dev=False)
+        worker, collector = split_collector_config(config, "/tmp/collector.sock")
+        for name in ("default", "access"):
+            self.assertEqual(
+                worker["handlers"][name]["()"],
+                "nestipy_cli.config._NestipyCollectorHandler",
+            )
+            self.assertEqual(worker["handlers"][name]["destination"], name)
+            self.assertEqual(collector["handlers"][name], config["handlers"][name])
+            self.assertEqual(
+                collector["loggers"][f"nestipy.collector.{name}"]["handlers"], [name]
+            )
+        self.assertEqual(worker["loggers"], config["loggers"])
+
+    def test_collector_writes_records_in_time_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "access.log")
+            config = {
+                "formatters": {
+                    "file": {"class": "logging.Formatter", "format": "%(message)s"}
+                },
+                "handlers": {
+                    name: {
+                        "()": "nestipy_cli.config._NestipyQueueHandler",
+                        "formatter": "file",
+                        "filename": os.path.join(tmp, f"{name}.log"),
+                        "flush_interval": 0.05,
+                    }
+                    for name in ("default", "access")
+                },
+            }
+            collector = LogCollector(config, reorder_window=0.5)
+            collector.start()
+            try:
+                first = _NestipyCollectorHandler(
+                    collector.path, "access", flush_interval=0.05
+                )
+                second = _NestipyCollectorHandler(
+                    collector.path, "access", flush_interval=0.05
+                )
+                now = time.time()
+                for handler, message, created in (
+                    (second, "late %(status)d", now),
+                    (first, "early %(status)d", now - 0.1),
+                ):
+                    record = logging.LogRecord(
+                        "granian.access", logging.INFO, "", 0, message, None, None
+                    )
+                    record.args = {"status": 200}
+                    record.created = created
+                    handler.handle(record)
+                first.close()
+                second.close()
+            finally:
+                with mock.patch("nestipy_cli.collector.logging.shutdown"):
+                    collector.stop()
+            self.assertEqual(Path(filename).read_text(), "early 200\nlate 200\n")
+            self.assertFalse(os.path.exists(collector.directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli import procfs  # noqa: E402
+from nestipy_cli.metrics import (  # noqa: E402
+    CONTENT_TYPE,
+    MetricsRegistry,
+    MetricsServer,
+    WorkerTracker,
+)
+from nestipy_cli.stats import RouteStats  # noqa: E402
+
+
+class TestMetrics(unittest.TestCase):
+    def test_worker_tracker_counts_respawns(self) -> None:
+        tracker = WorkerTracker()
+        for line in (
+            b"[NESTIPY] INFO Spawning worker-1 with PID: 100",
+            b"[NESTIPY] INFO Spawning worker-2 with PID: 101",
+            b"[NESTIPY] ERROR Unexpected exit from worker-2",
+            b"[NESTIPY] INFO Spawning worker-2 with PID: 102",
+        ):
+            tracker.observe_line(line)
+        self.assertEqual(tracker.workers(), [(1, 100, 0, 0), (2, 102, 1, 1)])
+
+    def test_worker_tracker_forgets_retired_workers(self) -> None:
+        tracker = WorkerTracker()
+        for line in (
+            b"[NESTIPY] INFO Spawning worker-1 with PID: 100",
+            b"[NESTIPY] INFO Spawning worker-2 with PID: 101",
+            b"[NESTIPY] INFO Retired worker-2",
+            b"[NESTIPY] INFO Spawning worker-2 with PID: 102",
+        ):
+            tracker.observe_line(line)
+        self.assertEqual(tracker.workers(), [(1, 100, 0, 0), (2, 102, 0, 0)])
+
+    def test_registry_renders_prometheus_text(self) -> None:
+        registry = MetricsRegistry(RouteStats(), WorkerTracker())
+        registry.observe_line(
+            b'[NESTIPY] INFO [2026-02-11 18:20:19 +0300] 127.0.0.1 - '
+            b'"GET /users/42 HTTP/1.1" 503 30.000 ms'
+        )
+        registry.observe_line(b"[NESTIPY] INFO Spawning worker-1 with PID: 4242")
+        with mock.patch.object(procfs, "rss_bytes", return_value=1024), mock.patch.object(
+            procfs, "cpu_seconds", return_value=1.5
+        ):
+            text = registry.render()
+        for expected in (
+            '# TYPE nestipy_http_request_duration_seconds histogram',
+            'nestipy_http_requests_total{method="GET",route="/users/:id",status_class="5xx"} 1',
+            'nestipy_http_request_duration_seconds_bucket{method="GET",route="/users/:id",le="0.025"} 0',
+            'nestipy_http_request_duration_seconds_bucket{method="GET",route="/users/:id",le="0.05"} 1',
+            'nestipy_http_request_duration_seconds_count{method="GET",route="/users/:id"} 1',
+            'nestipy_worker_resident_memory_bytes{worker="1",pid="4242"} 1024',
+            'nestipy_worker_cpu_seconds_total{worker="1",pid="4242"} 1.5',
+            'nestipy_worker_restarts_total{worker="1"} 0',
+        ):
+            self.assertIn(expected, text)
+
+    def test_metrics_server_serves_registry(self) -> None:
+        server = MetricsServer(MetricsRegistry(RouteStats(), WorkerTracker()), "127.0.0.1", 0)
+        server.start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+                self.assertEqual(response.headers["Content-Type"], CONTENT_TYPE)
+                self.assertIn(b"nestipy_start_time_seconds", response.read())
+        finally:
+            server.stop()
+
+    # Without nestipy, `start` would install it before checking its options.
+    @unittest.skipUnless(importlib.util.find_spec("nestipy"), "requires nestipy")
+    def test_start_refuses_metrics_with_access_log_sampling(self) -> None:
+        src = Path(__file__).resolve().parents[1] / "src"
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "main.py").write_text("app = None\n")
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import sys; from nestipy_cli.cli import main; main(sys.argv[1:])",
+                    "start",
+                    "main:app",
+                    "--metrics-port",
+                    "0",
+                    "--access-log-sample",
+                    "0.01",
+                ],
+                cwd=tmp,
+                env={**os.environ, "PYTHONPATH": str(src)},
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
+        self.assertEqual(result.returncode, 2, result.stderr[-2000:])
+        self.assertIn("--metrics-port", result.stderr)
+        self.assertIn("--access-log-sample", result.stderr)
+
+    @unittest.skipUnless(os.path.exists("/proc/self/stat"), "requires procfs")
+    def test_procfs_reads_current_process(self) -> None:
+        self.assertGreater(procfs.rss_bytes(os.getpid()), 0)
+        self.assertGreaterEqual(procfs.cpu_seconds(os.getpid()), 0.0)
+        self.assertIsNone(procfs.rss_bytes(2**22 + 1))
+
+    @unittest.skipUnless(os.path.exists("/proc/self/smaps_rollup"), "requires smaps_rollup")
+    def test_procfs_children_and_memory_rollup(self) -> None:
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        try:
+            self.assertIn(child.pid, procfs.child_pids(os.getpid()))
+            rollup = procfs.memory_rollup(child.pid)
+            self.assertGreater(rollup["Rss"], 0)
+            self.assertIn("Private_Dirty", rollup)
+        finally:
+            child.kill()
+            child.wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
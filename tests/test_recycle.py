@@ -0,0 +1,105 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.recycle import (  # noqa: E402
+    RecyclePolicy,
+    granian_rss_options,
+    recycling_server,
+)
+
+
+class FakeWorker:
+    def __init__(self, idx: int, pid: int) -> None:
+        self.idx = idx
+        self.pid = pid
+
+    def _id(self) -> int:
+        return self.pid
+
+
+class FakeServer:
+    def __init__(self, workers: int, workers_max_rss: int | None = None) -> None:
+        self.wrks = [FakeWorker(idx, 100 + idx) for idx in range(workers)]
+        self.respawn_interval = 0
+        self.rss_signal = False
+        self.main_loop_interrupt = threading.Event()
+        self.workers_rss = workers_max_rss * 1024 * 1024 if workers_max_rss else None
+        self.rss_sample_interval = 10
+        self.respawned: list[list[int]] = []
+        self.rss_checks = 0
+        self.rss_watchers = 0
+
+    def _respawn_workers(self, workers, spawn_target, target_loader, delay=0) -> None:
+        self.respawned.append(list(workers))
+
+    def _handle_rss_signal(self, spawn_target, target_loader) -> None:
+        self.rss_checks += 1
+
+    def _watch_workers_rss(self) -> None:
+        self.rss_watchers += 1
+
+
+class TestRecycle(unittest.TestCase):
+    def make_server(self, workers: int = 3):
+        return recycling_server(FakeServer)(workers, recycle_policy=RecyclePolicy())
+
+    def test_request_limit_lines_queue_a_recycle(self) -> None:
+        server = self.make_server()
+        server.observe_line(b"[NESTIPY] INFO GET /requests 200")
+        self.assertFalse(server.rss_signal)
+        server.observe_line(
+            b"[NESTIPY] INFO Worker 101 served 50213 requests, requesting recycle"
+        )
+        self.assertTrue(server.rss_signal)
+        self.assertTrue(server.main_loop_interrupt.is_set())
+        server._handle_rss_signal("target", "loader")
+        self.assertEqual(server.respawned, [[1]])
+
+    def test_recycles_one_worker_per_signal_and_skips_stale_pids(self) -> None:
+        server = self.make_server()
+        for pid in (999, 102, 100):
+            server.request_recycle(pid, "RSS over limit")
+        server._handle_rss_signal("target", "loader")
+        server._handle_rss_signal("target", "loader")
+        server._handle_rss_signal("target", "loader")
+        self.assertEqual(server.respawned, [[2], [0]])
+
+    def test_rss_limit_is_left_to_granian(self) -> None:
+        self.assertEqual(granian_rss_options(RecyclePolicy(max_requests=10)), {})
+        self.assertEqual(
+            granian_rss_options(RecyclePolicy(max_rss=(3 << 29) + 1)),
+            {"workers_max_rss": 1537, "rss_sample_interval": 10},
+        )
+
+    def test_request_recycles_share_granian_rss_signal(self) -> None:
+        server = recycling_server(FakeServer)(
+            3, workers_max_rss=512, recycle_policy=RecyclePolicy(max_requests=10)
+        )
+        with mock.patch("nestipy_cli.recycle.time.monotonic", return_value=100.0):
+            server._watch_workers_rss()
+            # A request-count signal before the sampler is due: no RSS check,
+            # and the armed sampler is not doubled.
+            server.request_recycle(101, "served 10 requests")
+            server._handle_rss_signal("target", "loader")
+            server._watch_workers_rss()
+        self.assertEqual((server.rss_checks, server.rss_watchers), (0, 1))
+        self.assertEqual(server.respawned, [[1]])
+        with mock.patch("nestipy_cli.recycle.time.monotonic", return_value=110.0):
+            server._handle_rss_signal("target", "loader")
+            server._watch_workers_rss()
+        self.assertEqual((server.rss_checks, server.rss_watchers), (1, 2))
+
+        # Without an RSS limit granian's sampler is never armed.
+        server = self.make_server()
+        server._watch_workers_rss()
+        server._handle_rss_signal("target", "loader")
+        self.assertEqual((server.rss_checks, server.rss_watchers), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli import resources  # noqa: E402
+from nestipy_cli.resources import (  # noqa: E402
+    CpuPinner,
+    ResourceLimits,
+    auto_worker_count,
+    detect_limits,
+)
+
+
+def write(root: Path, relative: str, content: str) -> None:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestResources(unittest.TestCase):
+    def test_cgroup_v2_limits(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root, "proc/self/cgroup", "0::/app.slice/web\n")
+            write(root, "sys/fs/cgroup/cgroup.controllers", "cpu memory\n")
+            write(root, "sys/fs/cgroup/app.slice/cpu.max", "400000 100000\n")
+            write(root, "sys/fs/cgroup/app.slice/memory.max", "max\n")
+            write(root, "sys/fs/cgroup/app.slice/web/cpu.max", "max 100000\n")
+            write(root, "sys/fs/cgroup/app.slice/web/memory.max", str(1 << 30))
+            self.assertEqual(
+                detect_limits(root, cpus=16),
+                ResourceLimits(cpus=16, cpu_quota=4.0, memory_limit=1 << 30),
+            )
+
+    def test_cgroup_v1_limits(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root, "proc/self/cgroup", "4:memory:/\n2:cpu,cpuacct:/\n")
+            write(root, "sys/fs/cgroup/cpu,cpuacct/cpu.cfs_quota_us", "150000\n")
+            write(root, "sys/fs/cgroup/cpu,cpuacct/cpu.cfs_period_us", "100000\n")
+            write(
+                root, "sys/fs/cgroup/memory/memory.limit_in_bytes", "9223372036854771712\n"
+            )
+            self.assertEqual(
+                detect_limits(root, cpus=8),
+                ResourceLimits(cpus=8, cpu_quota=1.5, memory_limit=None),
+            )
+
+    def test_auto_worker_count(self) -> None:
+        gib = 1 << 30
+        self.assertEqual(auto_worker_count(ResourceLimits(cpus=8), gib), 8)
+        self.assertEqual(auto_worker_count(ResourceLimits(cpus=8, cpu_quota=2.5), gib), 2)
+        self.assertEqual(
+            auto_worker_count(ResourceLimits(cpus=8, memory_limit=3 * gib), gib), 3
+        )
+        self.assertEqual(
+            auto_worker_count(ResourceLimits(cpus=8, cpu_quota=0.5, memory_limit=gib // 2), gib),
+            1,
+        )
+
+    def test_cpu_pinner_spreads_workers_and_threads(self) -> None:
+        pinner = CpuPinner(exclude=frozenset({99}), cpus=[2, 3])
+        threads = {10: [10, 11], 20: [20], 30: [30]}
+        with mock.patch.object(
+            resources.procfs, "child_pids", return_value=[10, 20, 30, 99]
+        ), mock.patch.object(
+            resources.procfs, "thread_ids", side_effect=lambda pid: threads[pid]
+        ), mock.patch.object(resources.os, "sched_setaffinity", create=True) as setaffinity:
+            pinner.pin_once()
+            pinner.pin_once()
+        self.assertEqual(pinner.assigned, {10: 2, 20: 3, 30: 2})
+        self.assertEqual(
+            setaffinity.call_args_list,
+            [
+                mock.call(10, {2}),
+                mock.call(11, {2}),
+                mock.call(20, {3}),
+                mock.call(30, {2}),
+            ],
+        )
+
+    @unittest.skipUnless(hasattr(os, "sched_getaffinity"), "requires sched_getaffinity")
+    def test_detect_limits_on_this_host(self) -> None:
+        limits = detect_limits()
+        self.assertEqual(limits.cpus, len(os.sched_getaffinity(0)))
+        self.assertGreaterEqual(auto_worker_count(limits, 256 << 20), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import signal
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.rolling import (  # noqa: E402
+    RestartError,
+    WorkerReadiness,
+    rolling_server,
+    send_restart,
+)
+
+
+class FakeWorker:
+    def __init__(self, server: "FakeServer", idx: int) -> None:
+        self.server = server
+        self.idx = idx
+        self.interrupt_by_parent = False
+        self.alive = True
+        self.events = server.events
+
+    def start(self) -> None:
+        self.events.append(("start", self.idx, id(self)))
+        if self.server.ready:
+            self.server.readiness.observe_line(
+                f"[NESTIPY] INFO Started worker-{self.idx + 1}".encode()
+            )
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def terminate(self) -> None:
+        self.events.append(("terminate", self.idx, id(self)))
+        self.interrupt_by_parent = True
+        self.alive = False
+
+    def kill(self) -> None:
+        self.terminate()
+
+    def join(self, timeout=None) -> None:
+        pass
+
+
+class FakeServer:
+    def __init__(self, workers: int) -> None:
+        self.events: list[tuple[str, int, int]] = []
+        self.ready = True
+        self.respawned_wrks: dict[int, float] = {}
+        self.workers_kill_timeout = None
+        self._metrics = mock.Mock()
+        self.wrks = [FakeWorker(self, idx) for idx in range(workers)]
+
+    def _spawn_worker(self, idx, target, callback_loader) -> FakeWorker:
+        return FakeWorker(self, idx)
+
+
+class TestRolling(unittest.TestCase):
+    def test_readiness_waits_for_a_new_start_line(self) -> None:
+        readiness = WorkerReadiness()
+        readiness.observe_line(b"[NESTIPY] INFO Started worker-2")
+        mark = readiness.mark(2)
+        self.assertEqual(mark, 1)
+        self.assertFalse(readiness.wait(2, mark, timeout=0.01))
+        threading.Timer(
+            0.05, readiness.observe_line, [b"[NESTIPY] INFO Started worker-2"]
+        ).start()
+        self.assertTrue(readiness.wait(2, mark, timeout=2.0))
+
+    def test_replaces_workers_one_at_a_time_once_ready(self) -> None:
+        server = rolling_server(FakeServer)(workers=2, ready_timeout=1.0)
+        old = [id(wrk) for wrk in server.wrks]
+        server._respawn_workers([0, 1], "target", "loader")
+        new = [id(wrk) for wrk in server.wrks]
+        self.assertEqual(
+            server.events,
+            [
+                ("start", 0, new[0]),
+                ("terminate", 0, old[0]),
+                ("start", 1, new[1]),
+                ("terminate", 1, old[1]),
+            ],
+        )
+        self.assertFalse(any(wrk.interrupt_by_parent for wrk in server.wrks))
+
+    def test_unready_replacement_keeps_the_old_worker(self) -> None:
+        server = rolling_server(FakeServer)(workers=2, ready_timeout=0.1)
+        server.ready = False
+        old = list(server.wrks)
+        server._respawn_workers([0, 1], "target", "loader")
+        self.assertEqual(server.wrks, old)
+        self.assertEqual([event[0] for event in server.events], ["start", "terminate"])
+        self.assertTrue(all(wrk.alive for wrk in old))
+
+    @unittest.skipUnless(hasattr(signal, "SIGHUP"), "requires SIGHUP")
+    def test_send_restart_signals_the_pid_file_owner(self) -> None:
+        received = []
+        previous = signal.signal(signal.SIGHUP, lambda *args: received.append(args[0]))
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                pid_file = Path(tmp) / "nestipy.pid"
+                with self.assertRaises(RestartError):
+                    send_restart(pid_file)
+                pid_file.write_text(str(os.getpid()))
+                self.assertEqual(send_restart(pid_file), os.getpid())
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+        self.assertEqual(received, [signal.SIGHUP])
+
+
+if __name__ == "__main__":
+    unittest.main()
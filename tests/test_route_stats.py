@@ -0,0 +1,113 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.server import (  # noqa: E402
+    GranianLogRewriter,
+    LoggingOptions,
+    access_log_thinning,
+)
+from nestipy_cli.stats import (  # noqa: E402
+    OTHER_ROUTE,
+    LatencyHistogram,
+    RouteStats,
+    RouteStatsReporter,
+    format_route_table,
+    parse_access_line,
+    template_path,
+)
+
+
+class TestRouteStats(unittest.TestCase):
+    def test_template_path(self) -> None:
+        self.assertEqual(template_path("/users/42/posts"), "/users/:id/posts")
+        self.assertEqual(
+            template_path("/orders/3f2b9c1e-8a4d-4c2b-9e1f-0a1b2c3d4e5f?x=1"),
+            "/orders/:id",
+        )
+        self.assertEqual(template_path("/static/app.js"), "/static/app.js")
+
+    def test_access_log_thinning(self) -> None:
+        self.assertEqual(access_log_thinning(LoggingOptions()), [])
+        # Always-kept errors and slow requests alone drop nothing.
+        self.assertEqual(
+            access_log_thinning(
+                LoggingOptions(access_errors_always=True, access_slow_ms=500)
+            ),
+            [],
+        )
+        self.assertEqual(
+            access_log_thinning(LoggingOptions(access_sample=0.01, access_rate_limit=10)),
+            ["--access-log-sample", "--access-log-rate-limit"],
+        )
+
+    def test_parse_access_line_formats(self) -> None:
+        expected = ("GET", "/users/42", 404, 13.409)
+        self.assertEqual(
+            parse_access_line(
+                b'[2026-02-11 18:20:19 +0300] 127.0.0.1 - "GET /users/42 HTTP/1.1" 404 13.409'
+            ),
+            expected,
+        )
+        self.assertEqual(
+            parse_access_line(
+                b'\x1b[32m[NESTIPY] INFO [2026-02-11 18:20:19 +0300] 127.0.0.1 - '
+                b'"GET /users/42 HTTP/1.1" \x1b[33m404\x1b[32m - 13.409 ms\x1b[0m'
+            ),
+            expected,
+        )
+        self.assertEqual(
+            parse_access_line(
+                json.dumps(
+                    {"method": "GET", "path": "/users/42", "status": 404, "duration_ms": 13.409}
+                ).encode()
+            ),
+            expected,
+        )
+        self.assertIsNone(parse_access_line(b"[NESTIPY] INFO Started worker-1"))
+
+    def test_histogram_percentiles_are_within_precision(self) -> None:
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(float(value))
+        for q, exact in ((50, 500), (95, 950), (99, 990)):
+            self.assertAlmostEqual(histogram.percentile(q), exact, delta=exact * 0.035)
+        self.assertEqual(histogram.percentile(100), 1000.0)
+        self.assertLess(len(histogram.counts), 400)
+        self.assertEqual(histogram.count_le(10_000), 1000)
+
+    def test_routes_are_bounded(self) -> None:
+        stats = RouteStats(max_routes=2)
+        for path in ("/a", "/b", "/c", "/d", "/a"):
+            stats.observe("GET", path, 200, 1.0)
+        routes = {item["route"]: item["count"] for item in stats.snapshot()["routes"]}
+        self.assertEqual(routes, {"/a": 2, "/b": 1, OTHER_ROUTE: 2})
+
+    def test_rewriter_observes_lines_without_rewriting(self) -> None:
+        stats = RouteStats()
+        rewriter = GranianLogRewriter(observer=stats.observe_line, rewrite=False)
+        line = b'[2026-02-11 18:20:19 +0300] 127.0.0.1 - "POST /users/7 HTTP/1.1" 201 2.5\n'
+        self.assertEqual(rewriter.feed(line[:20]), b"")
+        self.assertEqual(rewriter.feed(line[20:] + b"[INFO] x"), line)
+        self.assertEqual(rewriter.flush(), b"[INFO] x")
+        (route,) = stats.snapshot()["routes"]
+        self.assertEqual((route["method"], route["route"]), ("POST", "/users/:id"))
+        self.assertEqual(route["status"]["2xx"], 1)
+        self.assertIn("/users/:id", format_route_table(stats.snapshot()))
+
+    def test_reporter_writes_snapshot_file(self) -> None:
+        stats = RouteStats()
+        stats.observe("GET", "/health", 200, 0.5)
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "route-stats.json"
+            RouteStatsReporter(stats, output=output).report()
+            snapshot = json.loads(output.read_text())
+        self.assertEqual(snapshot["routes"][0]["route"], "/health")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.rsgi import RSGIAdapter  # noqa: E402
+
+
+class FakeHeaders(dict):
+    pass
+
+
+class FakeStream:
+    def __init__(self, sent: list) -> None:
+        self.sent = sent
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+
+class FakeHTTPProtocol:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.calls: list[tuple] = []
+        self.streamed: list[bytes] = []
+
+    async def __call__(self) -> bytes:
+        self.calls.append(("read",))
+        return b"".join(self.chunks)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def client_disconnect(self) -> None:
+        pass
+
+    def response_empty(self, status, headers) -> None:
+        self.calls.append(("empty", status, headers))
+
+    def response_bytes(self, status, headers, body) -> None:
+        self.calls.append(("bytes", status, headers, body))
+
+    def response_file(self, status, headers, file) -> None:
+        self.calls.append(("file", status, headers, file))
+
+    def response_stream(self, status, headers) -> FakeStream:
+        self.calls.append(("stream", status, headers))
+        return FakeStream(self.streamed)
+
+
+def http_scope(path="/users", headers=None) -> SimpleNamespace:
+    return SimpleNamespace(
+        proto="http",
+        http_version="1.1",
+        server="127.0.0.1:8000",
+        client="10.0.0.7:51234",
+        scheme="http",
+        method="POST",
+        path=path,
+        query_string="page=2",
+        headers=FakeHeaders(headers or {}),
+    )
+
+
+async def read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+class TestRSGIAdapter(unittest.TestCase):
+    def serve(self, app, scope, protocol) -> None:
+        asyncio.run(RSGIAdapter(app).__rsgi__(scope, protocol))
+
+    def test_single_body_becomes_one_response_bytes_call(self) -> None:
+        seen = {}
+
+        async def app(scope, receive, send):
+            seen.update(scope, body=await read_body(receive))
+            await send(
+                {"type": "http.response.start", "status": 201, "headers": [(b"x-a", b"1")]}
+            )
+            await send({"type": "http.response.body", "body": b"created"})
+
+        protocol = FakeHTTPProtocol([b'{"a":', b"1}"])
+        self.serve(app, http_scope(headers={"content-length": "6"}), protocol)
+        self.assertEqual(
+            protocol.calls, [("read",), ("bytes", 201, [("x-a", "1")], b"created")]
+        )
+        self.assertEqual(seen["body"], b'{"a":1}')
+        self.assertEqual(seen["client"], ("10.0.0.7", 51234))
+        self.assertEqual(seen["query_string"], b"page=2")
+        self.assertEqual(seen["headers"], [(b"content-length", b"6")])
+        self.assertIn("http.response.pathsend", seen["extensions"])
+
+    def test_chunked_request_and_streamed_response(self) -> None:
+        async def app(scope, receive, send):
+            body = await read_body(receive)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+            await send({"type": "http.response.body", "body": b"!"})
+
+        protocol = FakeHTTPProtocol([b"ab", b"cd"])
+        self.serve(app, http_scope(headers={"transfer-encoding": "chunked"}), protocol)
+        self.assertEqual(protocol.calls, [("stream", 200, [])])
+        self.assertEqual(protocol.streamed, [b"abcd", b"!"])
+
+    def test_pathsend_is_served_by_granian(self) -> None:
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.pathsend", "path": "/srv/app.js"})
+
+        protocol = FakeHTTPProtocol([])
+        self.serve(app, http_scope(), protocol)
+        self.assertEqual(protocol.calls, [("file", 200, [], "/srv/app.js")])
+
+    def test_exception_before_response_answers_500(self) -> None:
+        async def app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        protocol = FakeHTTPProtocol([])
+        with self.assertRaises(RuntimeError):
+            self.serve(app, http_scope(), protocol)
+        self.assertEqual(protocol.calls, [("empty", 500, [])])
+
+    def test_websocket_session(self) -> None:
+        class Transport:
+            def __init__(self) -> None:
+                self.incoming = [
+                    SimpleNamespace(kind=2, data="ping"),
+                    SimpleNamespace(kind=0, data=b""),
+                ]
+                self.sent: list = []
+
+            async def receive(self):
+                return self.incoming.pop(0)
+
+            async def send_str(self, data) -> None:
+                self.sent.append(data)
+
+        transport = Transport()
+        closed = []
+
+        class Protocol:
+            async def accept(self):
+                return transport
+
+            def close(self, status):
+                closed.append(status)
+
+        received = []
+
+        async def app(scope, receive, send):
+            received.append((scope["type"], scope["scheme"], scope["subprotocols"]))
+            received.append((await receive())["type"])
+            await send({"type": "websocket.accept"})
+            while True:
+                message = await receive()
+                received.append(message["type"])
+                if message["type"] == "websocket.disconnect":
+                    return
+                await send({"type": "websocket.send", "text": message["text"] + "!"})
+
+        scope = http_scope(headers={"sec-websocket-protocol": "chat, v2"})
+        scope.proto = "ws"
+        self.serve(app, scope, Protocol())
+        self.assertEqual(
+            received,
+            [
+                ("websocket", "ws", ["chat", "v2"]),
+                "websocket.connect",
+                "websocket.receive",
+                "websocket.disconnect",
+            ],
+        )
+        self.assertEqual(transport.sent, ["ping!"])
+        self.assertEqual(closed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.static import (  # noqa: E402
+    StaticMount,
+    detect_static_mounts,
+    directory_mounts,
+    normalize_prefix,
+)
+
+
+class TestStaticMounts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name).resolve()
+        for directory in (
+            "public/css",
+            "public/assets",
+            "inertia/dist/assets",
+            "inertia/dist/ssr",
+            "inertia/dist/.vite",
+        ):
+            (self.root / directory).mkdir(parents=True)
+        (self.root / "public" / "favicon.ico").write_bytes(b"")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_normalize_prefix(self) -> None:
+        self.assertEqual(normalize_prefix("static/"), "/static")
+        self.assertEqual(normalize_prefix("/"), "/")
+        self.assertEqual(normalize_prefix(""), "/")
+
+    def test_root_prefix_mounts_each_public_subdirectory(self) -> None:
+        dist = self.root / "inertia" / "dist"
+        self.assertEqual(
+            directory_mounts(dist, "/"), [StaticMount("/assets", dist / "assets")]
+        )
+        self.assertEqual(
+            directory_mounts(self.root / "public", "/static/"),
+            [StaticMount("/static", self.root / "public")],
+        )
+        self.assertEqual(directory_mounts(self.root / "missing", "/"), [])
+
+    def test_public_wins_route_clashes(self) -> None:
+        mounts, skipped = detect_static_mounts(self.root, "inertia")
+        self.assertEqual(
+            mounts,
+            [
+                StaticMount("/assets", self.root / "public" / "assets"),
+                StaticMount("/css", self.root / "public" / "css"),
+            ],
+        )
+        self.assertEqual(len(skipped), 1)
+
+        mounts, skipped = detect_static_mounts(self.root, "inertia", dist_prefix="/build")
+        self.assertEqual([mount.route for mount in mounts], ["/assets", "/css", "/build"])
+        self.assertEqual(skipped, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
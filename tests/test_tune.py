@@ -0,0 +1,93 @@
+import sys
+import tempfile
+import tomllib
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.bench import BenchResult  # noqa: E402
+from nestipy_cli.pyproject import load_start_defaults, write_start_defaults  # noqa: E402
+from nestipy_cli.tune import TuneRun, describe, rank_runs, tune_matrix  # noqa: E402
+
+
+def result(rps: float, p99_ms: float, errors: int = 0) -> BenchResult:
+    return BenchResult(
+        requests=int(rps * 5),
+        errors=errors,
+        duration=5.0,
+        rps=rps,
+        mean_ms=p99_ms / 2,
+        p50_ms=p99_ms / 2,
+        p90_ms=p99_ms * 0.9,
+        p99_ms=p99_ms,
+        p999_ms=p99_ms,
+        max_ms=p99_ms,
+    )
+
+
+class TestTune(unittest.TestCase):
+    def test_matrix_covers_every_combination(self) -> None:
+        matrix = tune_matrix([1, 2], ["asyncio", "uvloop"], ["auto"], ["asgi"], [1, 2])
+        self.assertEqual(len(matrix), 8)
+        self.assertEqual(
+            matrix[0],
+            {
+                "workers": 1,
+                "loop": "asyncio",
+                "http": "auto",
+                "interface": "asgi",
+                "runtime_threads": 1,
+            },
+        )
+        self.assertNotIn("runtime_threads", tune_matrix([1], ["asyncio"], ["1"], ["asgi"])[0])
+        self.assertEqual(
+            describe(matrix[-1]),
+            "workers=2 loop=uvloop http=auto interface=asgi runtime-threads=2",
+        )
+
+    def test_runs_meeting_the_slo_rank_first_by_throughput(self) -> None:
+        runs = [
+            TuneRun({"workers": 1}, result(5000, 20)),
+            TuneRun({"workers": 2}, result(9000, 80)),
+            TuneRun({"workers": 3}, result(7000, 30)),
+            TuneRun({"workers": 4}, result(9500, 10, errors=3)),
+        ]
+        ranked = rank_runs(runs, slo_p99_ms=50)
+        self.assertEqual([run.settings["workers"] for run in ranked], [3, 1, 4, 2])
+
+
+class TestPyprojectStartDefaults(unittest.TestCase):
+    def test_appends_then_replaces_the_table(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "pyproject.toml"
+            self.assertEqual(load_start_defaults(path), {})
+            path.write_text('[project]\nname = "demo"\n\n[tool.ruff]\nline-length = 100\n')
+            write_start_defaults(path, {"workers": 2, "loop": "uvloop"}, comment="tuned")
+            self.assertEqual(load_start_defaults(path), {"workers": 2, "loop": "uvloop"})
+            path.write_text(path.read_text() + "\n[tool.other]\nkeep = true\n")
+
+            write_start_defaults(path, {"workers": 4, "runtime_threads": 2, "http": "1"})
+            text = path.read_text()
+            self.assertEqual(
+                load_start_defaults(path), {"workers": 4, "runtime_threads": 2, "http": "1"}
+            )
+            self.assertIn('http = "1"\n\n[tool.other]', text)
+            self.assertNotIn("tuned", text)
+            data = tomllib.loads(text)
+            self.assertEqual(data["tool"]["ruff"], {"line-length": 100})
+            self.assertEqual(data["tool"]["other"], {"keep": True})
+
+    def test_refuses_to_write_an_invalid_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "pyproject.toml"
+            original = "[tool.nestipy]\nstart = { workers = 1 }\n"
+            path.write_text(original)
+            with self.assertRaises(tomllib.TOMLDecodeError):
+                write_start_defaults(path, {"workers": 2})
+            self.assertEqual(path.read_text(), original)
+            self.assertEqual(load_start_defaults(path), {"workers": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import socket
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from nestipy_cli.uds import (  # noqa: E402
+    SocketInUseError,
+    parse_owner,
+    remove_stale_socket,
+)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix sockets")
+class TestUds(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "app.sock"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_parse_owner(self) -> None:
+        self.assertEqual(parse_owner("0"), (0, -1))
+        self.assertEqual(parse_owner(":0"), (-1, 0))
+        self.assertEqual(parse_owner("root:0"), (0, 0))
+        for value in (":", "no-such-user-xyz", ":no-such-group-xyz"):
+            with self.assertRaises(ValueError):
+                parse_owner(value)
+
+    def test_removes_only_stale_sockets(self) -> None:
+        self.assertFalse(remove_stale_socket(self.path))
+        with socket.socket(socket.AF_UNIX) as server:
+            server.bind(str(self.path))
+            server.listen()
+            with self.assertRaises(SocketInUseError):
+                remove_stale_socket(self.path)
+        # The listener is gone but its socket file is left behind.
+        self.assertTrue(self.path.exists())
+        self.assertTrue(remove_stale_socket(self.path))
+        self.assertFalse(self.path.exists())
+
+    def test_refuses_to_remove_other_files(self) -> None:
+        self.path.write_text("not a socket")
+        with self.assertRaises(FileExistsError):
+            remove_stale_socket(self.path)
+        self.assertTrue(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()